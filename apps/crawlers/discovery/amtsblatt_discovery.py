@@ -2,20 +2,73 @@
 Amtsblatt discovery with explicit paths.
 Focuses on B-Plan announcements and permit notices.
 """
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+import codecs
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
 import logging
 import time
 
 from apps.net.http_client import safe_get
+from apps.net.probe import probe_urls
+from apps.net.ratelimit import host_limiter, wait_for_host
+from apps.net.session import get_session
+from apps.parser.html_text import PDF_EXTS, has_doc_suffix, href_resolver, iterparse_response, parse_html
+from apps.utils.keywords import KeywordMatcher
+from ..records import IssueEntryRecord
 from .municipality_index import AMTSBLATT_PATTERNS
 
 logger = logging.getLogger(__name__)
 
 USER_AGENT = "BESS-Forensic-Crawler/1.0 (Research/Transparency; +https://github.com/bess-crawler)"
 
+# Markers that identify an Amtsblatt page
+AMTSBLATT_MARKERS = ["amtsblatt", "bekanntmachung", "veröffentlichung", "ausgabe"]
+
+# Procedure-related content in an Amtsblatt issue
+PROCEDURE_KEYWORDS = [
+    "bebauungsplan", "b-plan", "bauleitplanung",
+    "aufstellungsbeschluss", "öffentliche auslegung", "satzungsbeschluss",
+    "bauvorbescheid", "baugenehmigung",
+    "§ 36", "§36", "gemeindliches einvernehmen",
+    "batteriespeicher", "energiespeicher", "speicheranlage",
+]
+
+# Link text of an issue entry on an Amtsblatt index page
+ISSUE_LINK_KEYWORDS = ["ausgabe", "nummer", "jahr", "2023", "2024", "2025"]
+
+_AMTSBLATT_MATCHER = KeywordMatcher(AMTSBLATT_MARKERS)
+_PROCEDURE_MATCHER = KeywordMatcher(PROCEDURE_KEYWORDS)
+_ISSUE_LINK_MATCHER = KeywordMatcher(ISSUE_LINK_KEYWORDS)
+
+# Markers almost always appear near the top; never read more than this per candidate
+MARKER_SCAN_BYTES = 131072
+MARKER_SCAN_CHUNK = 16384
+
+
+def _prefix_has_marker(resp: requests.Response, max_bytes: int = MARKER_SCAN_BYTES) -> bool:
+    """
+    Stream the start of a response body and check it for Amtsblatt markers.
+    Stops at the first hit or after max_bytes.
+    """
+    try:
+        decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    overlap = max(len(m) for m in AMTSBLATT_MARKERS) - 1
+    tail = ""
+    read = 0
+    for chunk in resp.iter_content(MARKER_SCAN_CHUNK):
+        chunk = chunk[:max_bytes - read]
+        read += len(chunk)
+        # Keep a short tail so markers split across chunks are still seen
+        text = tail + decoder.decode(chunk).lower()
+        if _AMTSBLATT_MATCHER.contains_any(text):
+            return True
+        tail = text[-overlap:]
+        if read >= max_bytes:
+            break
+    return False
+
 
 def discover_amtsblatt(
     municipality_name: str,
@@ -65,25 +118,46 @@ def discover_amtsblatt(
         diagnostics["method"] = "pattern_guessing"
         diagnostics["attempted_urls"].extend(guessed_urls[:10])
     
-    # Step 3: Test each potential URL
-    session = requests.Session()
-    session.headers.update({"User-Agent": USER_AGENT})
+    # Step 3: Test each potential URL (duplicates dropped, first occurrence keeps its priority)
+    potential_urls = list(dict.fromkeys(potential_urls))
+    session = get_session()
     
-    for url in potential_urls:
-        try:
-            resp = safe_get(url, session=session, timeout=10, allow_redirects=True, verify=True)
-            if resp and resp.status_code == 200:
-                # Check if it looks like an Amtsblatt page
-                text_lower = resp.text.lower()
-                if any(term in text_lower for term in ["amtsblatt", "bekanntmachung", "veröffentlichung", "ausgabe"]):
-                    logger.info("Found Amtsblatt at %s (method: %s)", url, diagnostics["method"])
-                    diagnostics["reason_code"] = "FOUND"
-                    return url, diagnostics
-        except Exception as e:
-            error_key = f"{url}:{type(e).__name__}"
-            diagnostics["failed_urls"][error_key] = str(e)[:200]
-            logger.debug("Amtsblatt discovery failed for %s: %s", url, e)
+    # Probe concurrently; results are still checked in priority order.
+    # Only the head of each page is requested and scanned for markers.
+    def fetch(url: str):
+        host = wait_for_host(url)
+        resp = safe_get(
+            url,
+            session=session,
+            timeout=10,
+            allow_redirects=True,
+            verify=True,
+            stream=True,
+            headers={"Range": f"bytes=0-{MARKER_SCAN_BYTES - 1}"},
+        )
+        if resp is None:
+            return None, False
+        host_limiter.observe(host, resp.status_code, resp.headers)
+        with resp:
+            if resp.status_code not in (200, 206):
+                return resp, False
+            return resp, _prefix_has_marker(resp)
+    
+    probes = probe_urls(potential_urls, fetch)
+    for url, result, error in probes:
+        if error is not None:
+            error_key = f"{url}:{type(error).__name__}"
+            diagnostics["failed_urls"][error_key] = str(error)[:200]
+            logger.debug("Amtsblatt discovery failed for %s: %s", url, error)
             continue
+        resp, has_marker = result
+        if resp is not None and resp.status_code in (200, 206):
+            # Check if it looks like an Amtsblatt page
+            if has_marker:
+                logger.info("Found Amtsblatt at %s (method: %s)", url, diagnostics["method"])
+                diagnostics["reason_code"] = "FOUND"
+                probes.close()
+                return url, diagnostics
     
     # No Amtsblatt found
     if not potential_urls:
@@ -99,31 +173,76 @@ def discover_amtsblatt(
     return None, diagnostics
 
 
+# Block elements scanned and then discarded while stream-parsing issue pages
+_BLOCK_TAGS = frozenset([
+    "p", "div", "li", "ul", "ol", "tr", "table", "section", "article",
+    "h1", "h2", "h3", "h4", "h5", "h6", "dl", "dd", "dt", "blockquote",
+])
+
+
+def _scan_issue_stream(resp: requests.Response) -> Tuple[bool, List[Tuple[str, str]], Optional[str]]:
+    """
+    Stream-parse an issue page in one pass: checks the text for procedure
+    keywords and collects PDF links and the <title> at the same time.
+    Each block element is scanned at its end tag and then cleared, so only
+    the current block's subtree is held in memory (inline markup inside a
+    block stays intact, keywords split across <b>/<span> still match).
+    
+    Returns:
+        (has_relevant_content, [(pdf_href, label)], title or None)
+    """
+    has_relevant_content = False
+    pdf_links = []
+    title = None
+    
+    for _, el in iterparse_response(resp):
+        tag = el.tag
+        if tag == "a":
+            href = el.get("href")
+            if href and has_doc_suffix(href, PDF_EXTS):
+                pdf_links.append((href, "".join(el.itertext()).strip()))
+        elif tag == "title":
+            if title is None:
+                title = (el.text or "").strip()
+        elif tag in _BLOCK_TAGS or el.getparent() is None:
+            if not has_relevant_content:
+                has_relevant_content = _PROCEDURE_MATCHER.contains_any("".join(el.itertext()).lower())
+            el.clear(keep_tail=True)
+    
+    return has_relevant_content, pdf_links, title
+
+
 def list_amtsblatt_issues(amtsblatt_url: str, session: Optional[requests.Session] = None) -> List[Dict]:
     """
     List all available Amtsblatt issues.
     Returns list of issue metadata.
     """
-    sess = session or requests.Session()
-    sess.headers.update({"User-Agent": USER_AGENT})
+    sess = session or get_session()
     
     issues = []
     
     try:
+        host = wait_for_host(amtsblatt_url)
         resp = safe_get(amtsblatt_url, session=sess, timeout=20, verify=True)
-        if not resp or resp.status_code != 200:
+        if not resp:
+            return issues
+        host_limiter.observe(host, resp.status_code, resp.headers)
+        if resp.status_code != 200:
             return issues
         
-        soup = BeautifulSoup(resp.text, "html.parser")
+        root = parse_html(resp)
+        resolve = href_resolver(amtsblatt_url)
         
         # Look for issue links (usually contain dates or issue numbers)
-        for anchor in soup.find_all("a", href=True):
-            href = anchor["href"]
-            text = anchor.get_text(strip=True)
+        for anchor in root.iter("a"):
+            href = anchor.get("href")
+            if not href:
+                continue
+            text = anchor.text_content().strip()
             
             # Check if it looks like an issue link
-            if any(term in text.lower() for term in ["ausgabe", "nummer", "jahr", "2023", "2024", "2025"]):
-                issue_url = urljoin(amtsblatt_url, href)
+            if _ISSUE_LINK_MATCHER.contains_any(text.lower()):
+                issue_url = resolve(href)
                 issues.append({
                     "url": issue_url,
                     "title": text,
@@ -137,56 +256,44 @@ def list_amtsblatt_issues(amtsblatt_url: str, session: Optional[requests.Session
     return issues
 
 
-def extract_amtsblatt_procedures(issue_url: str, session: Optional[requests.Session] = None) -> List[Dict]:
+def extract_amtsblatt_procedures(issue_url: str, session: Optional[requests.Session] = None) -> List[IssueEntryRecord]:
     """
     Extract procedures from an Amtsblatt issue.
     Only looks for B-Plan and permit announcements.
     """
-    sess = session or requests.Session()
-    sess.headers.update({"User-Agent": USER_AGENT})
+    sess = session or get_session()
     
     procedures = []
     
     try:
-        resp = safe_get(issue_url, session=sess, timeout=20, verify=True)
-        if not resp or resp.status_code != 200:
+        host = wait_for_host(issue_url)
+        resp = safe_get(issue_url, session=sess, timeout=20, verify=True, stream=True)
+        if not resp:
             return procedures
-        
-        soup = BeautifulSoup(resp.text, "html.parser")
-        text = soup.get_text()
-        text_lower = text.lower()
-        
-        # Look for procedure-related content
-        procedure_keywords = [
-            "bebauungsplan", "b-plan", "bauleitplanung",
-            "aufstellungsbeschluss", "öffentliche auslegung", "satzungsbeschluss",
-            "bauvorbescheid", "baugenehmigung",
-            "§ 36", "§36", "gemeindliches einvernehmen",
-            "batteriespeicher", "energiespeicher", "speicheranlage",
-        ]
-        
-        # Check if issue contains relevant procedures
-        has_relevant_content = any(keyword in text_lower for keyword in procedure_keywords)
+        host_limiter.observe(host, resp.status_code, resp.headers)
+        with resp:
+            if resp.status_code != 200:
+                return procedures
+            # Check if issue contains relevant procedures; PDF links come from the same pass
+            has_relevant_content, pdf_links, page_title = _scan_issue_stream(resp)
         
         if has_relevant_content:
-            # Look for PDF links
-            for anchor in soup.find_all("a", href=True):
-                href = anchor["href"]
-                if href.lower().endswith(".pdf"):
-                    doc_url = urljoin(issue_url, href)
-                    procedures.append({
-                        "url": doc_url,
-                        "title": anchor.get_text(strip=True) or "Amtsblatt PDF",
-                        "type": "document",
-                        "discovery_source": "AMTSBLATT",
-                        "discovery_path": issue_url,
-                    })
+            resolve = href_resolver(issue_url)
+            for href, label in pdf_links:
+                doc_url = resolve(href)
+                procedures.append({
+                    "url": doc_url,
+                    "title": label or "Amtsblatt PDF",
+                    "type": "document",
+                    "discovery_source": "AMTSBLATT",
+                    "discovery_path": issue_url,
+                })
             
             # If no PDFs found, treat the issue page itself as a procedure
             if not procedures:
                 procedures.append({
                     "url": issue_url,
-                    "title": soup.find("title").get_text(strip=True) if soup.find("title") else "Amtsblatt Issue",
+                    "title": page_title or "Amtsblatt Issue",
                     "type": "issue",
                     "discovery_source": "AMTSBLATT",
                     "discovery_path": issue_url,
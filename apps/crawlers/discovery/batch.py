@@ -0,0 +1,89 @@
+"""
+Batch discovery across municipalities.
+Each municipality lives on its own host, so discovery runs concurrently in a
+thread pool on top of the shared pooled session; compiled pattern tables and
+the name-sanitizer caches are module-level and shared by all workers.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable
+import logging
+
+from .amtsblatt_discovery import discover_amtsblatt
+from .municipal_website import discover_municipal_sections
+from .ris_discovery import discover_ris
+from .municipality_index import Municipality
+
+logger = logging.getLogger(__name__)
+
+DISCOVERY_CONCURRENCY = 32  # Municipalities discovered in parallel (one host pool each)
+
+
+def discover_municipality(municipality: Municipality) -> Dict:
+    """
+    Run RIS, Amtsblatt and municipal-section discovery for one municipality.
+
+    Returns:
+        Dict with municipality, ris_url, ris_diagnostics, amtsblatt_url,
+        amtsblatt_diagnostics, sections
+    """
+    result = {
+        "municipality": municipality,
+        "ris_url": None,
+        "ris_diagnostics": {},
+        "amtsblatt_url": None,
+        "amtsblatt_diagnostics": {},
+        "sections": [],
+    }
+
+    try:
+        ris_url, diagnostics = discover_ris(
+            municipality.name,
+            municipality.official_website,
+            municipality.official_website,
+        )
+        result["ris_url"] = ris_url
+        result["ris_diagnostics"] = diagnostics
+    except Exception as e:
+        logger.warning("RIS discovery failed for %s: %s", municipality.name, e)
+        result["ris_diagnostics"] = {"reason_code": "ERROR", "error": str(e)[:200]}
+
+    try:
+        amtsblatt_url, diagnostics = discover_amtsblatt(
+            municipality.name,
+            municipality.official_website,
+            municipality.official_website,
+        )
+        result["amtsblatt_url"] = amtsblatt_url
+        result["amtsblatt_diagnostics"] = diagnostics
+    except Exception as e:
+        logger.warning("Amtsblatt discovery failed for %s: %s", municipality.name, e)
+        result["amtsblatt_diagnostics"] = {"reason_code": "ERROR", "error": str(e)[:200]}
+
+    if municipality.official_website:
+        try:
+            result["sections"] = discover_municipal_sections(municipality.official_website)
+        except Exception as e:
+            logger.warning("Municipal section discovery failed for %s: %s", municipality.name, e)
+
+    return result
+
+
+def discover_many(
+    municipalities: Iterable[Municipality],
+    concurrency: int = DISCOVERY_CONCURRENCY,
+) -> Dict[str, Dict]:
+    """
+    Discover several municipalities concurrently.
+    Returns results keyed by municipality_key, in input order (see
+    discover_municipality). Per-host politeness is still enforced by the
+    probe layer.
+    """
+    municipalities = list(municipalities)
+    if not municipalities:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(municipalities))) as executor:
+        return {
+            result["municipality"].municipality_key: result
+            for result in executor.map(discover_municipality, municipalities)
+        }
@@ -0,0 +1,59 @@
+"""
+In-process memoization of discovery results.
+The same municipality is discovered again on retries and repeated passes;
+found URLs are kept for a day so those repeats cost no requests. Misses
+(SSL_BLOCKED, NO_MARKERS_FOUND, ...) are often transient and are only
+kept for a few minutes, so a retry really probes the site again.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Dict, Optional, Tuple
+
+DISCOVERY_CACHE_SIZE = 4096
+DISCOVERY_CACHE_TTL_S = 24 * 3600
+DISCOVERY_NEGATIVE_TTL_S = 10 * 60
+
+DiscoveryFn = Callable[[str, Optional[str], Optional[str]], Tuple[Optional[str], Dict]]
+
+
+def cached_discovery(discover: DiscoveryFn) -> DiscoveryFn:
+    """
+    Wrap discover_ris / discover_amtsblatt with an LRU keyed by
+    (municipality_name, base_url, official_website_url).
+
+    Found results live for DISCOVERY_CACHE_TTL_S, None results for
+    DISCOVERY_NEGATIVE_TTL_S. Exceptions are never cached. Callers get
+    their own copy of the diagnostics dict.
+    """
+    entries: "OrderedDict[tuple, Tuple[float, Optional[str], Dict]]" = OrderedDict()
+    lock = threading.Lock()
+
+    @wraps(discover)
+    def wrapper(municipality_name, base_url=None, official_website_url=None):
+        key = (municipality_name, base_url, official_website_url)
+        now = time.monotonic()
+        with lock:
+            entry = entries.get(key)
+            if entry is not None and entry[0] > now:
+                entries.move_to_end(key)
+                _, url, diagnostics = entry
+                return url, copy.deepcopy(diagnostics)
+
+        url, diagnostics = discover(municipality_name, base_url, official_website_url)
+        ttl = DISCOVERY_CACHE_TTL_S if url is not None else DISCOVERY_NEGATIVE_TTL_S
+        with lock:
+            entries[key] = (now + ttl, url, copy.deepcopy(diagnostics))
+            entries.move_to_end(key)
+            while len(entries) > DISCOVERY_CACHE_SIZE:
+                entries.popitem(last=False)
+        return url, diagnostics
+
+    def cache_clear():
+        with lock:
+            entries.clear()
+
+    wrapper.cache_clear = cache_clear
+    return wrapper
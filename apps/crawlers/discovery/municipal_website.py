@@ -8,12 +8,18 @@ Uses SPIDER approach:
 
 Falls back to predefined paths if spider approach finds nothing.
 """
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 import logging
+import re
 
+from apps.net.probe import HEAD_FALLBACK_STATUSES, probe_urls
+from apps.net.ratelimit import host_limiter, wait_for_host
+from apps.net.session import get_session
+from apps.net.verified_urls import get_verified_cache
+from apps.parser.html_text import document_links, href_resolver, parse_html
+from apps.utils.keywords import KeywordMatcher
 from .municipality_index import MUNICIPAL_DISCOVERY_PATHS
 
 logger = logging.getLogger(__name__)
@@ -21,6 +27,65 @@ logger = logging.getLogger(__name__)
 # User-Agent for compliance
 USER_AGENT = "BESS-Forensic-Crawler/1.0 (Research/Transparency; +https://github.com/bess-crawler)"
 
+# Keywords to look for in homepage links (German planning/announcement terms)
+SECTION_KEYWORDS = [
+    # Planning terms
+    "bauen", "planung", "bebauungsplan", "bauleitplanung", "b-plan",
+    "stadtplanung", "flaechennutzungsplan", "fnp",
+    # Announcement terms
+    "bekanntmachung", "bekanntmachungen", "amtliche", "öffentlich", "oeffentlich",
+    "satzung", "satzungen", "verordnung", "verordnungen",
+    # Procedure terms
+    "verfahren", "beteiligung", "auslegung", "aufstellung",
+    # Building/construction terms
+    "bauvorbescheid", "baugenehmigung", "bauantrag", "bauvorhaben",
+    # Committee/meeting terms
+    "bauausschuss", "planungsausschuss", "gemeindevertretung",
+]
+
+# Keywords marking procedure links inside a section
+PROCEDURE_LINK_KEYWORDS = [
+    "bebauungsplan", "b-plan", "bauleitplanung",
+    "aufstellungsbeschluss", "auslegung", "satzung",
+    "bauvorbescheid", "baugenehmigung", "einvernehmen",
+    "verfahren", "beteiligung",
+]
+
+# Links into RIS / Amtsblatt systems, which have their own crawlers
+EXTERNAL_SYSTEM_KEYWORDS = ["ris", "allris", "sessionnet", "amtsblatt"]
+
+_SECTION_MATCHER = KeywordMatcher(SECTION_KEYWORDS)
+_PROCEDURE_LINK_MATCHER = KeywordMatcher(PROCEDURE_LINK_KEYWORDS)
+_EXTERNAL_SYSTEM_MATCHER = KeywordMatcher(EXTERNAL_SYSTEM_KEYWORDS)
+
+# Document links (.pdf/.doc/.docx), also with a query string or fragment
+_DOC_EXT_RE = re.compile(r"\.(?:pdf|docx?)(?:[?#]|$)")
+
+# Upper bound on homepage links probed per municipality
+MAX_SPIDER_CANDIDATES = 50
+
+
+def _section_status(url: str, session: requests.Session) -> int:
+    """
+    HTTP status of a section URL, served from the verified-URL cache when known.
+    Checks with HEAD; servers that reject HEAD (405/501) or answer it with
+    403/404 while serving GET get a streamed GET whose body is never read.
+    """
+    cache = get_verified_cache()
+    status = cache.get(url)
+    if status is None:
+        host = wait_for_host(url)
+        resp = session.head(url, timeout=10, allow_redirects=True)
+        host_limiter.observe(host, resp.status_code, resp.headers)
+        if resp.status_code in HEAD_FALLBACK_STATUSES:
+            host_limiter.acquire(host)
+            resp = session.get(url, timeout=10, allow_redirects=True, stream=True)
+            resp.close()
+            host_limiter.observe(host, resp.status_code, resp.headers)
+        status = resp.status_code
+        cache.put(url, status)
+    return status
+
 
 def discover_municipal_sections(base_url: str) -> List[str]:
     """
@@ -31,8 +96,7 @@ def discover_municipal_sections(base_url: str) -> List[str]:
     Returns list of accessible URLs.
     """
     base_url = base_url.rstrip("/")
-    session = requests.Session()
-    session.headers.update({"User-Agent": USER_AGENT})
+    session = get_session()
     
     # SPIDER APPROACH: Load homepage and find relevant links
     accessible_urls = _spider_discover_sections(base_url, session)
@@ -55,24 +119,7 @@ def _spider_discover_sections(base_url: str, session: requests.Session) -> List[
     3. Follow those links specifically
     4. Return list of discovered section URLs
     """
-    accessible_urls = []
-    visited_urls = set()
-    
-    # Keywords to look for in links (German planning/announcement terms)
-    relevant_keywords = [
-        # Planning terms
-        "bauen", "planung", "bebauungsplan", "bauleitplanung", "b-plan",
-        "stadtplanung", "flaechennutzungsplan", "fnp",
-        # Announcement terms
-        "bekanntmachung", "bekanntmachungen", "amtliche", "öffentlich", "oeffentlich",
-        "satzung", "satzungen", "verordnung", "verordnungen",
-        # Procedure terms
-        "verfahren", "beteiligung", "auslegung", "aufstellung",
-        # Building/construction terms
-        "bauvorbescheid", "baugenehmigung", "bauantrag", "bauvorhaben",
-        # Committee/meeting terms
-        "bauausschuss", "planungsausschuss", "gemeindevertretung",
-    ]
+    accessible_urls: List[str] = []
     
     try:
         # Step 1: Load homepage
@@ -82,21 +129,23 @@ def _spider_discover_sections(base_url: str, session: requests.Session) -> List[
             logger.debug("Spider: Homepage not accessible (status %d)", resp.status_code)
             return accessible_urls
         
-        soup = BeautifulSoup(resp.text, "html.parser")
-        visited_urls.add(base_url)
+        root = parse_html(resp)
+        resolve = href_resolver(base_url)
+        base_domain = urlparse(base_url).netloc
         
-        # Step 2: Find all links on homepage
-        candidate_urls = []
-        for anchor in soup.find_all("a", href=True):
-            href = anchor.get("href", "")
-            text = anchor.get_text(strip=True)
+        # Step 2: Find all links on homepage (normalized URL -> first link text)
+        candidate_urls: Dict[str, str] = {}
+        for anchor in root.iter("a"):
+            href = anchor.get("href")
+            if href is None:
+                continue
+            text = anchor.text_content().strip()
             
             # Build full URL
-            full_url = urljoin(base_url, href)
+            full_url = resolve(href)
             parsed = urlparse(full_url)
             
             # Only follow links on same domain
-            base_domain = urlparse(base_url).netloc
             if parsed.netloc and parsed.netloc != base_domain:
                 continue  # External link, skip
             
@@ -104,24 +153,23 @@ def _spider_discover_sections(base_url: str, session: requests.Session) -> List[
             normalized_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}".rstrip("/")
             
             # Check if link text or URL contains relevant keywords
-            combined = (text + " " + href + " " + normalized_url).lower()
-            if any(keyword in combined for keyword in relevant_keywords):
-                if normalized_url not in visited_urls:
-                    candidate_urls.append((normalized_url, text))
-                    visited_urls.add(normalized_url)
+            combined = f"{text} {href} {normalized_url}".lower()
+            if _SECTION_MATCHER.contains_any(combined):
+                if normalized_url != base_url and normalized_url not in candidate_urls:
+                    candidate_urls[normalized_url] = text
+                    if len(candidate_urls) >= MAX_SPIDER_CANDIDATES:
+                        break
         
         logger.debug("Spider: Found %d candidate links on homepage", len(candidate_urls))
         
-        # Step 3: Verify candidate URLs are accessible
-        for url, link_text in candidate_urls:
-            try:
-                resp = session.get(url, timeout=10, allow_redirects=True)
-                if resp.status_code == 200:
-                    accessible_urls.append(url)
-                    logger.debug("Spider: Found accessible section: %s (from link: %s)", url, link_text[:50])
-            except Exception as e:
-                logger.debug("Spider: Section not accessible %s: %s", url, e)
+        # Step 3: Verify candidate URLs are accessible (probed concurrently)
+        for url, status, error in probe_urls(candidate_urls, lambda u: _section_status(u, session)):
+            if error is not None:
+                logger.debug("Spider: Section not accessible %s: %s", url, error)
                 continue
+            if status == 200:
+                accessible_urls.append(url)
+                logger.debug("Spider: Found accessible section: %s (from link: %s)", url, candidate_urls[url][:50])
         
         logger.info("Spider: Discovered %d accessible sections from homepage", len(accessible_urls))
         
@@ -136,64 +184,59 @@ def _path_based_discover_sections(base_url: str, session: requests.Session) -> L
     FALLBACK: Path-based discovery using predefined paths.
     Used when spider approach finds nothing.
     """
-    accessible_urls = []
+    accessible_urls: List[str] = []
+    urls = list(dict.fromkeys(f"{base_url}{path}" for path in MUNICIPAL_DISCOVERY_PATHS))
     
-    for path in MUNICIPAL_DISCOVERY_PATHS:
-        url = f"{base_url}{path}"
-        try:
-            resp = session.get(url, timeout=10, allow_redirects=True)
-            if resp.status_code == 200:
-                accessible_urls.append(url)
-                logger.debug("Path-based: Found accessible section: %s", url)
-        except Exception as e:
-            logger.debug("Path-based: Section not accessible %s: %s", url, e)
+    for url, status, error in probe_urls(urls, lambda u: _section_status(u, session)):
+        if error is not None:
+            logger.debug("Path-based: Section not accessible %s: %s", url, error)
             continue
+        if status == 200:
+            accessible_urls.append(url)
+            logger.debug("Path-based: Found accessible section: %s", url)
     
     return accessible_urls
 
 
-def crawl_municipal_section(section_url: str, session: Optional[requests.Session] = None) -> List[Dict]:
+def crawl_municipal_section(section_url: str, session: Optional[requests.Session] = None) -> List[Dict[str, str]]:
     """
     Crawl a specific municipal section for procedures.
     Only looks for B-Plan announcements, public displays, Satzungsbeschlüsse.
     Stops at PDF links or RIS/Amtsblatt links.
     """
-    sess = session or requests.Session()
-    sess.headers.update({"User-Agent": USER_AGENT})
+    sess = session or get_session()
     
-    procedures = []
+    procedures: List[Dict[str, str]] = []
     
     try:
         resp = sess.get(section_url, timeout=20)
         if resp.status_code != 200:
             return procedures
         
-        soup = BeautifulSoup(resp.text, "html.parser")
+        root = parse_html(resp)
+        resolve = href_resolver(section_url)
         
         # Look for procedure links
-        for anchor in soup.find_all("a", href=True):
-            href = anchor["href"]
-            text = anchor.get_text(strip=True)
+        for anchor in root.iter("a"):
+            href = anchor.get("href")
+            if href is None:
+                continue
+            text = anchor.text_content().strip()
             
             # Check if it's a procedure-related link
             href_lower = href.lower()
             text_lower = text.lower()
             
-            is_procedure = any(
-                term in href_lower or term in text_lower
-                for term in [
-                    "bebauungsplan", "b-plan", "bauleitplanung",
-                    "aufstellungsbeschluss", "auslegung", "satzung",
-                    "bauvorbescheid", "baugenehmigung", "einvernehmen",
-                    "verfahren", "beteiligung"
-                ]
+            is_procedure = (
+                _PROCEDURE_LINK_MATCHER.contains_any(href_lower)
+                or _PROCEDURE_LINK_MATCHER.contains_any(text_lower)
             )
             
             if is_procedure:
-                full_url = urljoin(section_url, href)
+                full_url = resolve(href)
                 
                 # Stop if it's a PDF or external link (RIS/Amtsblatt)
-                if href_lower.endswith((".pdf", ".doc", ".docx")):
+                if _DOC_EXT_RE.search(href_lower):
                     procedures.append({
                         "url": full_url,
                         "title": text,
@@ -201,7 +244,7 @@ def crawl_municipal_section(section_url: str, session: Optional[requests.Session
                         "discovery_source": "MUNICIPAL_WEBSITE",
                         "discovery_path": section_url,
                     })
-                elif any(term in href_lower for term in ["ris", "allris", "sessionnet", "amtsblatt"]):
+                elif _EXTERNAL_SYSTEM_MATCHER.contains_any(href_lower):
                     # External link - don't crawl, but note it
                     logger.debug("Found external link to %s: %s", full_url, text)
                 else:
@@ -220,15 +263,14 @@ def crawl_municipal_section(section_url: str, session: Optional[requests.Session
     return procedures
 
 
-def extract_procedure_details(procedure_url: str, session: Optional[requests.Session] = None) -> Dict:
+def extract_procedure_details(procedure_url: str, session: Optional[requests.Session] = None) -> Dict[str, Any]:
     """
     Extract details from a procedure detail page.
     Looks for documents, dates, and procedure information.
     """
-    sess = session or requests.Session()
-    sess.headers.update({"User-Agent": USER_AGENT})
+    sess = session or get_session()
     
-    details = {
+    details: Dict[str, Any] = {
         "url": procedure_url,
         "title": "",
         "documents": [],
@@ -241,22 +283,22 @@ def extract_procedure_details(procedure_url: str, session: Optional[requests.Ses
         if resp.status_code != 200:
             return details
         
-        soup = BeautifulSoup(resp.text, "html.parser")
+        root = parse_html(resp)
+        resolve = href_resolver(procedure_url)
         
-        # Extract title
-        title_elem = soup.find("h1") or soup.find("title")
-        if title_elem:
-            details["title"] = title_elem.get_text(strip=True)
+        # Extract title: first <h1> (may contain markup), else <head><title>
+        h1 = root.find(".//h1")
+        if h1 is not None:
+            details["title"] = h1.text_content().strip()
+        else:
+            details["title"] = (root.findtext("head/title") or "").strip()
         
         # Extract documents
-        for anchor in soup.find_all("a", href=True):
-            href = anchor["href"]
-            if href.lower().endswith((".pdf", ".doc", ".docx")):
-                doc_url = urljoin(procedure_url, href)
-                details["documents"].append({
-                    "url": doc_url,
-                    "label": anchor.get_text(strip=True),
-                })
+        for anchor in document_links(root):
+            details["documents"].append({
+                "url": resolve(anchor.get("href")),
+                "label": anchor.text_content().strip(),
+            })
         
     except Exception as e:
         logger.warning("Failed to extract details from %s: %s", procedure_url, e)
@@ -2,8 +2,10 @@
 Municipality index with official website URLs and discovery paths.
 Canonical list of all Brandenburg municipalities, cities, and Ämter.
 """
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
+import re
 
 
 @dataclass
@@ -52,7 +54,6 @@ RIS_URL_PATTERNS = [
     "https://allris.{municipality}.de",
     # Generic RIS
     "{base}/ratsinformationssystem",
-    "{base}/ris",
     "{base}/si0100.asp",  # Common ALLRIS entry point
     "{base}/si0100.php",
 ]
@@ -107,26 +108,47 @@ def discover_municipal_paths(base_url: str) -> List[str]:
     return urls
 
 
+_PAREN_RE = re.compile(r'\([^)]*\)')
+_NONALNUM_RE = re.compile(r'[^a-z0-9\-.]')
+_SEPARATOR_RE = re.compile(r'[\s_]+')
+_DASHES_RE = re.compile(r'-+')
+
+
+@lru_cache(maxsize=2048)
 def _sanitize_name_for_url(name: str) -> str:
     """Sanitize municipality name for URL generation."""
     if not name:
         return ""
     # Remove parentheses and their contents
-    import re
-    sanitized = re.sub(r'\([^)]*\)', '', name)
+    sanitized = _PAREN_RE.sub('', name)
     # Convert to lowercase and remove special chars
     sanitized = sanitized.lower().replace(" ", "").replace("(", "").replace(")", "")
     sanitized = sanitized.replace("ä", "ae").replace("ö", "oe").replace("ü", "ue").replace("ß", "ss")
     # Remove any remaining non-alphanumeric except dots and dashes
-    sanitized = re.sub(r'[^a-z0-9\-.]', '', sanitized)
+    sanitized = _NONALNUM_RE.sub('', sanitized)
     return sanitized
 
 
+@lru_cache(maxsize=2048)
+def _dash_sanitize(name: str) -> str:
+    """Dash-separated municipality name for Amtsblatt URLs."""
+    # Remove parentheses
+    sanitized = _PAREN_RE.sub('', name.lower())
+    # Replace spaces and special chars with dashes
+    sanitized = _SEPARATOR_RE.sub('-', sanitized)
+    return _DASHES_RE.sub('-', sanitized).strip('-')
+
+
 def discover_ris_urls(municipality_name: str, base_url: Optional[str] = None) -> List[str]:
     """
     Discover RIS URLs for a municipality.
-    Returns list of potential RIS URLs to try.
+    Returns list of potential RIS URLs to try (duplicates removed, first occurrence kept).
     """
+    return list(_ris_candidates(municipality_name, base_url))
+
+
+@lru_cache(maxsize=4096)
+def _ris_candidates(municipality_name: str, base_url: Optional[str]) -> Tuple[str, ...]:
     urls = []
     
     if municipality_name:
@@ -152,14 +174,19 @@ def discover_ris_urls(municipality_name: str, base_url: Optional[str] = None) ->
                 # Skip patterns that don't match format
                 continue
     
-    return urls
+    return tuple(dict.fromkeys(urls))
 
 
 def discover_amtsblatt_urls(municipality_name: str, base_url: Optional[str] = None) -> List[str]:
     """
     Discover Amtsblatt URLs for a municipality.
-    Returns list of potential Amtsblatt URLs to try.
+    Returns list of potential Amtsblatt URLs to try (duplicates removed, first occurrence kept).
     """
+    return list(_amtsblatt_candidates(municipality_name, base_url))
+
+
+@lru_cache(maxsize=4096)
+def _amtsblatt_candidates(municipality_name: str, base_url: Optional[str]) -> Tuple[str, ...]:
     urls = []
     
     # If base_url provided, try Amtsblatt paths
@@ -172,19 +199,13 @@ def discover_amtsblatt_urls(municipality_name: str, base_url: Optional[str] = No
     # Common Amtsblatt patterns using municipality name
     if municipality_name:
         # Use dash-separated format for Amtsblatt URLs
-        muni_sanitized = municipality_name.lower()
-        # Remove parentheses
-        import re
-        muni_sanitized = re.sub(r'\([^)]*\)', '', muni_sanitized)
-        # Replace spaces and special chars with dashes
-        muni_sanitized = re.sub(r'[\s_]+', '-', muni_sanitized)
-        muni_sanitized = re.sub(r'-+', '-', muni_sanitized).strip('-')
+        muni_sanitized = _dash_sanitize(municipality_name)
         
         if muni_sanitized:
             urls.append(f"https://{muni_sanitized}.de/amtsblatt")
             urls.append(f"https://www.{muni_sanitized}.de/amtsblatt")
     
-    return urls
+    return tuple(dict.fromkeys(urls))
 
 
 
@@ -2,14 +2,19 @@
 RIS (Ratsinformationssystem) discovery with explicit paths.
 Focuses on committees and sessions that handle B-Plan and permit procedures.
 """
+from datetime import datetime
 from typing import List, Dict, Optional
 import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 import logging
+import re
 import time
 
-from apps.net.ris_http_fallback import ris_safe_get
+from apps.net.probe import HEAD_FALLBACK_STATUSES, probe_urls
+from apps.net.ris_http_fallback import ris_safe_get, ris_safe_head
+from apps.net.session import get_session
+from apps.parser.html_text import href_resolver, iter_anchors
+from apps.utils.keywords import KeywordMatcher
 
 # Committee allowlist for RIS acceleration (widened slightly)
 RIS_COMMITTEE_ALLOWLIST = [
@@ -37,6 +42,70 @@ logger = logging.getLogger(__name__)
 
 USER_AGENT = "BESS-Forensic-Crawler/1.0 (Research/Transparency; +https://github.com/bess-crawler)"
 
+# Entry points tried under each candidate RIS base URL
+RIS_ENTRY_POINTS = ["", "/si0100.asp", "/si0100.php", "/index.php"]
+
+# Markers of a RIS page, matched on the raw body (all ASCII, so any
+# ASCII-compatible charset works without decoding or lowercasing a copy)
+_RIS_MARKER_RE = re.compile(rb"sitzung|gremium|tagesordnung|beschluss", re.IGNORECASE)
+_RIS_MARKER_OVERLAP = len(b"tagesordnung") - 1
+
+# Session dates in link text: DD.MM.YYYY, DD-MM-YYYY or YYYY-MM-DD, in one pass
+_SESSION_DATE_RE = re.compile(
+    r"(?P<day>\d{1,2})(?P<sep>[.-])(?P<month>\d{1,2})(?P=sep)(?P<year>\d{4})"
+    r"|(?P<iso_year>\d{4})-(?P<iso_month>\d{1,2})-(?P<iso_day>\d{1,2})"
+)
+
+# Committee names searched in link text (allowlist when the index has none)
+_COMMITTEE_MATCHER = KeywordMatcher(RIS_COMMITTEE_NAMES if RIS_COMMITTEE_NAMES else RIS_COMMITTEE_ALLOWLIST)
+
+# Link text of a session entry on a committee page
+SESSION_LINK_KEYWORDS = ["sitzung", "sitzungstag", "datum"]
+_SESSION_LINK_MATCHER = KeywordMatcher(SESSION_LINK_KEYWORDS)
+
+# Expanded keywords for privileged projects
+SESSION_ITEM_PRIVILEGED_TERMS = [
+    "bebauungsplan", "b-plan", "bauleitplanung",
+    "bauvorbescheid", "baugenehmigung",
+    "einvernehmen", "§ 36", "§36",
+    "§ 35", "§35", "§ 34", "§34",
+    "bauantrag", "bauvoranfrage", "vorbescheid",
+    "stellungnahme", "kenntnisnahme",
+    "antrag auf errichtung",
+]
+
+SESSION_ITEM_ENERGY_TERMS = [
+    "batteriespeicher", "energiespeicher", "speicheranlage",
+    "speicher", "photovoltaik", "umspannwerk",
+    "energie", "containeranlage",
+]
+
+# All agenda-item terms in one automaton (one pass per link text)
+_SESSION_ITEM_MATCHER = KeywordMatcher(SESSION_ITEM_PRIVILEGED_TERMS + SESSION_ITEM_ENERGY_TERMS)
+
+# Candidate pages are only read this far when looking for markers
+RIS_MARKER_SCAN_BYTES = 65536
+RIS_MARKER_SCAN_CHUNK = 4096
+
+
+def _stream_has_ris_marker(resp: requests.Response, max_bytes: int = RIS_MARKER_SCAN_BYTES) -> bool:
+    """
+    Read a streamed response until a RIS marker shows up or max_bytes are consumed.
+    """
+    tail = b""
+    read = 0
+    for chunk in resp.iter_content(RIS_MARKER_SCAN_CHUNK):
+        chunk = chunk[:max_bytes - read]
+        read += len(chunk)
+        # Keep a short tail so markers split across chunks are still seen
+        window = tail + chunk
+        if _RIS_MARKER_RE.search(window):
+            return True
+        tail = window[-_RIS_MARKER_OVERLAP:]
+        if read >= max_bytes:
+            break
+    return False
+
 
 def discover_ris(
     municipality_name: str,
@@ -86,28 +155,45 @@ def discover_ris(
         diagnostics["method"] = "pattern_guessing"
         diagnostics["attempted_urls"].extend(guessed_urls[:10])
     
-    # Step 3: Test each potential URL
-    session = requests.Session()
-    session.headers.update({"User-Agent": USER_AGENT})
+    # Step 3: Test each potential URL x entry point, probed concurrently.
+    # Results are checked in priority order, so the first hit is the same as before.
+    # Duplicates are dropped, the first occurrence keeps its priority.
+    potential_urls = list(dict.fromkeys(potential_urls))
+    session = get_session()
     
+    test_urls = {}  # test_url -> candidate base URL
     for url in potential_urls:
-        try:
-            # Try common entry points
-            for entry_point in ["", "/si0100.asp", "/si0100.php", "/index.php"]:
-                test_url = url.rstrip("/") + entry_point
-                # Use ris_safe_get for HTTP fallback support
-                resp = ris_safe_get(test_url, session=session, timeout=10, allow_redirects=True)
-                if resp and resp.status_code == 200:
-                    # Check if it looks like a RIS page
-                    if any(term in resp.text.lower() for term in ["sitzung", "gremium", "tagesordnung", "beschluss"]):
-                        logger.info("Found RIS at %s (method: %s)", test_url, diagnostics["method"])
-                        diagnostics["reason_code"] = "FOUND"
-                        return test_url, diagnostics
-        except Exception as e:
-            error_key = f"{url}:{type(e).__name__}"
-            diagnostics["failed_urls"][error_key] = str(e)[:200]
-            logger.debug("RIS discovery failed for %s: %s", url, e)
+        for entry_point in RIS_ENTRY_POINTS:
+            test_urls.setdefault(url.rstrip("/") + entry_point, url)
+    
+    def looks_like_ris(test_url: str) -> bool:
+        # HEAD first: gone or erroring paths are rejected without transferring a body.
+        # No answer (e.g. SSL error), HEAD not supported, or refused/missing only
+        # for HEAD (CMS/WAF setups) -> go on with GET.
+        head = ris_safe_head(test_url, session=session, timeout=10, allow_redirects=True)
+        if head is not None and head.status_code != 200 and head.status_code not in HEAD_FALLBACK_STATUSES:
+            return False
+        
+        # Use ris_safe_get for HTTP fallback support
+        resp = ris_safe_get(test_url, session=session, timeout=10, allow_redirects=True, stream=True)
+        if resp and resp.status_code == 200:
+            # Check if it looks like a RIS page
+            with resp:
+                return _stream_has_ris_marker(resp)
+        return False
+    
+    probes = probe_urls(test_urls, looks_like_ris)
+    for test_url, is_ris, error in probes:
+        if error is not None:
+            error_key = f"{test_urls[test_url]}:{type(error).__name__}"
+            diagnostics["failed_urls"][error_key] = str(error)[:200]
+            logger.debug("RIS discovery failed for %s: %s", test_url, error)
             continue
+        if is_ris:
+            logger.info("Found RIS at %s (method: %s)", test_url, diagnostics["method"])
+            diagnostics["reason_code"] = "FOUND"
+            probes.close()
+            return test_url, diagnostics
     
     # No RIS found
     if not potential_urls:
@@ -128,31 +214,25 @@ def discover_committees(ris_base_url: str, session: Optional[requests.Session] =
     Discover committees in RIS that handle B-Plan and permit procedures.
     Returns list of committee information.
     """
-    sess = session or requests.Session()
-    sess.headers.update({"User-Agent": USER_AGENT})
+    sess = session or get_session()
     
     committees = []
     
     try:
+        resolve = href_resolver(ris_base_url)
         # Try to find committee list
         for path in RIS_COMMITTEE_PATHS:
             url = urljoin(ris_base_url, path)
             try:
                 resp = ris_safe_get(url, session=sess, timeout=10)
                 if resp and resp.status_code == 200:
-                    soup = BeautifulSoup(resp.text, "html.parser")
-                    
                     # Look for committee links
-                    for anchor in soup.find_all("a", href=True):
-                        text = anchor.get_text(strip=True).lower()
-                        href = anchor["href"]
-                        
+                    for href, name in iter_anchors(resp):
                         # Check if it's a relevant committee (use allowlist)
-                        committee_names = RIS_COMMITTEE_NAMES if RIS_COMMITTEE_NAMES else RIS_COMMITTEE_ALLOWLIST
-                        if any(committee_name in text for committee_name in committee_names):
+                        if _COMMITTEE_MATCHER.contains_any(name.lower()):
                             committees.append({
-                                "name": anchor.get_text(strip=True),
-                                "url": urljoin(ris_base_url, href),
+                                "name": name,
+                                "url": resolve(href),
                                 "discovery_source": "RIS",
                                 "discovery_path": url,
                             })
@@ -165,17 +245,27 @@ def discover_committees(ris_base_url: str, session: Optional[requests.Session] =
     return committees
 
 
+def _parse_session_date(text: str) -> Optional[datetime]:
+    """First valid session date in text, or None."""
+    for match in _SESSION_DATE_RE.finditer(text):
+        if match.group("year"):
+            year, month, day = match.group("year", "month", "day")
+        else:
+            year, month, day = match.group("iso_year", "iso_month", "iso_day")
+        try:
+            return datetime(int(year), int(month), int(day))
+        except ValueError:
+            continue
+    return None
+
+
 def crawl_committee_sessions(committee_url: str, session: Optional[requests.Session] = None) -> List[Dict]:
     """
     Crawl sessions from a committee.
     Focuses on sessions with B-Plan or permit items.
     Extracts dates from session titles/text for smart pagination.
     """
-    from datetime import datetime
-    import re
-    
-    sess = session or requests.Session()
-    sess.headers.update({"User-Agent": USER_AGENT})
+    sess = session or get_session()
     
     sessions = []
     
@@ -184,39 +274,16 @@ def crawl_committee_sessions(committee_url: str, session: Optional[requests.Sess
         if not resp or resp.status_code != 200:
             return sessions
         
-        soup = BeautifulSoup(resp.text, "html.parser")
+        resolve = href_resolver(committee_url)
         
         # Look for session links
-        for anchor in soup.find_all("a", href=True):
-            href = anchor["href"]
-            text = anchor.get_text(strip=True)
-            
+        for href, text in iter_anchors(resp):
             # Check if it's a session (usually has date)
-            if any(term in text.lower() for term in ["sitzung", "sitzungstag", "datum"]):
-                session_url = urljoin(committee_url, href)
+            if _SESSION_LINK_MATCHER.contains_any(text.lower()):
+                session_url = resolve(href)
                 
                 # Try to extract date from text
-                session_date = None
-                # Common date patterns: DD.MM.YYYY, DD-MM-YYYY, YYYY-MM-DD
-                date_patterns = [
-                    r'(\d{1,2})\.(\d{1,2})\.(\d{4})',  # DD.MM.YYYY
-                    r'(\d{1,2})-(\d{1,2})-(\d{4})',    # DD-MM-YYYY
-                    r'(\d{4})-(\d{1,2})-(\d{1,2})',     # YYYY-MM-DD
-                ]
-                
-                for pattern in date_patterns:
-                    match = re.search(pattern, text)
-                    if match:
-                        try:
-                            if len(match.groups()) == 3:
-                                if pattern.startswith(r'(\d{4})'):  # YYYY-MM-DD
-                                    year, month, day = match.groups()
-                                else:  # DD.MM.YYYY or DD-MM-YYYY
-                                    day, month, year = match.groups()
-                                session_date = datetime(int(year), int(month), int(day))
-                                break
-                        except (ValueError, TypeError):
-                            continue
+                session_date = _parse_session_date(text)
                 
                 sessions.append({
                     "url": session_url,
@@ -237,8 +304,7 @@ def extract_session_items(session_url: str, session: Optional[requests.Session]
     Extract agenda items from a session.
     Widened: looks for privileged project language and energy/speicher terms.
     """
-    sess = session or requests.Session()
-    sess.headers.update({"User-Agent": USER_AGENT})
+    sess = session or get_session()
     
     items = []
     
@@ -247,40 +313,17 @@ def extract_session_items(session_url: str, session: Optional[requests.Session]
         if not resp or resp.status_code != 200:
             return items
         
-        soup = BeautifulSoup(resp.text, "html.parser")
-        text = soup.get_text().lower()
-        
-        # Expanded keywords for privileged projects
-        privileged_terms = [
-            "bebauungsplan", "b-plan", "bauleitplanung",
-            "bauvorbescheid", "baugenehmigung",
-            "einvernehmen", "§ 36", "§36",
-            "§ 35", "§35", "§ 34", "§34",
-            "bauantrag", "bauvoranfrage", "vorbescheid",
-            "stellungnahme", "kenntnisnahme",
-            "antrag auf errichtung",
-        ]
-        
-        energy_speicher_terms = [
-            "batteriespeicher", "energiespeicher", "speicheranlage",
-            "speicher", "photovoltaik", "umspannwerk",
-            "energie", "containeranlage",
-        ]
+        resolve = href_resolver(session_url)
         
         # Look for procedure-related items
-        for anchor in soup.find_all("a", href=True):
-            href = anchor["href"]
-            item_text = anchor.get_text(strip=True)
+        for href, item_text in iter_anchors(resp):
             item_text_lower = item_text.lower()
             
             # Check if it's a B-Plan, permit, or energy-related item
-            is_relevant = any(
-                term in item_text_lower
-                for term in privileged_terms + energy_speicher_terms
-            )
+            is_relevant = _SESSION_ITEM_MATCHER.contains_any(item_text_lower)
             
             if is_relevant:
-                item_url = urljoin(session_url, href)
+                item_url = resolve(href)
                 items.append({
                     "url": item_url,
                     "title": item_text,
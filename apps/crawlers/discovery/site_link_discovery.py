@@ -2,14 +2,18 @@
 Site-driven discovery: find RIS/Amtsblatt links from official municipal websites.
 This replaces URL guessing with actual link discovery from real websites.
 """
-from typing import List, Dict, Optional, Set
+import heapq
+from itertools import count
+from typing import List, Dict, Optional, Pattern, Set
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 import logging
 import re
 
 from apps.net.http_client import safe_get
+from apps.net.session import get_session
+from apps.parser.html_text import href_resolver, iter_anchors
+from apps.utils.keywords import KeywordMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +54,144 @@ AMTSBLATT_PATH_PATTERNS = [
     r'/öffentliche-auslegung',
 ]
 
+# Link-text / URL fragment patterns used during link classification
+RIS_TEXT_PATTERNS = ["ris", "ratsinfo", "sessionnet", "allris", "sitzung", "gremium"]
+AMTSBLATT_TEXT_PATTERNS = ["amtsblatt", "bekanntmachung", "amtliche bekanntmachung"]
+BEKANNTMACHUNG_URL_PATTERNS = ["bekanntmach", "veroeffentlich", "auslegung"]
+BEKANNTMACHUNG_TEXT_PATTERNS = ["bekanntmachung", "veröffentlichung", "öffentliche auslegung"]
+
+
+def _compile_alternation(patterns: List[str]) -> Pattern:
+    """One case-insensitive regex matching any of the patterns (single scan per text)."""
+    return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+
+
+_REGEX_METACHARS = frozenset(".^$*+?{}[]|()")
+
+
+def _as_literal(pattern: str) -> Optional[str]:
+    """Plain string a pattern matches if it has no regex semantics (e.g. 'ris\\.' -> 'ris.'), else None."""
+    chars = []
+    escaped = False
+    for c in pattern:
+        if escaped:
+            if c.isalnum():
+                return None  # \d, \b, ... are character classes/anchors
+            chars.append(c)
+            escaped = False
+        elif c == "\\":
+            escaped = True
+        elif c in _REGEX_METACHARS:
+            return None
+        else:
+            chars.append(c)
+    return None if escaped else "".join(chars)
+
+
+class _PatternSet:
+    """
+    Link patterns split into fixed literals (one substring automaton pass)
+    and real regexes (one alternation, only consulted when literals miss).
+    search() expects lowercased text.
+    """
+    
+    def __init__(self, patterns: List[str]):
+        literals = []
+        regexes = []
+        for pattern in patterns:
+            literal = _as_literal(pattern)
+            if literal is None:
+                regexes.append(pattern)
+            else:
+                literals.append(literal.lower())
+        self._literals = KeywordMatcher(literals)
+        self._regex = _compile_alternation(regexes) if regexes else None
+    
+    def search(self, text_lower: str) -> bool:
+        if self._literals.contains_any(text_lower):
+            return True
+        return self._regex is not None and self._regex.search(text_lower) is not None
+
+
+class _LinkClassifier:
+    """
+    Classifies a link into categories with one automaton scan of the URL and
+    one of the link text. Every literal maps to the categories it signals, so
+    links to unrelated pages are rejected after those two scans; real regex
+    patterns (none at present) are only tried for categories not yet hit.
+    classify() expects lowercased url and text.
+    """
+    
+    def __init__(self, categories: Dict[str, tuple]):
+        self._url_index: Dict[str, Set[str]] = {}
+        self._text_index: Dict[str, Set[str]] = {}
+        self._url_regexes: Dict[str, Pattern] = {}
+        self._text_regexes: Dict[str, Pattern] = {}
+        for category, (url_patterns, text_patterns) in categories.items():
+            self._index(category, url_patterns, self._url_index, self._url_regexes)
+            self._index(category, text_patterns, self._text_index, self._text_regexes)
+        self._url_matcher = KeywordMatcher(self._url_index)
+        self._text_matcher = KeywordMatcher(self._text_index)
+    
+    @staticmethod
+    def _index(category: str, patterns: List[str], index: Dict[str, Set[str]], regexes: Dict[str, Pattern]) -> None:
+        leftovers = []
+        for pattern in patterns:
+            literal = _as_literal(pattern)
+            if literal is None:
+                leftovers.append(pattern)
+            else:
+                index.setdefault(literal.lower(), set()).add(category)
+        if leftovers:
+            regexes[category] = _compile_alternation(leftovers)
+    
+    def classify(self, url_lower: str, text_lower: str) -> Set[str]:
+        hits: Set[str] = set()
+        for term in self._url_matcher.matched_terms(url_lower):
+            hits |= self._url_index[term]
+        for term in self._text_matcher.matched_terms(text_lower):
+            hits |= self._text_index[term]
+        for category, regex in self._url_regexes.items():
+            if category not in hits and regex.search(url_lower):
+                hits.add(category)
+        for category, regex in self._text_regexes.items():
+            if category not in hits and regex.search(text_lower):
+                hits.add(category)
+        return hits
+
+
+# hrefs skipped before any URL or text processing
+_SKIP_HREF_PREFIXES = ("#", "mailto:", "tel:", "javascript:")
+
+# Built once at import
+_LINK_CLASSIFIER = _LinkClassifier({
+    "ris": (RIS_DOMAIN_PATTERNS + RIS_PATH_PATTERNS, RIS_TEXT_PATTERNS),
+    "amtsblatt": (AMTSBLATT_PATH_PATTERNS, AMTSBLATT_TEXT_PATTERNS),
+    "bekanntmachung": (BEKANNTMACHUNG_URL_PATTERNS, BEKANNTMACHUNG_TEXT_PATTERNS),
+})
+_FOLLOW_PAGE = _PatternSet([
+    "impressum", "kontakt", "sitemap", "index", "startseite",
+    "bekanntmach", "ratsinfo", "gremien",
+])
+
+# Frontier priority: (URL substring, score); pages with stronger signals are fetched first
+FRONTIER_SIGNALS = [
+    ("sitemap.xml", 10),
+    ("/bekanntmach", 8),
+    ("/ratsinfo", 8),
+    ("/gremien", 8),
+    ("/impressum", 1),
+    ("/kontakt", 1),
+]
+
+# Stop crawling once this many RIS and Amtsblatt URLs have been found
+EARLY_EXIT_MIN_URLS = 3
+
+
+def _frontier_score(url_lower: str) -> int:
+    return sum(score for signal, score in FRONTIER_SIGNALS if signal in url_lower)
+
+
 # Pages to check (in order of priority)
 DISCOVERY_PAGES = [
     "",  # Homepage
@@ -61,37 +203,40 @@ DISCOVERY_PAGES = [
 ]
 
 
-def normalize_url(url: str, base_url: str) -> str:
-    """Normalize a URL to absolute form."""
-    if not url:
-        return ""
-    if url.startswith(("http://", "https://")):
-        return url
-    return urljoin(base_url, url)
+def _host(url: str) -> Optional[str]:
+    """Lowercased host of url without port, or None if it cannot be parsed."""
+    try:
+        return urlparse(url).netloc.lower().split(':')[0]
+    except Exception:
+        return None
 
 
 def is_same_domain(url1: str, url2: str) -> bool:
     """Check if two URLs are on the same domain."""
-    try:
-        domain1 = urlparse(url1).netloc.lower()
-        domain2 = urlparse(url2).netloc.lower()
-        # Remove port if present
-        if ':' in domain1:
-            domain1 = domain1.split(':')[0]
-        if ':' in domain2:
-            domain2 = domain2.split(':')[0]
-        return domain1 == domain2
-    except Exception:
-        return False
+    domain1 = _host(url1)
+    return domain1 is not None and domain1 == _host(url2)
 
 
-def matches_pattern(text: str, patterns: List[str]) -> bool:
-    """Check if text matches any of the regex patterns."""
-    text_lower = text.lower()
-    for pattern in patterns:
-        if re.search(pattern, text_lower):
-            return True
-    return False
+# Prioritize URLs with stronger signals. sorted() calls a key once per URL,
+# so each URL is lowercased and scored exactly once.
+def _rank_ris_url(url: str) -> int:
+    url_lower = url.lower()
+    score = 0
+    if "allris" in url_lower or "sessionnet" in url_lower:
+        score += 10
+    if "si0100" in url_lower or "ris" in url_lower:
+        score += 5
+    return score
+
+
+def _rank_amtsblatt_url(url: str) -> int:
+    url_lower = url.lower()
+    score = 0
+    if "amtsblatt" in url_lower:
+        score += 10
+    if "bekanntmachung" in url_lower:
+        score += 5
+    return score
 
 
 def discover_links_from_official_site(
@@ -120,28 +265,35 @@ def discover_links_from_official_site(
         }
     
     base_url = official_url.rstrip("/")
-    session = requests.Session()
-    session.headers.update({"User-Agent": USER_AGENT})
+    base_host = _host(base_url)
+    session = get_session()
     
     ris_urls: Set[str] = set()
     amtsblatt_urls: Set[str] = set()
     bekanntmachung_urls: Set[str] = set()
     
     pages_fetched = 0
-    pages_to_visit = []
+    # Priority frontier: (-score, insertion order, url, depth); equal scores stay FIFO
+    pages_to_visit: List[tuple] = []
+    order = count()
     visited_urls: Set[str] = set()
     
-    # Start with discovery pages
+    def enqueue(url: str, depth: int, score: int) -> None:
+        heapq.heappush(pages_to_visit, (-score, next(order), url, depth))
+    
+    # Start with discovery pages; the homepage always goes first
     for page_path in DISCOVERY_PAGES:
-        if pages_fetched >= max_pages:
-            break
         url = base_url + page_path if page_path else base_url
-        if url not in visited_urls:
-            pages_to_visit.append((url, 0))  # (url, depth)
+        score = _frontier_score(url.lower()) if page_path else max(s for _, s in FRONTIER_SIGNALS) + 1
+        enqueue(url, 0, score)
     
     # Crawl pages
     while pages_to_visit and pages_fetched < max_pages:
-        current_url, depth = pages_to_visit.pop(0)
+        if len(ris_urls) >= EARLY_EXIT_MIN_URLS and len(amtsblatt_urls) >= EARLY_EXIT_MIN_URLS:
+            logger.debug("Site discovery for %s: enough RIS/Amtsblatt URLs, stopping early", base_url)
+            break
+        
+        _, _, current_url, depth = heapq.heappop(pages_to_visit)
         
         if current_url in visited_urls:
             continue
@@ -157,88 +309,62 @@ def discover_links_from_official_site(
             if not resp or resp.status_code != 200:
                 continue
             
-            soup = BeautifulSoup(resp.text, "html.parser")
+            resolve = href_resolver(current_url)
             
             # Extract all links
-            for anchor in soup.find_all("a", href=True):
-                href = anchor.get("href", "")
-                link_text = anchor.get_text(strip=True)
+            for href, link_text in iter_anchors(resp):
+                # In-page anchors and non-HTTP schemes are never candidates
+                if not href or href.startswith(_SKIP_HREF_PREFIXES):
+                    continue
                 
                 # Normalize URL
-                full_url = normalize_url(href, current_url)
+                full_url = resolve(href)
                 
                 if not full_url or not full_url.startswith(("http://", "https://")):
                     continue
                 
-                # Check if it's a RIS link
+                # Classify once: which categories does this link signal?
                 url_lower = full_url.lower()
                 text_lower = link_text.lower()
+                categories = _LINK_CLASSIFIER.classify(url_lower, text_lower)
                 
-                is_ris = (
-                    matches_pattern(url_lower, RIS_DOMAIN_PATTERNS) or
-                    matches_pattern(url_lower, RIS_PATH_PATTERNS) or
-                    matches_pattern(text_lower, ["ris", "ratsinfo", "sessionnet", "allris", "sitzung", "gremium"])
-                )
+                # Check if it's a RIS link
+                is_ris = "ris" in categories
                 
-                if is_ris and is_same_domain(full_url, base_url) or not is_same_domain(full_url, base_url):
+                if is_ris:
                     # RIS can be on different domain (common pattern)
                     ris_urls.add(full_url)
                     logger.debug("Found RIS link: %s (from %s)", full_url, current_url)
                 
                 # Check if it's an Amtsblatt link
-                is_amtsblatt = (
-                    matches_pattern(url_lower, AMTSBLATT_PATH_PATTERNS) or
-                    matches_pattern(text_lower, ["amtsblatt", "bekanntmachung", "amtliche bekanntmachung"])
-                )
+                is_amtsblatt = "amtsblatt" in categories
                 
                 if is_amtsblatt:
                     amtsblatt_urls.add(full_url)
                     logger.debug("Found Amtsblatt link: %s (from %s)", full_url, current_url)
                 
                 # Check if it's a Bekanntmachung link (broader category)
-                is_bekanntmachung = (
-                    matches_pattern(url_lower, ["bekanntmach", "veroeffentlich", "auslegung"]) or
-                    matches_pattern(text_lower, ["bekanntmachung", "veröffentlichung", "öffentliche auslegung"])
-                )
+                is_bekanntmachung = "bekanntmachung" in categories
                 
                 if is_bekanntmachung and full_url not in amtsblatt_urls:
                     bekanntmachung_urls.add(full_url)
                     logger.debug("Found Bekanntmachung link: %s (from %s)", full_url, current_url)
                 
                 # If depth allows, add internal links to visit queue
-                if depth < max_depth and is_same_domain(full_url, base_url):
+                if depth < max_depth and _host(url_lower) == base_host:
                     if full_url not in visited_urls:
                         # Only add if it looks like a discovery-relevant page
-                        if any(term in url_lower for term in ["impressum", "kontakt", "sitemap", "index", "startseite"]):
-                            pages_to_visit.append((full_url, depth + 1))
+                        if _FOLLOW_PAGE.search(url_lower):
+                            enqueue(full_url, depth + 1, _frontier_score(url_lower))
         
         except Exception as e:
             logger.debug("Failed to fetch %s: %s", current_url, e)
             continue
     
     # Rank URLs (best guess first)
-    # Prioritize URLs with stronger signals
-    def rank_ris_url(url: str) -> int:
-        url_lower = url.lower()
-        score = 0
-        if "allris" in url_lower or "sessionnet" in url_lower:
-            score += 10
-        if "si0100" in url_lower or "ris" in url_lower:
-            score += 5
-        return score
-    
-    def rank_amtsblatt_url(url: str) -> int:
-        url_lower = url.lower()
-        score = 0
-        if "amtsblatt" in url_lower:
-            score += 10
-        if "bekanntmachung" in url_lower:
-            score += 5
-        return score
-    
-    ranked_ris = sorted(list(ris_urls), key=rank_ris_url, reverse=True)
-    ranked_amtsblatt = sorted(list(amtsblatt_urls), key=rank_amtsblatt_url, reverse=True)
-    ranked_bekanntmachung = sorted(list(bekanntmachung_urls), key=rank_amtsblatt_url, reverse=True)
+    ranked_ris = sorted(ris_urls, key=_rank_ris_url, reverse=True)
+    ranked_amtsblatt = sorted(amtsblatt_urls, key=_rank_amtsblatt_url, reverse=True)
+    ranked_bekanntmachung = sorted(bekanntmachung_urls, key=_rank_amtsblatt_url, reverse=True)
     
     logger.info(
         "Site discovery for %s: found %d RIS, %d Amtsblatt, %d Bekanntmachung URLs (fetched %d pages)",
@@ -2,13 +2,16 @@
 Amtsblatt crawler with explicit discovery paths.
 Focuses on B-Plan announcements and permit notices.
 """
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
 import logging
-import time
 
+from apps.net.ratelimit import host_limiter, wait_for_host
+from apps.net.session import get_session
+from apps.parser.html_text import document_links, href_resolver, parse_html
+from apps.utils.keywords import KeywordMatcher
+from ..discovery.cache import cached_discovery
+from ..records import IssueDocumentRecord, IssueEntryRecord, IssueRecord
 from ..discovery.amtsblatt_discovery import (
     discover_amtsblatt,
     list_amtsblatt_issues,
@@ -17,22 +20,17 @@ from ..discovery.amtsblatt_discovery import (
 
 logger = logging.getLogger(__name__)
 
-USER_AGENT = "BESS-Forensic-Crawler/1.0 (Research/Transparency; +https://github.com/bess-crawler)"
-MIN_REQUEST_DELAY = 1.0
-_last_request_time = {}
+# Repeat visits of a municipality reuse the discovery result
+_discover_amtsblatt = cached_discovery(discover_amtsblatt)
 
+USER_AGENT = "BESS-Forensic-Crawler/1.0 (Research/Transparency; +https://github.com/bess-crawler)"
 
-def _rate_limit(domain: str, min_delay: float = MIN_REQUEST_DELAY):
-    """Rate-Limiting: Wartet zwischen Requests."""
-    global _last_request_time
-    if domain in _last_request_time:
-        elapsed = time.time() - _last_request_time[domain]
-        if elapsed < min_delay:
-            time.sleep(min_delay - elapsed)
-    _last_request_time[domain] = time.time()
+# Link text of an issue entry on a feed/listing page
+ISSUE_LINK_KEYWORDS = ["amtsblatt", "bekanntmachung", "ausgabe", "nummer"]
+_ISSUE_LINK_MATCHER = KeywordMatcher(ISSUE_LINK_KEYWORDS)
 
 
-def list_issues(feed_url: str, municipality_name: str = "", session: Optional[requests.Session] = None) -> tuple[List[Dict], Dict]:
+def list_issues(feed_url: str, municipality_name: str = "", session: Optional[requests.Session] = None) -> tuple[List[IssueRecord], Dict]:
     """
     List available Amtsblatt issues using explicit discovery.
     
@@ -56,7 +54,7 @@ def list_issues(feed_url: str, municipality_name: str = "", session: Optional[re
     if session and hasattr(session, 'official_website_url'):
         official_website_url = session.official_website_url
     
-    amtsblatt_url, discovery_diagnostics = discover_amtsblatt(municipality_name, valid_feed_url, official_website_url)
+    amtsblatt_url, discovery_diagnostics = _discover_amtsblatt(municipality_name, valid_feed_url, official_website_url)
     diagnostics.update(discovery_diagnostics)
     
     # Log diagnostics
@@ -79,8 +77,7 @@ def list_issues(feed_url: str, municipality_name: str = "", session: Optional[re
             logger.debug("Skipping: no valid feed_url and discovery failed")
             return [], diagnostics
     
-    sess = session or requests.Session()
-    sess.headers.update({"User-Agent": USER_AGENT})
+    sess = session or get_session()
     
     # Step 2: List issues
     issues = list_amtsblatt_issues(amtsblatt_url, sess)
@@ -94,7 +91,7 @@ def list_issues(feed_url: str, municipality_name: str = "", session: Optional[re
     return issues, diagnostics
 
 
-def _list_issues_fallback(feed_url: str, session: requests.Session) -> List[Dict]:
+def _list_issues_fallback(feed_url: str, session: requests.Session) -> List[IssueRecord]:
     """
     Fallback method: List issues from Amtsblatt feed or listing page (old implementation).
     Only works if feed_url is a valid URL.
@@ -106,20 +103,25 @@ def _list_issues_fallback(feed_url: str, session: requests.Session) -> List[Dict
     issues = []
     
     try:
+        host = wait_for_host(feed_url)
         resp = session.get(feed_url, timeout=20)
+        host_limiter.observe(host, resp.status_code, resp.headers)
         if resp.status_code != 200:
             return issues
         
-        soup = BeautifulSoup(resp.text, "html.parser")
+        root = parse_html(resp)
+        resolve = href_resolver(feed_url)
         
         # Look for issue links (common patterns: dates, numbers, "Amtsblatt")
-        for link in soup.find_all("a", href=True):
-            href = link.get("href", "")
-            text = link.get_text(strip=True)
+        for link in root.iter("a"):
+            href = link.get("href")
+            if not href:
+                continue
+            text = link.text_content().strip()
             
             # Heuristics for issue links
-            if any(keyword in text.lower() for keyword in ["amtsblatt", "bekanntmachung", "ausgabe", "nummer"]):
-                url = urljoin(feed_url, href)
+            if _ISSUE_LINK_MATCHER.contains_any(text.lower()):
+                url = resolve(href)
                 issues.append({
                     "url": url,
                     "title": text,
@@ -133,13 +135,12 @@ def _list_issues_fallback(feed_url: str, session: requests.Session) -> List[Dict
     return issues
 
 
-def fetch_issue(issue: Dict, session: Optional[requests.Session] = None) -> List[Dict]:
+def fetch_issue(issue: Dict, session: Optional[requests.Session] = None) -> List[Union[IssueEntryRecord, IssueDocumentRecord]]:
     """
     Fetch procedures from an Amtsblatt issue.
     Only extracts B-Plan and permit announcements.
     """
-    sess = session or requests.Session()
-    sess.headers.update({"User-Agent": USER_AGENT})
+    sess = session or get_session()
     
     issue_url = issue.get("url")
     if not issue_url:
@@ -155,7 +156,7 @@ def fetch_issue(issue: Dict, session: Optional[requests.Session] = None) -> List
     return procedures
 
 
-def _fetch_issue_fallback(issue: Dict, session: requests.Session) -> List[Dict]:
+def _fetch_issue_fallback(issue: Dict, session: requests.Session) -> List[IssueDocumentRecord]:
     """
     Fallback method: Fetch documents from an Amtsblatt issue (old implementation).
     """
@@ -166,32 +167,30 @@ def _fetch_issue_fallback(issue: Dict, session: requests.Session) -> List[Dict]:
         if not url:
             return documents
         
+        host = wait_for_host(url)
         resp = session.get(url, timeout=20)
+        host_limiter.observe(host, resp.status_code, resp.headers)
         if resp.status_code != 200:
             return documents
         
-        soup = BeautifulSoup(resp.text, "html.parser")
+        root = parse_html(resp)
+        resolve = href_resolver(url)
         
-        # Find PDF/document links
-        for link in soup.find_all("a", href=True):
-            href = link.get("href", "")
-            text = link.get_text(strip=True)
-            
-            if href.lower().endswith((".pdf", ".doc", ".docx")):
-                doc_url = urljoin(url, href)
-                documents.append({
-                    "doc_url": doc_url,
-                    "label": text,
-                    "issue_url": url,
-                    "discovery_source": "AMTSBLATT",
-                    "discovery_path": url,
-                })
+        # Find PDF/document links (filtered by the precompiled XPath)
+        for link in document_links(root):
+            documents.append({
+                "doc_url": resolve(link.get("href")),
+                "label": link.text_content().strip(),
+                "issue_url": url,
+                "discovery_source": "AMTSBLATT",
+                "discovery_path": url,
+            })
         
         # Also look for embedded PDFs or iframes
-        for iframe in soup.find_all("iframe", src=True):
-            src = iframe.get("src", "")
-            if ".pdf" in src.lower():
-                doc_url = urljoin(url, src)
+        for iframe in root.iter("iframe"):
+            src = iframe.get("src")
+            if src and ".pdf" in src.lower():
+                doc_url = resolve(src)
                 documents.append({
                     "doc_url": doc_url,
                     "label": "Embedded PDF",
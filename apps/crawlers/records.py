@@ -0,0 +1,54 @@
+"""
+Record shapes returned by the crawlers.
+Plain dicts at runtime (consumers use .get()), typed for readers and checkers.
+"""
+from datetime import datetime
+from typing import Any, Dict, NotRequired, Optional, TypedDict
+
+
+class ProcedureRecord(TypedDict):
+    """RIS agenda item / procedure link (sessionnet.list_procedures)."""
+    url: str
+    title: str
+    discovery_source: str
+    discovery_path: str
+    date: NotRequired[Optional[datetime]]
+    source: NotRequired[str]
+
+
+class IssueRecord(TypedDict):
+    """Amtsblatt issue link (gazette.list_issues)."""
+    url: str
+    title: str
+    discovery_source: str
+    discovery_path: str
+    date: NotRequired[Optional[datetime]]
+
+
+class IssueEntryRecord(TypedDict):
+    """Procedure found in an Amtsblatt issue: a PDF or the issue page itself."""
+    url: str
+    title: str
+    type: str  # "document" or "issue"
+    discovery_source: str
+    discovery_path: str
+
+
+class IssueDocumentRecord(TypedDict):
+    """Document link from the issue-page fallback (gazette.fetch_issue)."""
+    doc_url: str
+    label: str
+    issue_url: str
+    discovery_source: str
+    discovery_path: str
+
+
+class FeatureRecord(TypedDict):
+    """Normalized XPlanung WFS feature (harvest_layer)."""
+    name: str
+    planart: str
+    gemeinde: str
+    status: str
+    geometry: Optional[Dict[str, Any]]
+    raw: Optional[Dict[str, Any]]
+
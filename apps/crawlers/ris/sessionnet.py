@@ -2,15 +2,21 @@
 RIS/SessionNet connector with explicit discovery paths.
 Focuses on committees and sessions that handle B-Plan and permit procedures.
 """
+from datetime import datetime
 from typing import List, Dict, Optional
 import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 import logging
-import time
 
 from apps.net.http_client import safe_get
+from apps.net.probe import probe_urls
 from apps.net.ris_http_fallback import ris_safe_get
+from apps.net.ratelimit import host_limiter, wait_for_host
+from apps.net.session import get_session
+from apps.parser.html_text import decode_body, has_doc_suffix, href_resolver, iter_anchors, parse_html
+from apps.utils.keywords import KeywordMatcher
+from ..discovery.cache import cached_discovery
+from ..records import ProcedureRecord
 from ..discovery.ris_discovery import (
     discover_ris,
     discover_committees,
@@ -20,24 +26,29 @@ from ..discovery.ris_discovery import (
 
 logger = logging.getLogger(__name__)
 
+# Repeat visits of a municipality reuse the discovery result
+_discover_ris = cached_discovery(discover_ris)
+
 USER_AGENT = "BESS-Forensic-Crawler/1.0 (Research/Transparency; +https://github.com/bess-crawler)"
-MIN_REQUEST_DELAY = 1.0
-_last_request_time = {}
 
+# Smart pagination: stop after N consecutive sessions older than the cutoff
+SESSION_CUTOFF_DATE = datetime(2023, 1, 1)
+MAX_CONSECUTIVE_OLD_SESSIONS = 3
+
+# Link text of a session entry on a RIS start page
+SESSION_LINK_KEYWORDS = ["sitzung", "tagesordnung", "beschluss"]
+_SESSION_LINK_MATCHER = KeywordMatcher(SESSION_LINK_KEYWORDS)
 
-def _rate_limit(domain: str, min_delay: float = MIN_REQUEST_DELAY):
-    """Rate-Limiting: Wartet zwischen Requests."""
-    global _last_request_time
-    if domain in _last_request_time:
-        elapsed = time.time() - _last_request_time[domain]
-        if elapsed < min_delay:
-            time.sleep(min_delay - elapsed)
-    _last_request_time[domain] = time.time()
+# href fragments of agenda-item/document links on SessionNet list pages
+PROCEDURE_LINK_KEYWORDS = ["si0200", "si0300", "dokument", "vorlage", "antrag"]
+_PROCEDURE_LINK_MATCHER = KeywordMatcher(PROCEDURE_LINK_KEYWORDS)
 
 
 def discover(base_url: str) -> List[str]:
     """
     Discover SessionNet installations by checking common paths.
+    All paths are probed at once over the pooled keep-alive connections;
+    the first path (in priority order) that serves SessionNet wins.
     """
     common_paths = [
         "/si0100.asp",
@@ -45,20 +56,44 @@ def discover(base_url: str) -> List[str]:
         "/index.php",
         "/",
     ]
+    session = get_session()
+    candidates = list(dict.fromkeys(urljoin(base_url, path) for path in common_paths))
+    
     found = []
-    for path in common_paths:
-        try:
-            url = urljoin(base_url, path)
-            resp = ris_safe_get(url, timeout=10, headers={"User-Agent": USER_AGENT})
-            if resp and resp.status_code == 200 and "sessionnet" in resp.text.lower():
-                found.append(url)
-                break
-        except:
-            continue
+    for url, resp, error in probe_urls(candidates, lambda u: ris_safe_get(u, session=session, timeout=10)):
+        if error is None and resp and resp.status_code == 200 and "sessionnet" in decode_body(resp).lower():
+            found.append(url)
+            break
     return found
 
 
-def list_procedures(base_url: str, municipality_name: str = "", session: Optional[requests.Session] = None) -> tuple[List[Dict], Dict]:
+def _paginate_sessions(sessions: List[Dict]) -> List[Dict]:
+    """
+    Sessions of one committee worth opening: stops after N=3 consecutive
+    sessions dated before 2023-01-01 (undated sessions count as recent).
+    """
+    selected = []
+    consecutive_old_count = 0
+    for session_info in sessions:
+        session_date = session_info.get("date")
+        if session_date and isinstance(session_date, datetime):
+            if session_date < SESSION_CUTOFF_DATE:
+                consecutive_old_count += 1
+                if consecutive_old_count >= MAX_CONSECUTIVE_OLD_SESSIONS:
+                    logger.debug("Stopping pagination: %d consecutive old sessions (last: %s < 2023-01-01)", 
+                                consecutive_old_count, session_date)
+                    break
+            else:
+                # Reset counter if we hit a recent session
+                consecutive_old_count = 0
+        else:
+            # If no date, assume it might be recent and reset counter
+            consecutive_old_count = 0
+        selected.append(session_info)
+    return selected
+
+
+def list_procedures(base_url: str, municipality_name: str = "", session: Optional[requests.Session] = None) -> tuple[List[ProcedureRecord], Dict]:
     """
     List procedures from RIS/SessionNet using explicit discovery paths.
     Discovery order: RIS -> Committees -> Sessions -> Items
@@ -83,7 +118,7 @@ def list_procedures(base_url: str, municipality_name: str = "", session: Optiona
     if session and hasattr(session, 'official_website_url'):
         official_website_url = session.official_website_url
     
-    ris_url, discovery_diagnostics = discover_ris(municipality_name, valid_base_url, official_website_url)
+    ris_url, discovery_diagnostics = _discover_ris(municipality_name, valid_base_url, official_website_url)
     diagnostics.update(discovery_diagnostics)
     
     # Log diagnostics
@@ -108,8 +143,7 @@ def list_procedures(base_url: str, municipality_name: str = "", session: Optiona
             logger.debug("Skipping fallback: no valid base_url provided")
             return [], diagnostics
     
-    sess = session or requests.Session()
-    sess.headers.update({"User-Agent": USER_AGENT})
+    sess = session or get_session()
     
     # Step 2: Discover committees
     committees = discover_committees(ris_url, sess)
@@ -120,52 +154,36 @@ def list_procedures(base_url: str, municipality_name: str = "", session: Optiona
         diagnostics.update(direct_diagnostics)
         return direct_procs, diagnostics
     
-    # Step 3: Crawl sessions from each committee (with smart pagination)
-    from datetime import datetime
-    cutoff_date = datetime(2023, 1, 1)
-    consecutive_old_count = 0
-    max_consecutive_old = 3  # Stop after N=3 consecutive old sessions
+    # Step 3: Crawl sessions from all committees concurrently (results in committee order)
+    committee_sessions = []
+    for _, sessions, error in probe_urls([c["url"] for c in committees], lambda u: crawl_committee_sessions(u, sess)):
+        committee_sessions.append(sessions if error is None else [])
     
-    for committee in committees:
-        sessions = crawl_committee_sessions(committee["url"], sess)
-        
-        # Step 4: Extract items from each session (smart pagination: stop after N=3 consecutive old sessions)
-        for session_info in sessions:
-            # Check session date
-            session_date = session_info.get("date")
-            if session_date and isinstance(session_date, datetime):
-                if session_date < cutoff_date:
-                    consecutive_old_count += 1
-                    if consecutive_old_count >= max_consecutive_old:
-                        logger.debug("Stopping pagination: %d consecutive old sessions (last: %s < 2023-01-01)", 
-                                    consecutive_old_count, session_date)
-                        break
-                else:
-                    # Reset counter if we hit a recent session
-                    consecutive_old_count = 0
-            else:
-                # If no date, assume it might be recent and reset counter
-                consecutive_old_count = 0
-            
-            items = extract_session_items(session_info["url"], sess)
-            
-            for item in items:
-                procedures.append({
-                    "url": item["url"],
-                    "title": item["title"],
-                    "date": session_date,
-                    "discovery_source": "RIS",
-                    "discovery_path": session_info["discovery_path"],
-                })
-        
-        # Reset counter for next committee
-        consecutive_old_count = 0
+    # Smart pagination only looks at session dates, so the sessions to open
+    # are known before any of them is fetched
+    selected_sessions = [
+        session_info
+        for sessions in committee_sessions
+        for session_info in _paginate_sessions(sessions)
+    ]
+    
+    # Step 4: Extract items from the selected sessions concurrently (results in session order)
+    session_items = probe_urls([s["url"] for s in selected_sessions], lambda u: extract_session_items(u, sess))
+    for session_info, (_, items, error) in zip(selected_sessions, session_items):
+        for item in items if error is None else []:
+            procedures.append({
+                "url": item["url"],
+                "title": item["title"],
+                "date": session_info.get("date"),
+                "discovery_source": "RIS",
+                "discovery_path": session_info["discovery_path"],
+            })
     
     diagnostics["reason_code"] = "FOUND" if procedures else "FOUND_BUT_EMPTY"
     return procedures, diagnostics
 
 
-def _list_sessions_direct(ris_url: str, session: requests.Session) -> tuple[List[Dict], Dict]:
+def _list_sessions_direct(ris_url: str, session: requests.Session) -> tuple[List[ProcedureRecord], Dict]:
     """Fallback: Try to list sessions directly from RIS."""
     procedures = []
     diagnostics = {"method": "direct_fallback", "reason_code": "FOUND_BUT_EMPTY"}
@@ -175,24 +193,24 @@ def _list_sessions_direct(ris_url: str, session: requests.Session) -> tuple[List
         if not resp or resp.status_code != 200:
             return procedures, diagnostics
         
-        soup = BeautifulSoup(resp.text, "html.parser")
+        resolve = href_resolver(ris_url)
         
         # Look for session links
-        for anchor in soup.find_all("a", href=True):
-            href = anchor["href"]
-            text = anchor.get_text(strip=True)
-            
-            if any(term in text.lower() for term in ["sitzung", "tagesordnung", "beschluss"]):
-                session_url = urljoin(ris_url, href)
-                items = extract_session_items(session_url, session)
-                
-                for item in items:
-                    procedures.append({
-                        "url": item["url"],
-                        "title": item["title"],
-                        "discovery_source": "RIS",
-                        "discovery_path": ris_url,
-                    })
+        session_urls = [
+            resolve(href)
+            for href, text in iter_anchors(resp)
+            if _SESSION_LINK_MATCHER.contains_any(text.lower())
+        ]
+        
+        # Fetch the sessions concurrently (results in link order)
+        for _, items, error in probe_urls(session_urls, lambda u: extract_session_items(u, session)):
+            for item in items if error is None else []:
+                procedures.append({
+                    "url": item["url"],
+                    "title": item["title"],
+                    "discovery_source": "RIS",
+                    "discovery_path": ris_url,
+                })
     except Exception as e:
         logger.warning("Failed to list sessions directly from RIS %s: %s", ris_url, e)
     
@@ -200,7 +218,7 @@ def _list_sessions_direct(ris_url: str, session: requests.Session) -> tuple[List
     return procedures, diagnostics
 
 
-def _list_procedures_fallback(base_url: str, session: Optional[requests.Session] = None) -> tuple[List[Dict], Dict]:
+def _list_procedures_fallback(base_url: str, session: Optional[requests.Session] = None) -> tuple[List[ProcedureRecord], Dict]:
     """
     Fallback method: List procedures from SessionNet system (old implementation).
     Only works if base_url is a valid URL.
@@ -210,8 +228,7 @@ def _list_procedures_fallback(base_url: str, session: Optional[requests.Session]
         logger.debug("Fallback skipped: invalid base_url '%s'", base_url)
         return [], diagnostics
     
-    sess = session or requests.Session()
-    sess.headers.update({"User-Agent": USER_AGENT})
+    sess = session or get_session()
     procedures = []
     
     # Common SessionNet search/list endpoints
@@ -221,25 +238,27 @@ def _list_procedures_fallback(base_url: str, session: Optional[requests.Session]
         urljoin(base_url, "index.php"),
     ]
     
+    resolve = href_resolver(base_url)
     for search_url in search_urls:
         try:
+            host = wait_for_host(search_url)
             resp = sess.get(search_url, timeout=20)
+            host_limiter.observe(host, resp.status_code, resp.headers)
             if resp.status_code != 200:
                 continue
             
-            soup = BeautifulSoup(resp.text, "html.parser")
+            root = parse_html(resp)
             
             # Look for links to agenda items (common patterns)
-            for link in soup.find_all("a", href=True):
-                href = link.get("href", "")
-                text = link.get_text(strip=True)
+            for link in root.iter("a"):
+                href = link.get("href")
                 
                 # Heuristics for procedure links
-                if any(keyword in href.lower() for keyword in ["si0200", "si0300", "dokument", "vorlage", "antrag"]):
-                    url = urljoin(base_url, href)
+                if href and _PROCEDURE_LINK_MATCHER.contains_any(href.lower()):
+                    url = resolve(href)
                     procedures.append({
                         "url": url,
-                        "title": text,
+                        "title": link.text_content().strip(),
                         "source": "sessionnet",
                         "discovery_source": "RIS",
                         "discovery_path": base_url,
@@ -256,28 +275,27 @@ def fetch_agenda_item(url: str, session: Optional[requests.Session] = None) -> D
     """
     Fetch agenda item details and attachments.
     """
-    sess = session or requests.Session()
-    sess.headers.update({"User-Agent": USER_AGENT})
+    sess = session or get_session()
     try:
         resp = ris_safe_get(url, session=sess, timeout=20)
         if not resp or resp.status_code != 200:
             return {}
         
-        soup = BeautifulSoup(resp.text, "html.parser")
+        root = parse_html(resp)
         
         # Extract title
-        title = soup.find("title")
-        title_text = title.get_text(strip=True) if title else ""
+        title_text = (root.findtext(".//title") or "").strip()
         
         # Find document attachments
+        resolve = href_resolver(url)
         documents = []
-        for link in soup.find_all("a", href=True):
-            href = link.get("href", "")
-            if href.lower().endswith((".pdf", ".doc", ".docx")):
-                doc_url = urljoin(url, href)
+        for link in root.iter("a"):
+            href = link.get("href")
+            if href and has_doc_suffix(href):
+                doc_url = resolve(href)
                 documents.append({
                     "doc_url": doc_url,
-                    "label": link.get_text(strip=True),
+                    "label": link.text_content().strip(),
                 })
         
         return {
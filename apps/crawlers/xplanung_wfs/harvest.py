@@ -1,12 +1,37 @@
 """
 XPlanung WFS harvester for structured planning data.
 """
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import FrozenSet, Iterator, List, Dict, Optional
 import requests
 from xml.etree import ElementTree as ET
 from urllib.parse import urlencode, urlparse, parse_qs
 import logging
 
+from apps.crawlers.records import FeatureRecord
+from apps.net.session import get_session
+
+try:
+    import ijson
+except ImportError:  # ijson optional, GeoJSON is then parsed in one piece
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # orjson optional, stdlib json via resp.json()
+    orjson = None
+
+try:
+    from lxml import etree
+except ImportError:  # lxml optional, fall back to xml.etree
+    etree = None
+
+try:
+    import fiona
+    from fiona.io import MemoryFile
+except ImportError:  # fiona optional, GetFeature then stays on GeoJSON
+    fiona = None
+
 logger = logging.getLogger(__name__)
 
 NS = {
@@ -15,6 +40,31 @@ NS = {
     "xplan": "http://www.xplanung.de/xplangml/6/0",
 }
 
+if etree is not None:
+    # No entity expansion or network access for documents from remote servers
+    _XML_PARSER = etree.XMLParser(resolve_entities=False, huge_tree=False, no_network=True)
+    _LAYER_NAME_XPATH = etree.XPath(".//wfs:FeatureType/ows:Name/text()", namespaces=NS)
+
+GEOJSON_FORMAT = "application/json"
+FLATGEOBUF_FORMAT = "application/flatgeobuf"
+FLATGEOBUF_MAGIC = b"fgb"
+
+# Malformed or truncated GeoJSON bodies (orjson/json raise ValueError subclasses)
+_JSON_DECODE_ERRORS = (ValueError, ijson.JSONError) if ijson is not None else (ValueError,)
+
+_OUTPUT_FORMAT_PATH = ".//ows:Operation[@name='GetFeature']/ows:Parameter[@name='outputFormat']//ows:Value"
+
+
+def _fetch_capabilities(capabilities_url: str):
+    """GetCapabilities document as an element tree root, or None."""
+    params = {"service": "WFS", "version": "2.0.0", "request": "GetCapabilities"}
+    resp = get_session().get(capabilities_url, params=params, timeout=30)
+    if resp.status_code != 200:
+        return None
+    if etree is not None:
+        return etree.fromstring(resp.content, parser=_XML_PARSER)
+    return ET.fromstring(resp.content)
+
 
 def get_layers(capabilities_url: str) -> List[str]:
     """
@@ -22,12 +72,12 @@ def get_layers(capabilities_url: str) -> List[str]:
     """
     layers = []
     try:
-        params = {"service": "WFS", "version": "2.0.0", "request": "GetCapabilities"}
-        resp = requests.get(capabilities_url, params=params, timeout=30)
-        if resp.status_code != 200:
+        root = _fetch_capabilities(capabilities_url)
+        if root is None:
             return layers
         
-        root = ET.fromstring(resp.content)
+        if etree is not None:
+            return [str(name) for name in _LAYER_NAME_XPATH(root)]
         
         # Find FeatureTypeList
         for feature_type in root.findall(".//{http://www.opengis.net/wfs/2.0}FeatureType"):
@@ -40,70 +90,185 @@ def get_layers(capabilities_url: str) -> List[str]:
     return layers
 
 
-def harvest_layer(layer_url: str, layer_name: str, max_features: int = 1000) -> List[Dict]:
+@lru_cache(maxsize=256)
+def get_output_formats(capabilities_url: str) -> FrozenSet[str]:
     """
-    Harvest features from a WFS layer (B-Plan, FNP, etc.).
+    GetFeature output formats advertised in GetCapabilities (lowercased).
+    Cached per service URL; empty if the document cannot be read.
     """
-    features = []
-    
     try:
-        # WFS GetFeature request
-        params = {
-            "service": "WFS",
-            "version": "2.0.0",
-            "request": "GetFeature",
-            "typenames": layer_name,
-            "outputFormat": "application/json",  # Prefer GeoJSON
-            "count": min(max_features, 100),  # Start with smaller batches
-        }
+        root = _fetch_capabilities(capabilities_url)
+    except Exception as e:
+        logger.debug("Failed to read output formats from %s: %s", capabilities_url, e)
+        return frozenset()
+    if root is None:
+        return frozenset()
+    return frozenset(
+        value.text.strip().lower()
+        for value in root.findall(_OUTPUT_FORMAT_PATH, NS)
+        if value.text
+    )
+
+
+WFS_MEMBER_TAG = "{http://www.opengis.net/wfs/2.0}member"
+
+
+def _iter_json_features(resp: requests.Response) -> Iterator[Dict]:
+    """Stream GeoJSON features from a GetFeature response, one at a time."""
+    if ijson is None:
+        # ijson not installed: parse the whole body
+        data = orjson.loads(resp.content) if orjson is not None else resp.json()
+        yield from data.get("features") or []
+        return
+    resp.raw.decode_content = True
+    yield from ijson.items(resp.raw, "features.item")
+
+
+def _iter_xml_features(resp: requests.Response) -> Iterator[Dict]:
+    """Stream wfs:member elements as flat {local tag: text} dicts, clearing each after use."""
+    resp.raw.decode_content = True
+    if etree is not None:
+        members = etree.iterparse(resp.raw, events=("end",), tag=WFS_MEMBER_TAG, resolve_entities=False)
+    else:
+        members = ET.iterparse(resp.raw, events=("end",))
+    for _, member in members:
+        if member.tag != WFS_MEMBER_TAG:
+            continue
+        # Extract attributes
+        feature = {}
+        for child in member.iter():
+            # lxml keeps comments/PIs, whose .tag is a function, not a string
+            if isinstance(child.tag, str) and "}" in child.tag:
+                tag_name = child.tag.split("}")[-1]
+                feature[tag_name] = child.text
+        member.clear()
+        if feature:
+            yield feature
+
+
+def _iter_flatgeobuf_features(resp: requests.Response) -> Iterator[Dict]:
+    """
+    Decode a FlatGeobuf GetFeature response with fiona (GDAL).
+    Yields flat property dicts with the GeoJSON-like geometry under "geometry".
+    """
+    with MemoryFile(resp.content) as memfile:
+        with memfile.open() as collection:
+            for feature in collection:
+                # fiona >= 1.9 yields Feature objects, older versions plain dicts
+                geo = getattr(feature, "__geo_interface__", feature)
+                feat = dict(geo.get("properties") or {})
+                feat["geometry"] = geo.get("geometry")
+                yield feat
+
+
+def _normalize_feature(feat: Dict, include_raw: bool = True) -> FeatureRecord:
+    """Extract common XPlanung attributes."""
+    return {
+        "name": feat.get("name") or feat.get("bezeichnung") or "",
+        "planart": feat.get("planart") or feat.get("planArt") or "",
+        "gemeinde": feat.get("gemeinde") or feat.get("gemeindename") or "",
+        "status": feat.get("status") or "",
+        "geometry": feat.get("geometry") if isinstance(feat.get("geometry"), dict) else None,
+        "raw": feat if include_raw else None,
+    }
+
+
+def _is_flatgeobuf(resp: requests.Response, content_type: str) -> bool:
+    """FlatGeobuf by Content-Type, or by the "fgb" magic bytes for generic types."""
+    return "flatgeobuf" in content_type or resp.content.startswith(FLATGEOBUF_MAGIC)
+
+
+def _harvest_pages(
+    session: requests.Session,
+    layer_url: str,
+    layer_name: str,
+    output_format: str,
+    max_features: int,
+    normalized: List[FeatureRecord],
+) -> bool:
+    """
+    Page through GetFeature in output_format, appending to normalized.
+    Returns False if a FlatGeobuf body could not be decoded.
+    """
+    params = {
+        "service": "WFS",
+        "version": "2.0.0",
+        "request": "GetFeature",
+        "typenames": layer_name,
+        "outputFormat": output_format,
+        "count": min(max_features, 100),  # Start with smaller batches
+    }
+    
+    start_index = 0
+    while len(normalized) < max_features:
+        params["startIndex"] = start_index
         
-        start_index = 0
-        while len(features) < max_features:
-            params["startIndex"] = start_index
-            
-            resp = requests.get(layer_url, params=params, timeout=30)
+        with session.get(layer_url, params=params, timeout=30, stream=True) as resp:
             if resp.status_code != 200:
                 break
             
-            # Try to parse as GeoJSON
+            # Servers that ignore outputFormat answer with GML or GeoJSON
+            content_type = resp.headers.get("Content-Type", "").lower()
+            is_xml = "xml" in content_type or "gml" in content_type
+            is_flatgeobuf = False
+            
+            if is_xml:
+                features = _iter_xml_features(resp)
+            elif "json" in content_type:
+                features = _iter_json_features(resp)
+            elif output_format == FLATGEOBUF_FORMAT and _is_flatgeobuf(resp, content_type):
+                is_flatgeobuf = True
+                features = _iter_flatgeobuf_features(resp)
+            else:
+                # Typically an HTML error page; not worth parsing
+                logger.warning("Unexpected Content-Type %r from layer %s", content_type, layer_name)
+                break
+            
+            batch_count = 0
             try:
-                data = resp.json()
-                if "features" in data:
-                    batch = data["features"]
-                    if not batch:
+                for feat in features:
+                    normalized.append(_normalize_feature(feat, include_raw=not is_flatgeobuf))
+                    batch_count += 1
+                    if len(normalized) >= max_features:
                         break
-                    features.extend(batch)
-                    start_index += len(batch)
-                else:
-                    break
-            except:
-                # Fallback: try XML
-                root = ET.fromstring(resp.content)
-                for member in root.findall(".//{http://www.opengis.net/wfs/2.0}member"):
-                    # Extract attributes
-                    feature = {}
-                    for child in member.iter():
-                        if child.tag and "}" in child.tag:
-                            tag_name = child.tag.split("}")[-1]
-                            feature[tag_name] = child.text
-                    if feature:
-                        features.append(feature)
-                break  # XML parsing is simpler, don't paginate
+            except Exception as e:
+                if is_flatgeobuf:
+                    # fiona/GDAL error types differ between versions
+                    logger.warning("Failed to decode FlatGeobuf from layer %s: %s", layer_name, e)
+                    return False
+                if is_xml or not isinstance(e, _JSON_DECODE_ERRORS):
+                    raise
+                # Keep what was read before the body broke off
+                logger.warning("Invalid GeoJSON from layer %s: %s", layer_name, e)
+                break
         
-        # Normalize features
-        normalized = []
-        for feat in features[:max_features]:
-            # Extract common XPlanung attributes
-            normalized.append({
-                "name": feat.get("name") or feat.get("bezeichnung") or "",
-                "planart": feat.get("planart") or feat.get("planArt") or "",
-                "gemeinde": feat.get("gemeinde") or feat.get("gemeindename") or "",
-                "status": feat.get("status") or "",
-                "geometry": feat.get("geometry") if isinstance(feat.get("geometry"), dict) else None,
-                "raw": feat,
-            })
+        if is_xml or not batch_count:
+            break  # XML parsing is simpler, don't paginate
+        start_index += batch_count
+    return True
+
+
+def harvest_layer(layer_url: str, layer_name: str, max_features: int = 1000) -> List[FeatureRecord]:
+    """
+    Harvest features from a WFS layer (B-Plan, FNP, etc.).
+    Features are streamed and normalized one by one (ijson for GeoJSON
+    when installed, iterparse for GML). FlatGeobuf is requested instead
+    when fiona is installed and the service advertises it; those features
+    carry no "raw" copy. A FlatGeobuf body fiona cannot decode makes the
+    layer be harvested again as GeoJSON.
+    """
+    normalized: List[FeatureRecord] = []
+    
+    try:
+        session = get_session()
+        use_flatgeobuf = fiona is not None and FLATGEOBUF_FORMAT in get_output_formats(layer_url)
+        if use_flatgeobuf:
+            if _harvest_pages(session, layer_url, layer_name, FLATGEOBUF_FORMAT, max_features, normalized):
+                return normalized
+            logger.info("Retrying layer %s as GeoJSON", layer_name)
+            normalized.clear()
+        _harvest_pages(session, layer_url, layer_name, GEOJSON_FORMAT, max_features, normalized)
     except Exception as e:
         logger.warning("Failed to harvest layer %s: %s", layer_name, e)
     
     return normalized
-
@@ -1,18 +1,21 @@
+import atexit
 import logging
 import os
+from functools import lru_cache
 
 from psycopg_pool import ConnectionPool
 
 logger = logging.getLogger(__name__)
 
+# Pool bounds; raise PG_POOL_MAX together with crawler concurrency
+PG_POOL_MIN = int(os.getenv("PG_POOL_MIN", "1"))
+PG_POOL_MAX = int(os.getenv("PG_POOL_MAX", "16"))
 
+
+@lru_cache(maxsize=1)
 def get_pool():
+    """Process-wide connection pool (opened on first use, closed at exit)."""
     dsn = os.getenv("POSTGRES_DSN", "postgresql://bess:bess@db:5432/bess")
-    return ConnectionPool(conninfo=dsn, open=True, max_size=5, min_size=1, timeout=30)
-
-
-
-
-
-
-
+    pool = ConnectionPool(conninfo=dsn, open=True, max_size=PG_POOL_MAX, min_size=PG_POOL_MIN, timeout=30)
+    atexit.register(pool.close)
+    return pool
@@ -1,12 +1,51 @@
-from typing import Dict, List
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List
 
 from psycopg import sql
 
 from .client import get_pool
 
-
-def upsert_procedure(conn, row: Dict) -> None:
-    query = """
+# Optional fields of a procedure / project entity row
+_PROC_DEFAULTS = {
+    "capacity_mw": None,
+    "capacity_mwh": None,
+    "area_hectares": None,
+    "decision_date": None,
+    "procedure_type": None,
+    "legal_basis": None,
+    "project_components": None,
+    "ambiguity_flag": False,
+    "review_recommended": False,
+    "site_location_raw": None,
+    "evidence_snippets": None,
+}
+
+_PROJECT_DEFAULTS = {
+    "project_id": None,
+    "state": None,
+    "municipality_key": None,
+    "municipality_name": None,
+    "county": None,
+    "canonical_project_name": None,
+    "project_components": None,
+    "legal_basis_best": None,
+    "site_location_best": None,
+    "developer_company_best": None,
+    "capacity_mw_best": None,
+    "capacity_mwh_best": None,
+    "area_hectares_best": None,
+    "maturity_stage": "DISCOVERED",
+    "first_seen_date": None,
+    "last_seen_date": None,
+    "max_confidence": 0.0,
+    "needs_review": False,
+}
+
+
+# Hot-path statements: built once, and the same string object on every call
+# keys psycopg's query-conversion and prepared-statement caches
+_UPSERT_PROCEDURE_SQL = """
     INSERT INTO procedures (procedure_id, title_raw, title_norm, instrument, status, state, county, municipality, municipality_key,
                             geometry, bbox, grid_score, bess_score, confidence, developer_company,
                             capacity_mw, capacity_mwh, area_hectares, decision_date,
@@ -37,57 +76,53 @@ def upsert_procedure(conn, row: Dict) -> None:
         evidence_snippets=EXCLUDED.evidence_snippets,
         updated_at=now();
     """
+
+
+def upsert_procedure(conn, row: Dict) -> None:
     # Ensure all fields exist
-    row.setdefault("capacity_mw", None)
-    row.setdefault("capacity_mwh", None)
-    row.setdefault("area_hectares", None)
-    row.setdefault("decision_date", None)
-    row.setdefault("procedure_type", None)
-    row.setdefault("legal_basis", None)
-    row.setdefault("project_components", None)
-    row.setdefault("ambiguity_flag", False)
-    row.setdefault("review_recommended", False)
-    row.setdefault("site_location_raw", None)
-    row.setdefault("evidence_snippets", None)
-    conn.execute(query, row)
+    row = {**_PROC_DEFAULTS, **row}
+    # Server-side prepared on first use: parsed and planned once per connection
+    conn.execute(_UPSERT_PROCEDURE_SQL, row, prepare=True)
+
+
+_INSERT_SOURCE_SQL = """
+    INSERT INTO sources (source_id, procedure_id, source_system, source_url, source_date, retrieved_at, http_status, discovery_source, discovery_path)
+    VALUES (%(source_id)s, %(procedure_id)s, %(source_system)s, %(source_url)s, %(source_date)s, %(retrieved_at)s, %(http_status)s, %(discovery_source)s, %(discovery_path)s)
+    ON CONFLICT (source_id) DO NOTHING;
+    """
 
 
 def insert_source(conn, row: Dict) -> None:
     # retrieved_at: set explicitly with Python datetime
-    from datetime import datetime, timezone
     if "retrieved_at" not in row or row.get("retrieved_at") is None:
         row["retrieved_at"] = datetime.now(timezone.utc)
     # Ensure discovery fields exist
     row.setdefault("discovery_source", None)
     row.setdefault("discovery_path", None)
-    query = """
-    INSERT INTO sources (source_id, procedure_id, source_system, source_url, source_date, retrieved_at, http_status, discovery_source, discovery_path)
-    VALUES (%(source_id)s, %(procedure_id)s, %(source_system)s, %(source_url)s, %(source_date)s, %(retrieved_at)s, %(http_status)s, %(discovery_source)s, %(discovery_path)s)
-    ON CONFLICT (source_id) DO NOTHING;
-    """
-    conn.execute(query, row)
+    conn.execute(_INSERT_SOURCE_SQL, row, prepare=True)
 
 
-def insert_document(conn, row: Dict) -> None:
-    query = """
+_INSERT_DOCUMENT_SQL = """
     INSERT INTO documents (document_id, source_id, doc_url, doc_type, sha256, file_path, text_extracted, ocr_used, page_map)
     VALUES (%(document_id)s, %(source_id)s, %(doc_url)s, %(doc_type)s, %(sha256)s, %(file_path)s, %(text_extracted)s, %(ocr_used)s, %(page_map)s)
     ON CONFLICT (document_id) DO NOTHING;
     """
-    conn.execute(query, row)
 
 
-def insert_extractions(conn, rows: List[Dict]) -> None:
+def insert_document(conn, row: Dict) -> None:
+    conn.execute(_INSERT_DOCUMENT_SQL, row, prepare=True)
+
+
+def insert_extractions(cur, rows: List[Dict]) -> None:
     if not rows:
         return
-    # Use executemany for batch insert
+    # executemany runs in pipeline mode (psycopg >= 3.1): one round-trip, not one per row
     query = """
     INSERT INTO extractions (extraction_id, document_id, field, value, method, evidence)
     VALUES (%(extraction_id)s, %(document_id)s, %(field)s, %(value)s, %(method)s, %(evidence)s)
     ON CONFLICT (extraction_id) DO NOTHING;
     """
-    for row in rows:
-        conn.execute(query, row)
+    cur.executemany(query, rows)
 
 
 def upsert_project_entity(cur, row: Dict) -> str:
@@ -130,41 +165,18 @@ def upsert_project_entity(cur, row: Dict) -> str:
         first_seen_date = LEAST(COALESCE(EXCLUDED.first_seen_date, '9999-12-31'::date), COALESCE(project_entities.first_seen_date, '9999-12-31'::date)),
         last_seen_date = GREATEST(COALESCE(EXCLUDED.last_seen_date, '1900-01-01'::date), COALESCE(project_entities.last_seen_date, '1900-01-01'::date)),
         max_confidence = GREATEST(COALESCE(EXCLUDED.max_confidence, 0), COALESCE(project_entities.max_confidence, 0)),
-        needs_review = EXCLUDED.needs_review OR project_entities.needs_review,
+        -- Also flag for review if any linked procedure has review_recommended
+        needs_review = EXCLUDED.needs_review OR project_entities.needs_review OR EXISTS (
+            SELECT 1 FROM project_procedures pp
+            JOIN procedures p ON p.procedure_id = pp.procedure_id
+            WHERE pp.project_id = project_entities.project_id
+            AND p.review_recommended = TRUE
+        ),
         updated_at = now()
-    """
-    # After upsert, update needs_review if any linked procedure has review_recommended
-    update_review_query = """
-    UPDATE project_entities pe
-    SET needs_review = TRUE
-    WHERE pe.project_id = %(project_id)s
-    AND EXISTS (
-        SELECT 1 FROM project_procedures pp
-        JOIN procedures p ON p.procedure_id = pp.procedure_id
-        WHERE pp.project_id = pe.project_id
-        AND p.review_recommended = TRUE
-    );
     RETURNING project_id;
     """
     # Ensure all fields exist
-    row.setdefault("project_id", None)
-    row.setdefault("state", None)
-    row.setdefault("municipality_key", None)
-    row.setdefault("municipality_name", None)
-    row.setdefault("county", None)
-    row.setdefault("canonical_project_name", None)
-    row.setdefault("project_components", None)
-    row.setdefault("legal_basis_best", None)
-    row.setdefault("site_location_best", None)
-    row.setdefault("developer_company_best", None)
-    row.setdefault("capacity_mw_best", None)
-    row.setdefault("capacity_mwh_best", None)
-    row.setdefault("area_hectares_best", None)
-    row.setdefault("maturity_stage", "DISCOVERED")
-    row.setdefault("first_seen_date", None)
-    row.setdefault("last_seen_date", None)
-    row.setdefault("max_confidence", 0.0)
-    row.setdefault("needs_review", False)
+    row = {**_PROJECT_DEFAULTS, **row}
     
     # Execute and get project_id
     cur.execute(query, row)
@@ -172,7 +184,6 @@ def upsert_project_entity(cur, row: Dict) -> str:
     if result:
         return str(result[0])
     # Fallback if no RETURNING worked
-    import uuid
     return str(uuid.uuid4())
 
 
@@ -205,3 +216,18 @@ def with_connection(func):
 
     return wrapper
 
+
+def with_batch_connection(func):
+    """
+    Like with_connection, but the wrapped function takes an iterable and
+    func(cur, item, ...) runs for every item on one pooled connection in
+    one transaction (committed once at the end, rolled back as a whole on
+    error). Returns the per-item results.
+    """
+    def wrapper(items: Iterable, *args, **kwargs):
+        pool = get_pool()
+        with pool.connection() as conn:
+            with conn.cursor() as cur:
+                return [func(cur, item, *args, **kwargs) for item in items]
+
+    return wrapper
@@ -1,16 +1,92 @@
 """
 Batch operations for improved DB performance.
 """
-from typing import List, Dict
+import json
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Sequence
 from psycopg import sql
 
 from .client import get_pool
 
+try:
+    import orjson
+except ImportError:  # orjson optional, stdlib json otherwise
+    orjson = None
+
+
+@contextmanager
+def bulk_ingest_session(cur):
+    """
+    Turn off synchronous_commit for the current transaction.
+    
+    COMMIT then returns without waiting for the WAL flush. On a server
+    crash the last few hundred ms of committed transactions can be lost
+    (never corrupted); crawl results are simply re-crawled, so the batch
+    writers accept that. Only affects the enclosing transaction.
+    
+    Args:
+        cur: Database cursor or connection, inside the ingest transaction
+    """
+    cur.execute("SET LOCAL synchronous_commit = OFF")
+    yield cur
+
+
+def _json_text(value: Any) -> str:
+    """JSON text for a json/jsonb column."""
+    if orjson is not None:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value, ensure_ascii=False)
+
+
+def copy_rows(cur, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+    """
+    Bulk-load rows with COPY ... FROM STDIN.
+    
+    Much faster than INSERT per row, but without ON CONFLICT handling, so
+    only for append-only tables or staging tables. dict/list values are
+    written as JSON text (json/jsonb columns).
+    
+    Args:
+        cur: Database cursor
+        table: Target table
+        columns: Column names, in the order of each row's values
+        rows: Value tuples
+    
+    Returns:
+        Number of rows written
+    """
+    query = sql.SQL("COPY {} ({}) FROM STDIN").format(
+        sql.Identifier(table),
+        sql.SQL(", ").join(sql.Identifier(column) for column in columns),
+    )
+    count = 0
+    with cur.copy(query) as copy:
+        for row in rows:
+            copy.write_row([_json_text(v) if isinstance(v, (dict, list)) else v for v in row])
+            count += 1
+    return count
+
+
+PROCEDURE_COLUMNS = (
+    "procedure_id", "title_raw", "title_norm", "instrument", "status", "state", "county", "municipality", "municipality_key",
+    "geometry", "bbox", "grid_score", "bess_score", "confidence", "developer_company",
+    "capacity_mw", "capacity_mwh", "area_hectares", "decision_date",
+    "procedure_type", "legal_basis", "project_components", "ambiguity_flag", "review_recommended", "site_location_raw", "evidence_snippets",
+)
+
+# Defaults for optional procedure fields (same as dao.upsert_procedure)
+_PROCEDURE_DEFAULTS = {"ambiguity_flag": False, "review_recommended": False}
+
 
 def upsert_procedures_batch(cur, rows: List[Dict]) -> None:
     """
     Batch upsert procedures.
     
+    Rows are COPYed into a temp staging table and merged with a single
+    INSERT ... SELECT ... ON CONFLICT, so the batch costs one COPY and one
+    statement regardless of its size.
+    
     Args:
         cur: Database cursor
         rows: List of procedure dicts
@@ -18,14 +94,24 @@ def upsert_procedures_batch(cur, rows: List[Dict]) -> None:
     if not rows:
         return
     
-    query = """
-    INSERT INTO procedures (
-        procedure_id, title_raw, title_norm, instrument, status, state, county, municipality, municipality_key,
-        geometry, bbox, grid_score, bess_score, confidence, developer_company,
-        capacity_mw, capacity_mwh, area_hectares, decision_date,
-        procedure_type, legal_basis, project_components, ambiguity_flag, review_recommended, site_location_raw, evidence_snippets
+    # Staging table lives until the end of the transaction
+    cur.execute("CREATE TEMP TABLE IF NOT EXISTS procedures_stage (LIKE procedures INCLUDING DEFAULTS) ON COMMIT DROP")
+    cur.execute("TRUNCATE procedures_stage")
+    
+    copy_rows(
+        cur,
+        "procedures_stage",
+        PROCEDURE_COLUMNS,
+        (
+            tuple(row.get(column, _PROCEDURE_DEFAULTS.get(column)) for column in PROCEDURE_COLUMNS)
+            for row in rows
+        ),
     )
-    VALUES %s
+    
+    columns = sql.SQL(", ").join(sql.Identifier(column) for column in PROCEDURE_COLUMNS)
+    cur.execute(sql.SQL("""
+    INSERT INTO procedures ({columns})
+    SELECT {columns} FROM procedures_stage
     ON CONFLICT (procedure_id) DO UPDATE SET
         title_raw=EXCLUDED.title_raw,
         title_norm=EXCLUDED.title_norm,
@@ -46,56 +132,7 @@ def upsert_procedures_batch(cur, rows: List[Dict]) -> None:
         site_location_raw=EXCLUDED.site_location_raw,
         evidence_snippets=EXCLUDED.evidence_snippets,
         updated_at=now();
-    """
-    
-    # Prepare data tuples
-    values = []
-    for row in rows:
-        # Ensure all fields exist
-        row.setdefault("capacity_mw", None)
-        row.setdefault("capacity_mwh", None)
-        row.setdefault("area_hectares", None)
-        row.setdefault("decision_date", None)
-        row.setdefault("procedure_type", None)
-        row.setdefault("legal_basis", None)
-        row.setdefault("project_components", None)
-        row.setdefault("ambiguity_flag", False)
-        row.setdefault("review_recommended", False)
-        row.setdefault("site_location_raw", None)
-        row.setdefault("evidence_snippets", None)
-        
-        values.append((
-            row["procedure_id"],
-            row.get("title_raw"),
-            row.get("title_norm"),
-            row.get("instrument"),
-            row.get("status"),
-            row.get("state"),
-            row.get("county"),
-            row.get("municipality"),
-            row.get("municipality_key"),
-            row.get("geometry"),
-            row.get("bbox"),
-            row.get("grid_score"),
-            row.get("bess_score"),
-            row.get("confidence"),
-            row.get("developer_company"),
-            row.get("capacity_mw"),
-            row.get("capacity_mwh"),
-            row.get("area_hectares"),
-            row.get("decision_date"),
-            row.get("procedure_type"),
-            row.get("legal_basis"),
-            row.get("project_components"),
-            row.get("ambiguity_flag"),
-            row.get("review_recommended"),
-            row.get("site_location_raw"),
-            row.get("evidence_snippets"),
-        ))
-    
-    # Use execute_values for batch insert
-    from psycopg.extras import execute_values
-    execute_values(cur, query, values)
+    """).format(columns=columns))
 
 
 def insert_sources_batch(cur, rows: List[Dict]) -> None:
@@ -103,18 +140,18 @@ def insert_sources_batch(cur, rows: List[Dict]) -> None:
     if not rows:
         return
     
-    from datetime import datetime, timezone
-    
     query = """
     INSERT INTO sources (source_id, procedure_id, source_system, source_url, source_date, retrieved_at, http_status, discovery_source, discovery_path)
-    VALUES %s
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
     ON CONFLICT (source_id) DO NOTHING;
     """
     
+    # One timestamp for the whole batch
+    now = datetime.now(timezone.utc)
     values = []
     for row in rows:
         if "retrieved_at" not in row or row.get("retrieved_at") is None:
-            row["retrieved_at"] = datetime.now(timezone.utc)
+            row["retrieved_at"] = now
         
         values.append((
             row["source_id"],
@@ -128,8 +165,8 @@ def insert_sources_batch(cur, rows: List[Dict]) -> None:
             row.get("discovery_path"),
         ))
     
-    from psycopg.extras import execute_values
-    execute_values(cur, query, values)
+    # executemany is pipelined by psycopg 3 (psycopg.extras.execute_values is psycopg2-only)
+    cur.executemany(query, values)
 
 
 
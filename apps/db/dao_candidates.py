@@ -1,10 +1,13 @@
 """
 DAO for crawl_candidates table.
 """
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timezone
+from decimal import Decimal
 import uuid
 
+from psycopg.rows import dict_row
+
 from .client import get_pool
 
 
@@ -63,57 +66,62 @@ def update_candidate_status(cur, candidate_id: str, status: str, reason: Optiona
     })
 
 
-def get_candidates_for_extraction(cur, run_id: str, mode: str = "fast", limit: int = 100) -> List[Dict]:
+_CANDIDATE_COLUMNS = """
+    SELECT candidate_id, run_id, municipality_key, discovery_source, discovery_path,
+           title, date_hint, url, doc_urls, prefilter_score
+    FROM crawl_candidates
+    WHERE run_id = %(run_id)s
+    AND status = 'NEW'
+    AND prefilter_score >= %(threshold)s
+"""
+
+# Separate statements so each prepared plan has a plain index range condition
+_FIRST_PAGE_SQL = _CANDIDATE_COLUMNS + """
+    ORDER BY prefilter_score DESC, candidate_id DESC
+    LIMIT %(limit)s;
+"""
+
+_NEXT_PAGE_SQL = _CANDIDATE_COLUMNS + """
+    AND (prefilter_score, candidate_id) < (%(after_score)s::numeric, %(after_id)s::uuid)
+    ORDER BY prefilter_score DESC, candidate_id DESC
+    LIMIT %(limit)s;
+"""
+
+
+def get_candidates_for_extraction(
+    cur,
+    run_id: str,
+    mode: str = "fast",
+    limit: int = 100,
+    after: Optional[Tuple[Decimal, str]] = None,
+) -> List[Dict]:
     """
-    Get candidates ready for extraction.
+    Get candidates ready for extraction, best prefilter_score first.
+    
+    Pages are keyset-paginated on (prefilter_score, candidate_id), which
+    idx_candidates_extraction serves as an index range scan: no sort of
+    the whole matching set, however deep the page.
     
     Args:
         cur: Database cursor
         run_id: Run ID
         mode: "fast" (threshold 0.6) or "deep" (threshold 0.3)
         limit: Maximum candidates to return
+        after: (prefilter_score, candidate_id) of the last row of the previous page
     
     Returns:
-        List of candidate dicts
+        List of candidate dicts; prefilter_score is the NUMERIC value as
+        Decimal, so it can be passed back exactly as the next page's boundary
     """
     threshold = 0.6 if mode == "fast" else 0.3
     
-    query = """
-    SELECT candidate_id, run_id, municipality_key, discovery_source, discovery_path,
-           title, date_hint, url, doc_urls, prefilter_score
-    FROM crawl_candidates
-    WHERE run_id = %(run_id)s
-    AND status = 'NEW'
-    AND prefilter_score >= %(threshold)s
-    ORDER BY prefilter_score DESC
-    LIMIT %(limit)s;
-    """
-    
-    cur.execute(query, {
-        "run_id": run_id,
-        "threshold": threshold,
-        "limit": limit,
-    })
-    
-    rows = cur.fetchall()
-    return [
-        {
-            "candidate_id": row[0],
-            "run_id": row[1],
-            "municipality_key": row[2],
-            "discovery_source": row[3],
-            "discovery_path": row[4],
-            "title": row[5],
-            "date_hint": row[6],
-            "url": row[7],
-            "doc_urls": row[8],
-            "prefilter_score": float(row[9]) if row[9] else 0.0,
-        }
-        for row in rows
-    ]
-
-
-
-
-
-
+    params = {"run_id": run_id, "threshold": threshold, "limit": limit}
+    if after is None:
+        query = _FIRST_PAGE_SQL
+    else:
+        query = _NEXT_PAGE_SQL
+        params["after_score"], params["after_id"] = after
+    # Rows come back as dicts built by psycopg, on the caller's connection/transaction
+    with cur.connection.cursor(row_factory=dict_row) as dict_cur:
+        dict_cur.execute(query, params, prepare=True)
+        return dict_cur.fetchall()
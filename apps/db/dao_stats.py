@@ -3,9 +3,11 @@ DAO for crawl_stats table.
 """
 from typing import Dict
 import uuid
-import json
+
+from psycopg.types.json import Jsonb
 
 from .client import get_pool
+from .dao_batch import bulk_ingest_session
 
 
 def insert_crawl_stats(cur, row: Dict) -> None:
@@ -31,13 +33,15 @@ def insert_crawl_stats(cur, row: Dict) -> None:
         timings_json = EXCLUDED.timings_json;
     """
     
-    # Ensure JSON fields are JSON strings
+    # Dicts go out as jsonb directly (no text round-trip); strings pass through
     if isinstance(row.get("counts_json"), dict):
-        row["counts_json"] = json.dumps(row["counts_json"])
+        row["counts_json"] = Jsonb(row["counts_json"])
     if isinstance(row.get("timings_json"), dict):
-        row["timings_json"] = json.dumps(row["timings_json"])
+        row["timings_json"] = Jsonb(row["timings_json"])
     
-    cur.execute(query, row)
+    # Telemetry: never worth waiting for the WAL flush
+    with bulk_ingest_session(cur):
+        cur.execute(query, row)
 
 
 
@@ -1,10 +1,12 @@
 """
 Simple title + key matcher placeholder.
 """
+from functools import lru_cache
 from typing import Dict
 from apps.parser.normalize import normalize_title
 
 
+@lru_cache(maxsize=131072)
 def compute_procedure_hash(title: str, municipality_key: str) -> str:
     norm = normalize_title(title)
     return f"{municipality_key}:{norm}"
@@ -2,15 +2,18 @@
 Robust downloader with retries and error handling.
 Compliance: User-Agent, Rate-Limiting, robots.txt respect.
 """
-from typing import Optional, Dict
+from functools import lru_cache
+from typing import Optional, Dict, Tuple
 import hashlib
 import requests
 import logging
 import time
-from urllib.parse import urlparse
+from urllib.parse import ParseResult, urlparse
 from urllib.robotparser import RobotFileParser
 
 from apps.net.http_client import safe_get
+from apps.net.ratelimit import host_limiter, is_retryable_status, retry_delay
+from apps.net.session import get_download_session
 
 logger = logging.getLogger(__name__)
 
@@ -24,33 +27,36 @@ DOMAIN_DELAYS = {
     'www.geobasis-bb.de': 10.0,
 }
 MIN_REQUEST_DELAY = 1.0  # Default für andere Domains
-_last_request_time = {}
 
-# Robots.txt Cache
-_robots_cache = {}
+# Robots.txt Cache: begrenzt, Einträge werden nach 24h neu geladen
+ROBOTS_CACHE_SIZE = 1024
+ROBOTS_CACHE_TTL_S = 24 * 3600
 
 
-def check_robots_txt(url: str) -> bool:
+@lru_cache(maxsize=ROBOTS_CACHE_SIZE)
+def _load_robots(base_url: str, ttl_window: int) -> RobotFileParser:
+    """robots.txt of one origin; raises (and is not cached) if unreachable."""
+    rp = RobotFileParser()
+    rp.set_url(f"{base_url}/robots.txt")
+    rp.read()
+    return rp
+
+
+def check_robots_txt(url: str, parsed: Optional[ParseResult] = None) -> bool:
     """
     Prüft robots.txt und gibt True zurück, wenn URL gecrawlt werden darf.
+    parsed: bereits geparste URL (spart ein zweites urlparse).
     """
     try:
-        parsed = urlparse(url)
+        parsed = parsed or urlparse(url)
         base_url = f"{parsed.scheme}://{parsed.netloc}"
         
-        # Cache prüfen
-        if base_url in _robots_cache:
-            rp = _robots_cache[base_url]
-        else:
-            rp = RobotFileParser()
-            rp.set_url(f"{base_url}/robots.txt")
-            try:
-                rp.read()
-                _robots_cache[base_url] = rp
-            except Exception as e:
-                logger.debug("Could not read robots.txt for %s: %s", base_url, e)
-                # Wenn robots.txt nicht erreichbar, erlauben (konservativ)
-                return True
+        try:
+            rp = _load_robots(base_url, int(time.time() // ROBOTS_CACHE_TTL_S))
+        except Exception as e:
+            logger.debug("Could not read robots.txt for %s: %s", base_url, e)
+            # Wenn robots.txt nicht erreichbar, erlauben (konservativ)
+            return True
         
         return rp.can_fetch(USER_AGENT, url)
     except Exception as e:
@@ -59,27 +65,35 @@ def check_robots_txt(url: str) -> bool:
         return True
 
 
-def _rate_limit(url: str, min_delay: Optional[float] = None):
+def _rate_limit(url: str, min_delay: Optional[float] = None, parsed: Optional[ParseResult] = None):
     """
     Rate-Limiting: Wartet zwischen Requests.
     Domain-spezifische Delays werden respektiert (z.B. geobasis-bb.de: 10s).
     """
-    global _last_request_time
-    parsed = urlparse(url)
-    domain = parsed.netloc
+    domain = (parsed or urlparse(url)).netloc
     
     # Domain-spezifisches Delay oder Default
     if min_delay is None:
         min_delay = DOMAIN_DELAYS.get(domain, MIN_REQUEST_DELAY)
     
-    if domain in _last_request_time:
-        elapsed = time.time() - _last_request_time[domain]
-        if elapsed < min_delay:
-            sleep_time = min_delay - elapsed
-            logger.debug("Rate-limiting: waiting %.1fs for %s", sleep_time, domain)
-            time.sleep(sleep_time)
-    
-    _last_request_time[domain] = time.time()
+    host_limiter.acquire(domain, min_delay)
+
+
+DOWNLOAD_CHUNK_SIZE = 65536
+
+
+def read_hashed(resp: requests.Response, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Tuple[bytes, str]:
+    """
+    Read a streamed response body and its SHA-256 in one pass.
+    Each chunk is hashed while still in cache instead of re-reading the
+    whole body afterwards.
+    """
+    h = hashlib.sha256()
+    chunks = []
+    for chunk in resp.iter_content(chunk_size):
+        h.update(chunk)
+        chunks.append(chunk)
+    return b"".join(chunks), h.hexdigest()
 
 
 def download(url: str, timeout: int = 30, max_retries: int = 3, check_robots: bool = True) -> Optional[bytes]:
@@ -92,49 +106,69 @@ def download(url: str, timeout: int = 30, max_retries: int = 3, check_robots: bo
         max_retries: Maximum retry attempts
         check_robots: Whether to check robots.txt (default: True)
     """
+    result = download_hashed(url, timeout=timeout, max_retries=max_retries, check_robots=check_robots)
+    return result[0] if result else None
+
+
+def download_hashed(url: str, timeout: int = 30, max_retries: int = 3, check_robots: bool = True) -> Optional[Tuple[bytes, str]]:
+    """
+    Like download(), but streams the body and returns (content, sha256 hex)
+    computed in the same pass.
+    """
+    parsed = urlparse(url)
+    
     # Prüfe robots.txt
-    if check_robots and not check_robots_txt(url):
+    if check_robots and not check_robots_txt(url, parsed):
         logger.warning("robots.txt disallows: %s", url)
         return None
     
     # Rate-Limiting
-    _rate_limit(url)
+    _rate_limit(url, parsed=parsed)
     
     headers = {
         'User-Agent': USER_AGENT
     }
     
     for attempt in range(max_retries):
+        delay = None
         try:
             # Use safe_get for SSL fallback support
             resp = safe_get(
                 url,
+                session=get_download_session(),
                 timeout=timeout,
                 allow_redirects=True,
                 headers=headers,
-                verify=True  # Default: verify SSL, fallback only for allowlisted domains
+                verify=True,  # Default: verify SSL, fallback only for allowlisted domains
+                stream=True,
             )
             
             if resp is None:
                 # Request failed (handled by safe_get)
                 if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
+                    time.sleep(retry_delay(attempt))
                 continue
             
-            if resp.status_code == 200:
-                return resp.content
-            elif resp.status_code == 404:
-                logger.debug("URL not found (404): %s", url)
-                return None
-            else:
-                logger.warning("HTTP %d for %s", resp.status_code, url)
+            with resp:
+                if resp.status_code == 200:
+                    return read_hashed(resp)
+                elif resp.status_code == 404:
+                    logger.debug("URL not found (404): %s", url)
+                    return None
+                else:
+                    logger.warning("HTTP %d for %s", resp.status_code, url)
+                    if not is_retryable_status(resp.status_code):
+                        return None
+                    host_limiter.observe(parsed.netloc, resp.status_code, resp.headers)
+                    delay = retry_delay(attempt, resp.status_code, resp.headers)
         except requests.exceptions.Timeout:
             logger.warning("Timeout downloading %s (attempt %d/%d)", url, attempt + 1, max_retries)
         except requests.exceptions.RequestException as e:
             logger.warning("Error downloading %s: %s (attempt %d/%d)", url, e, attempt + 1, max_retries)
         
         if attempt < max_retries - 1:
-            time.sleep(2 ** attempt)  # Exponential backoff
+            # Jittered back-off, or as long as Retry-After asks
+            time.sleep(delay if delay is not None else retry_delay(attempt))
     
     return None
 
@@ -4,12 +4,14 @@ Cached downloader with conditional GETs and HEAD-before-GET for PDFs.
 from typing import Optional, Dict, Tuple
 import requests
 import logging
+import time
 from pathlib import Path
 from urllib.parse import urlparse
 
 from apps.downloader.fetch import USER_AGENT, check_robots_txt, _rate_limit
 from apps.net.cache import get_cached, set_cached, get_cache_headers
-from apps.net.ratelimit import acquire, release
+from apps.net.ratelimit import acquire, is_retryable_status, release, retry_delay
+from apps.net.session import get_download_session
 from apps.orchestrator.config import settings
 
 logger = logging.getLogger(__name__)
@@ -42,8 +44,10 @@ def download_cached(
     if max_retries is None:
         max_retries = settings.crawl_retries
     
+    parsed = urlparse(url)
+    
     # Check robots.txt
-    if check_robots and not check_robots_txt(url):
+    if check_robots and not check_robots_txt(url, parsed):
         logger.warning("robots.txt disallows: %s", url)
         return None
     
@@ -61,7 +65,7 @@ def download_cached(
     
     try:
         # Rate limiting
-        _rate_limit(url)
+        _rate_limit(url, parsed=parsed)
         
         headers = {
             'User-Agent': USER_AGENT
@@ -74,8 +78,9 @@ def download_cached(
         
         # Retry loop
         for attempt in range(max_retries):
+            delay = None
             try:
-                resp = requests.get(url, timeout=timeout, allow_redirects=True, headers=headers)
+                resp = get_download_session().get(url, timeout=timeout, allow_redirects=True, headers=headers)
                 
                 # 304 Not Modified - use cached
                 if resp.status_code == 304:
@@ -103,6 +108,9 @@ def download_cached(
                 # Other status
                 else:
                     logger.warning("HTTP %d for %s", resp.status_code, url)
+                    if not is_retryable_status(resp.status_code):
+                        return None
+                    delay = retry_delay(attempt, resp.status_code, resp.headers)
                     
             except requests.exceptions.Timeout:
                 logger.warning("Timeout downloading %s (attempt %d/%d)", url, attempt + 1, max_retries)
@@ -110,8 +118,8 @@ def download_cached(
                 logger.warning("Error downloading %s: %s (attempt %d/%d)", url, e, attempt + 1, max_retries)
             
             if attempt < max_retries - 1:
-                import time
-                time.sleep(2 ** attempt)  # Exponential backoff
+                # Jittered back-off, or as long as Retry-After asks
+                time.sleep(delay if delay is not None else retry_delay(attempt))
         
         return None
         
@@ -133,15 +141,17 @@ def head_cached(
     if timeout is None:
         timeout = settings.crawl_timeout_s
     
+    parsed = urlparse(url)
+    
     # Check robots.txt
-    if not check_robots_txt(url):
+    if not check_robots_txt(url, parsed):
         return None
     
     # Acquire rate limit
     acquire(url, mode)
     
     try:
-        _rate_limit(url)
+        _rate_limit(url, parsed=parsed)
         
         headers = {
             'User-Agent': USER_AGENT
@@ -152,7 +162,7 @@ def head_cached(
         cache_headers = get_cache_headers(url, cache_base)
         headers.update(cache_headers)
         
-        resp = requests.head(url, timeout=timeout, allow_redirects=True, headers=headers)
+        resp = get_download_session().head(url, timeout=timeout, allow_redirects=True, headers=headers)
         
         if resp.status_code == 200:
             return dict(resp.headers)
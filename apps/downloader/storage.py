@@ -1,21 +1,44 @@
 """
 Storage helpers: filesystem and optional S3 (boto3).
 """
+import io
+import mmap
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 try:
     import boto3
+    from boto3.exceptions import S3UploadFailedError
+    from boto3.s3.transfer import TransferConfig
+    from botocore.config import Config
     from botocore.exceptions import BotoCoreError, ClientError
 except ImportError:  # boto3 optional
     boto3 = None
-    BotoCoreError = ClientError = Exception
+    BotoCoreError = ClientError = S3UploadFailedError = Exception
+
+S3_MULTIPART_CHUNK = 8 * 1024 * 1024
+
+if boto3 is not None:
+    # Small objects go out as a single PUT; larger ones as parallel 8 MiB parts
+    _S3_TRANSFER = TransferConfig(
+        multipart_threshold=S3_MULTIPART_CHUNK,
+        multipart_chunksize=S3_MULTIPART_CHUNK,
+        max_concurrency=8,
+        use_threads=True,
+    )
+
+
+@lru_cache(maxsize=4096)
+def _ensure_dir(path: Path) -> None:
+    """mkdir -p once per directory per process."""
+    path.mkdir(parents=True, exist_ok=True)
 
 
 def save_bytes_fs(base_path: Path, relative_path: str, data: bytes) -> Path:
     target = base_path / relative_path
-    target.parent.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(target.parent)
     target.write_bytes(data)
     return target
 
@@ -24,18 +47,39 @@ def read_bytes_fs(path: Path) -> Optional[bytes]:
     return path.read_bytes() if path.exists() else None
 
 
-def save_bytes_s3(bucket: str, key: str, data: bytes) -> bool:
+def mmap_fs(path: Path) -> Optional[mmap.mmap]:
+    """
+    Read-only memory map of a stored file, without copying it into a bytes object.
+    Slices, memoryview() and save_bytes_s3 accept it; close it when done.
+    None if the file is missing or empty (empty files cannot be mapped).
+    """
+    try:
+        with open(path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=1)
+def _s3_client():
+    """Process-wide S3 client (thread-safe), so connections and signing keys are reused."""
+    return boto3.client(
+        "s3",
+        endpoint_url=os.getenv("S3_ENDPOINT"),
+        aws_access_key_id=os.getenv("S3_ACCESS_KEY"),
+        aws_secret_access_key=os.getenv("S3_SECRET_KEY"),
+        config=Config(max_pool_connections=50, retries={"mode": "adaptive"}),
+    )
+
+
+def save_bytes_s3(bucket: str, key: str, data: Union[bytes, mmap.mmap]) -> bool:
     if boto3 is None:
         raise ImportError("boto3 not installed")
+    # An mmap is already a seekable file object; upload straight from the mapping
+    fileobj = data if isinstance(data, mmap.mmap) else io.BytesIO(data)
     try:
-        client = boto3.client(
-            "s3",
-            endpoint_url=os.getenv("S3_ENDPOINT"),
-            aws_access_key_id=os.getenv("S3_ACCESS_KEY"),
-            aws_secret_access_key=os.getenv("S3_SECRET_KEY"),
-        )
-        client.put_object(Bucket=bucket, Key=key, Body=data)
+        _s3_client().upload_fileobj(fileobj, bucket, key, Config=_S3_TRANSFER)
         return True
-    except (BotoCoreError, ClientError):
+    except (BotoCoreError, ClientError, S3UploadFailedError):
         return False
 
@@ -2,50 +2,103 @@
 Excel export using pandas/openpyxl with formatting.
 """
 from typing import List, Dict, Optional
+import numpy as np
 import pandas as pd
-from openpyxl import load_workbook
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.utils import get_column_letter
 
+# Header style, built once and shared by every header cell
+HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+HEADER_FONT = Font(bold=True, color="FFFFFF")
+HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="center")
+MAX_COLUMN_WIDTH = 50
+EXPORT_CHUNK_ROWS = 10_000
+
+
+def _column_widths(df: pd.DataFrame) -> List[int]:
+    """Width per column: longest header/value text + 2, capped at MAX_COLUMN_WIDTH."""
+    if df.columns.empty:
+        return []
+    if df.empty:
+        value_lengths = np.zeros(len(df.columns))
+    else:
+        # Vectorized: string lengths per column (missing values count as empty)
+        value_lengths = (
+            df.astype(str).where(df.notna(), "")
+            .apply(lambda column: column.str.len().max())
+            .fillna(0)
+            .to_numpy()
+        )
+    header_lengths = [len(str(column)) for column in df.columns]
+    return [min(int(width) + 2, MAX_COLUMN_WIDTH) for width in np.maximum(value_lengths, header_lengths)]
+
+
+def _start_sheet(workbook: Workbook, sheet_name: str, columns, widths: List[int]):
+    """New write-only sheet with column widths and the styled header row."""
+    worksheet = workbook.create_sheet(sheet_name)
+    
+    # Column widths must be set before the first row is written
+    for i, width in enumerate(widths, start=1):
+        worksheet.column_dimensions[get_column_letter(i)].width = width
+    
+    header = []
+    for column in columns:
+        cell = WriteOnlyCell(worksheet, value=str(column))
+        cell.fill = HEADER_FILL
+        cell.font = HEADER_FONT
+        cell.alignment = HEADER_ALIGNMENT
+        header.append(cell)
+    worksheet.append(header)
+    return worksheet
+
+
+def _append_rows(worksheet, df: pd.DataFrame) -> None:
+    """Append a DataFrame's rows as plain values (NaN/NaT become empty cells)."""
+    values = df.astype(object).where(df.notna(), None)
+    for row in values.itertuples(index=False, name=None):
+        worksheet.append(row)
+
+
+def _write_sheet(workbook: Workbook, sheet_name: str, df: pd.DataFrame) -> None:
+    """
+    Stream a DataFrame into a new sheet of a write-only workbook:
+    styled header row, then plain rows (NaN/NaT become empty cells).
+    """
+    worksheet = _start_sheet(workbook, sheet_name, df.columns, _column_widths(df))
+    _append_rows(worksheet, df)
+
 
 def export_procedures(rows: List[Dict], path: str, sheet_name: str = "Procedures") -> None:
     """
     Write procedures to Excel with formatting.
+    Uses a write-only workbook: rows are streamed, not held as cell objects.
     """
     if not rows:
         df = pd.DataFrame()
     else:
         df = pd.DataFrame(rows)
     
-    # Write to Excel
-    with pd.ExcelWriter(path, engine="openpyxl") as writer:
-        df.to_excel(writer, sheet_name=sheet_name, index=False)
-        
-        # Format the sheet
-        workbook = writer.book
-        worksheet = writer.sheets[sheet_name]
-        
-        # Header formatting
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF")
-        
-        for cell in worksheet[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-        
-        # Auto-adjust column widths
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+    workbook = Workbook(write_only=True)
+    _write_sheet(workbook, sheet_name, df)
+    workbook.save(path)
+
+
+def _iter_frames(cur, columns: List[str]):
+    """
+    DataFrames of at most EXPORT_CHUNK_ROWS rows from an executed cursor.
+    Timezone-aware datetimes are converted to naive UTC (Excel has no tz).
+    """
+    while True:
+        records = cur.fetchmany(EXPORT_CHUNK_ROWS)
+        if not records:
+            return
+        df = pd.DataFrame.from_records(records, columns=columns, coerce_float=True)
+        for col in df.columns:
+            if isinstance(df[col].dtype, pd.DatetimeTZDtype):
+                df[col] = df[col].dt.tz_convert("UTC").dt.tz_localize(None)
+        yield df
 
 
 def export_from_db(db_dsn: str, output_path: str, filter_high_confidence: bool = False) -> None:
@@ -84,95 +137,89 @@ def export_from_db(db_dsn: str, output_path: str, filter_high_confidence: bool =
     WHERE p.procedure_id != 'test-proc-999'
     """
     
+    # Summary statistics, aggregated by Postgres in one scan
+    summary_query = """
+    SELECT
+        COUNT(*),
+        COUNT(*) FILTER (WHERE p.confidence = 'high'),
+        COUNT(*) FILTER (WHERE p.confidence = 'medium'),
+        COUNT(*) FILTER (WHERE p.confidence = 'low'),
+        COUNT(*) FILTER (WHERE p.bess_score > 0),
+        COUNT(*) FILTER (WHERE p.grid_score > 0),
+        COUNT(p.capacity_mw),
+        COUNT(p.area_hectares),
+        COUNT(p.decision_date),
+        COUNT(p.developer_company),
+        AVG(p.bess_score),
+        AVG(p.grid_score),
+        COALESCE(SUM(p.capacity_mw), 0),
+        COALESCE(SUM(p.area_hectares), 0)
+    FROM procedures p
+    WHERE p.procedure_id != 'test-proc-999'
+    """
+    
     if filter_high_confidence:
         query += " AND p.confidence = 'high'"
+        summary_query += " AND p.confidence = 'high'"
     
     query += " GROUP BY p.procedure_id ORDER BY p.bess_score DESC, p.grid_score DESC"
     
-    with connect(db_dsn) as conn:
-        df = pd.read_sql_query(query, conn)
-    
-    # Convert timezone-aware datetimes to timezone-naive for Excel
-    datetime_cols = df.select_dtypes(include=['datetime64[ns, UTC]', 'datetime64[ns]']).columns
-    for col in datetime_cols:
-        if df[col].dtype.tz is not None:
-            df[col] = df[col].dt.tz_localize(None)
+    row_count = 0
+    # Export to Excel with multiple sheets (write-only workbook, formatted while streaming)
+    workbook = Workbook(write_only=True)
     
-    # Export to Excel with multiple sheets
-    with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
-        # All procedures
-        df.to_excel(writer, sheet_name="All Procedures", index=False)
-        
-        # High confidence only
-        if not filter_high_confidence:
-            df_high = df[df["confidence"] == "high"].copy()
-            df_high.to_excel(writer, sheet_name="High Confidence", index=False)
+    with connect(db_dsn) as conn:
+        summary_values = list(conn.execute(summary_query).fetchone())
         
-        # Summary statistics
-        summary_data = {
-            "Metric": [
-                "Total Procedures",
-                "High Confidence",
-                "Medium Confidence",
-                "Low Confidence",
-                "With BESS Score > 0",
-                "With Grid Score > 0",
-                "With Capacity (MW)",
-                "With Area (Hectares)",
-                "With Decision Date",
-                "With Company",
-                "Avg BESS Score",
-                "Avg Grid Score",
-                "Total Capacity (MW)",
-                "Total Area (Hectares)",
-            ],
-            "Value": [
-                len(df),
-                len(df[df["confidence"] == "high"]),
-                len(df[df["confidence"] == "medium"]),
-                len(df[df["confidence"] == "low"]),
-                len(df[df["bess_score"] > 0]),
-                len(df[df["grid_score"] > 0]),
-                len(df[df["capacity_mw"].notna()]),
-                len(df[df["area_hectares"].notna()]),
-                len(df[df["decision_date"].notna()]),
-                len(df[df["developer_company"].notna()]),
-                df["bess_score"].mean(),
-                df["grid_score"].mean(),
-                df["capacity_mw"].sum() if "capacity_mw" in df.columns else 0,
-                df["area_hectares"].sum() if "area_hectares" in df.columns else 0,
-            ],
-        }
-        df_summary = pd.DataFrame(summary_data)
-        df_summary.to_excel(writer, sheet_name="Summary", index=False)
+        # Server-side cursor read in chunks: only EXPORT_CHUNK_ROWS rows are held at a time.
+        # Column widths go before any row, so a first pass measures, then the cursor rewinds.
+        with conn.cursor(name="export_procedures", scroll=True) as cur:
+            cur.execute(query)
+            columns = [column.name for column in cur.description]
+            empty = pd.DataFrame(columns=columns)
+            widths = _column_widths(empty)
+            high_widths = widths
+            for chunk in _iter_frames(cur, columns):
+                widths = np.maximum(widths, _column_widths(chunk))
+                if not filter_high_confidence:
+                    high_widths = np.maximum(high_widths, _column_widths(chunk[chunk["confidence"] == "high"]))
+            
+            # All procedures
+            all_sheet = _start_sheet(workbook, "All Procedures", columns, [int(w) for w in widths])
+            # High confidence only
+            high_sheet = None
+            if not filter_high_confidence:
+                high_sheet = _start_sheet(workbook, "High Confidence", columns, [int(w) for w in high_widths])
+            
+            cur.scroll(0, mode="absolute")
+            for chunk in _iter_frames(cur, columns):
+                _append_rows(all_sheet, chunk)
+                if high_sheet is not None:
+                    _append_rows(high_sheet, chunk[chunk["confidence"] == "high"])
+                row_count += len(chunk)
     
-    # Format all sheets
-    workbook = load_workbook(output_path)
-    for sheet_name in workbook.sheetnames:
-        worksheet = workbook[sheet_name]
-        
-        # Header formatting
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF")
-        
-        for cell in worksheet[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-        
-        # Auto-adjust column widths
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+    # Summary statistics
+    summary_data = {
+        "Metric": [
+            "Total Procedures",
+            "High Confidence",
+            "Medium Confidence",
+            "Low Confidence",
+            "With BESS Score > 0",
+            "With Grid Score > 0",
+            "With Capacity (MW)",
+            "With Area (Hectares)",
+            "With Decision Date",
+            "With Company",
+            "Avg BESS Score",
+            "Avg Grid Score",
+            "Total Capacity (MW)",
+            "Total Area (Hectares)",
+        ],
+        "Value": summary_values,
+    }
+    df_summary = pd.DataFrame(summary_data)
+    _write_sheet(workbook, "Summary", df_summary)
     
     workbook.save(output_path)
-    print(f"Exported {len(df)} procedures to {output_path}")
-
+    print(f"Exported {row_count} procedures to {output_path}")
@@ -1,14 +1,19 @@
 """
-Parquet export using pandas/pyarrow.
+Parquet export using pyarrow.
 """
-from typing import List, Dict
-import pandas as pd
+from typing import List, Dict, Optional
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 
-def export_procedures(rows: List[Dict], path: str) -> None:
+def export_procedures(rows: List[Dict], path: str, schema: Optional[pa.Schema] = None) -> None:
+    """
+    Write procedure dicts to a zstd-compressed Parquet file.
+    Rows go straight into an Arrow table (no pandas round-trip); pass
+    schema to skip type inference when the columns are known.
+    """
     if not rows:
-        df = pd.DataFrame()
+        table = schema.empty_table() if schema is not None else pa.table({})
     else:
-        df = pd.DataFrame(rows)
-    df.to_parquet(path, index=False, engine="pyarrow")
-
+        table = pa.Table.from_pylist(rows, schema=schema)
+    pq.write_table(table, path, compression="zstd", compression_level=3, use_dictionary=True)
@@ -2,14 +2,12 @@
 Extract area/hectare information from text.
 """
 import re
-from typing import List, Tuple, Optional
+from typing import Iterator, List, Tuple, Optional
 
-# Area patterns
-HECTARE_PATTERNS = [
-    re.compile(r"(\d+(?:[.,]\d+)?)\s*(?:ha|hektar|hektare)", re.IGNORECASE),
-    re.compile(r"(\d+(?:[.,]\d+)?)\s*(?:qm|m²|quadratmeter)", re.IGNORECASE),
-    re.compile(r"(\d+(?:[.,]\d+)?)\s*(?:km²|quadratkilometer)", re.IGNORECASE),
-]
+try:
+    import re2
+except ImportError:  # pyre2 optional, stdlib re otherwise
+    re2 = None
 
 # Conversion factors to hectares
 CONVERSIONS = {
@@ -23,34 +21,32 @@ CONVERSIONS = {
     "hektare": 1,
 }
 
+# One pass over the text: value and unit captured together.
+# Longer units first so "hektare" is not cut to "hektar", "km²" not to "m²".
+# No backreferences or lookarounds, so RE2 runs it as a DFA when installed.
+AREA_PATTERN = (re2 or re).compile(
+    r"(?i)(?P<val>\d+(?:[.,]\d+)?)\s*"
+    r"(?P<unit>hektare|hektar|ha|quadratmeter|qm|m²|quadratkilometer|km²)"
+)
+
+
+def _iter_areas(text: str) -> Iterator[Tuple[float, str]]:
+    for match in AREA_PATTERN.finditer(text):
+        unit = match.group("unit").lower()
+        try:
+            value = float(match.group("val").replace(",", "."))
+        except ValueError:
+            continue
+        # Convert to hectares
+        yield value * CONVERSIONS[unit], unit
+
 
 def extract_area(text: str) -> List[Tuple[float, str]]:
     """
     Extract area values from text.
-    Returns list of (area_in_hectares, unit) tuples.
+    Returns list of (area_in_hectares, unit) tuples in text order.
     """
-    results = []
-    
-    for pattern in HECTARE_PATTERNS:
-        for match in pattern.finditer(text):
-            try:
-                value_str = match.group(1).replace(",", ".")
-                value = float(value_str)
-                
-                # Determine unit from match
-                unit = "ha"  # default
-                for u in CONVERSIONS.keys():
-                    if u.lower() in match.group(0).lower():
-                        unit = u
-                        break
-                
-                # Convert to hectares
-                hectares = value * CONVERSIONS.get(unit, 1)
-                results.append((hectares, unit))
-            except (ValueError, TypeError):
-                continue
-    
-    return results
+    return list(_iter_areas(text))
 
 
 def find_largest_area(text: str) -> Optional[float]:
@@ -58,16 +54,8 @@ def find_largest_area(text: str) -> Optional[float]:
     Find the largest area mentioned (likely the project area).
     Returns area in hectares.
     """
-    areas = extract_area(text)
-    if not areas:
-        return None
-    
-    # Return largest area
-    return max(area[0] for area in areas)
-
-
-
-
-
-
-
+    largest = None
+    for hectares, _ in _iter_areas(text):
+        if largest is None or hectares > largest:
+            largest = hectares
+    return largest
@@ -19,57 +19,128 @@ from .keywords_bess import (
     LEGAL_BASIS_TERMS,
     PERMIT_DOC_CONTEXT_TERMS,
 )
-from .normalize import normalize_text
+from .normalize import NormalizedDoc, normalize_doc
+from apps.utils.keywords import KeywordMatcher
 
+# Concatenated term lists, built once instead of on every call
+PROCEDURE_TERMS = tuple(PLANNING_TERMS_STRONG + PLANNING_STEP_TERMS + PERMIT_TERMS_STRONG)
+PROCEDURE_STEP_TERMS = tuple(PLANNING_STEP_TERMS + PERMIT_TERMS_STRONG)
 
-def is_candidate(text: str, title: str = "") -> bool:
+# Strong BESS terms only (not medium terms like "speicheranlage")
+STRONG_BESS_TERMS = ("batteriespeicher", "batterie-speicher", "energiespeicher", "stromspeicher", "grossspeicher", "großspeicher", "bess")
+# Medium terms (ambiguous, need context)
+MEDIUM_BESS_TERMS = ("speicheranlage", "speicherpark", "speicherkraftwerk")
+
+# One automaton per keyword category; each check is a single pass over the text
+_NEGATIVE_MATCHER = KeywordMatcher(NEGATIVE_STORAGE_TERMS + NEGATIVE_UNRELATED_TERMS)
+_BESS_EXPLICIT_MATCHER = KeywordMatcher(BESS_TERMS_EXPLICIT)
+_STRONG_BESS_MATCHER = KeywordMatcher(STRONG_BESS_TERMS)
+_PROCEDURE_MATCHER = KeywordMatcher(PROCEDURE_TERMS)
+_ENERGY_MATCHER = KeywordMatcher(ENERGY_CONTEXT_TERMS)
+_ZONING_MATCHER = KeywordMatcher(ZONING_TERMS)
+
+# Term groups read by the tag and scoring functions
+_LEGAL_35_TERMS = ("§ 35 baugb", "§35 baugb", "§ 35bau gb", "§35bau gb", "außenbereich", "aussenbereich")
+_LEGAL_34_TERMS = ("§ 34 baugb", "§34 baugb", "§ 34bau gb", "§34bau gb", "innenbereich")
+_LEGAL_36_TERMS = ("§ 36 baugb", "§36 baugb", "§ 36bau gb", "§36bau gb")
+_PV_TERMS = ("photovoltaik", "pv", "solarpark")
+_WIND_TERMS = ("windenergie", "windpark")
+_COMPONENT_GRID_TERMS = ("netz", "umspannwerk", "trafostation", "mittelspannung", "hochspannung")
+_CONFIDENCE_GRID_TERMS = ("umspannwerk", "netzanschluss", "trafostation", "mittelspannung", "hochspannung", "netzverknuepfungspunkt", "netzverknüpfungspunkt")
+
+# Every trigger term, so classify_relevance collects all signals in one pass
+_SIGNAL_MATCHER = KeywordMatcher(
+    PROCEDURE_TERMS
+    + tuple(BESS_TERMS_EXPLICIT + BESS_TERMS_CONTAINER_GRID + ENERGY_CONTEXT_TERMS)
+    + tuple(NEGATIVE_STORAGE_TERMS + LEGAL_BASIS_TERMS)
+    + _LEGAL_35_TERMS + _LEGAL_34_TERMS + _LEGAL_36_TERMS
+    + _PV_TERMS + _WIND_TERMS + _COMPONENT_GRID_TERMS + _CONFIDENCE_GRID_TERMS
+    + (
+        "speicher", "§ 36", "antrag auf", "vorhaben", "frühzeitige beteiligung", "öffentliche auslegung",
+        "batteriespeicher", "energiespeicher", "stromspeicher", "speicheranlage", "grossspeicher",
+        "großspeicher", "speicherpark",
+    )
+)
+
+# Confidence signal bits; calculate_confidence scores the OR of a document's hits
+_SIG_BESS_TOP = 1 << 0
+_SIG_BESS_MEDIUM = 1 << 1
+_SIG_SPEICHER = 1 << 2
+_SIG_ENERGY = 1 << 3
+_SIG_PLANNING_STEP = 1 << 4
+_SIG_PERMIT_DECISION = 1 << 5
+_SIG_EINVERNEHMEN = 1 << 6
+_SIG_GRID_SUPPORT = 1 << 7
+_SIG_NEGATIVE_STORAGE = 1 << 8
+_SIG_CONTAINER_GRID = 1 << 9
+
+_CONFIDENCE_SIGNALS: Dict[str, int] = {}
+for _bit, _terms in (
+    (_SIG_BESS_TOP, ("batteriespeicher", "energiespeicher", "stromspeicher")),
+    (_SIG_BESS_MEDIUM, ("speicheranlage", "grossspeicher", "großspeicher", "speicherpark")),
+    (_SIG_SPEICHER, ("speicher",)),
+    (_SIG_ENERGY, ENERGY_CONTEXT_TERMS),
+    (_SIG_PLANNING_STEP, PLANNING_STEP_TERMS),
+    (_SIG_PERMIT_DECISION, ("bauvorbescheid", "baugenehmigung")),
+    (_SIG_EINVERNEHMEN, ("§ 36 baugb", "gemeindliches einvernehmen")),
+    (_SIG_GRID_SUPPORT, _CONFIDENCE_GRID_TERMS),
+    (_SIG_NEGATIVE_STORAGE, NEGATIVE_STORAGE_TERMS),
+    (_SIG_CONTAINER_GRID, BESS_TERMS_CONTAINER_GRID),
+):
+    for _term in _terms:
+        _CONFIDENCE_SIGNALS[_term] = _CONFIDENCE_SIGNALS.get(_term, 0) | _bit
+del _bit, _terms, _term
+
+
+def is_candidate(text: str = "", title: str = "", doc: Optional[NormalizedDoc] = None) -> bool:
     """
     4.1 Candidate gating (fast prefilter)
     A document becomes a candidate if it contains procedure terms AND BESS/energy terms.
     Excludes documents with strong negative signals.
+    Pass doc (from normalize_doc) to reuse a normalization shared with classify_relevance.
     """
-    normalized_text, _ = normalize_text(text)
-    normalized_title, _ = normalize_text(title)
-    combined = normalized_text + " " + normalized_title
+    if doc is None:
+        doc = normalize_doc(text, title)
+    combined = doc.combined
     
     # Check for strong negative signals FIRST
-    has_negative = any(term in combined for term in NEGATIVE_STORAGE_TERMS + NEGATIVE_UNRELATED_TERMS)
-    has_bess_explicit = any(term in combined for term in BESS_TERMS_EXPLICIT)
+    has_negative = _NEGATIVE_MATCHER.contains_any(combined)
+    has_bess_explicit = _BESS_EXPLICIT_MATCHER.contains_any(combined)
     
     # If negative terms present without explicit BESS, reject early
     if has_negative and not has_bess_explicit:
         return False
     
     # Check for procedure terms
-    has_procedure = any(
-        term in combined 
-        for term in PLANNING_TERMS_STRONG + PLANNING_STEP_TERMS + PERMIT_TERMS_STRONG
-    )
+    has_procedure = _PROCEDURE_MATCHER.contains_any(combined)
     
     if not has_procedure:
         return False
     
     # Check for BESS/energy terms
-    has_speicher_energy = (
-        "speicher" in combined and 
-        any(term in combined for term in ENERGY_CONTEXT_TERMS)
-    )
-    has_zoning_energy = (
-        any(term in combined for term in ZONING_TERMS) and
-        any(term in combined for term in ENERGY_CONTEXT_TERMS)
-    )
+    has_energy = _ENERGY_MATCHER.contains_any(combined)
+    has_speicher_energy = "speicher" in combined and has_energy
+    has_zoning_energy = has_energy and _ZONING_MATCHER.contains_any(combined)
     
     return has_bess_explicit or has_speicher_energy or has_zoning_energy
 
 
-def classify_relevance(text: str, title: str = "", date: Optional[datetime] = None) -> Dict:
+def classify_relevance(
+    text: str = "",
+    title: str = "",
+    date: Optional[datetime] = None,
+    doc: Optional[NormalizedDoc] = None,
+) -> Dict:
     """
     4.2 Confirmed relevance (high precision)
     Returns classification result with procedure_type, legal_basis, etc.
+    Pass doc (from normalize_doc) to skip normalizing text and title again.
     """
-    normalized_text, original_text = normalize_text(text)
-    normalized_title, original_title = normalize_text(title)
-    combined = normalized_text + " " + normalized_title
+    if doc is None:
+        doc = normalize_doc(text, title)
+    combined = doc.combined
+    normalized_title = doc.normalized_title
+    original_text, original_title = doc.original_text, doc.original_title
     
     # Also check original (non-normalized) text for negative terms
     original_combined = (original_text + " " + original_title).lower()
@@ -88,23 +159,12 @@ def classify_relevance(text: str, title: str = "", date: Optional[datetime] = No
     # Check for negative terms FIRST - if present without explicit BESS, reject early
     # Check both normalized and original text
     has_negative = (
-        any(term in combined for term in NEGATIVE_STORAGE_TERMS + NEGATIVE_UNRELATED_TERMS) or
-        any(term in original_combined for term in NEGATIVE_STORAGE_TERMS + NEGATIVE_UNRELATED_TERMS)
+        _NEGATIVE_MATCHER.contains_any(combined) or
+        _NEGATIVE_MATCHER.contains_any(original_combined)
     )
     
     # Rule R1: Explicit BESS + procedure
-    # Strong BESS terms only (not medium terms like "speicheranlage")
-    strong_bess_terms = ["batteriespeicher", "batterie-speicher", "energiespeicher", "stromspeicher", "grossspeicher", "großspeicher", "bess"]
-    has_bess_explicit = any(term in combined for term in strong_bess_terms)
-    
-    # Medium terms (ambiguous, need context)
-    medium_bess_terms = ["speicheranlage", "speicherpark", "speicherkraftwerk"]
-    has_medium_bess = any(term in combined for term in medium_bess_terms)
-    
-    has_procedure = any(
-        term in combined 
-        for term in PLANNING_TERMS_STRONG + PLANNING_STEP_TERMS + PERMIT_TERMS_STRONG
-    )
+    has_bess_explicit = _STRONG_BESS_MATCHER.contains_any(combined)
     
     # If negative terms present without explicit BESS, reject
     if has_negative and not has_bess_explicit:
@@ -112,6 +172,11 @@ def classify_relevance(text: str, title: str = "", date: Optional[datetime] = No
         result["confidence_score"] = 0.0
         return result
     
+    # Every remaining check reads from this single pass over combined
+    hits = collect_signals(combined)
+    has_medium_bess = _any_hit(hits, MEDIUM_BESS_TERMS)
+    has_procedure = _any_hit(hits, PROCEDURE_TERMS)
+    
     # Rule R1: Only strong explicit BESS terms
     if has_bess_explicit and has_procedure and not has_negative:
         result["is_relevant"] = True
@@ -124,12 +189,9 @@ def classify_relevance(text: str, title: str = "", date: Optional[datetime] = No
     # Rule R3: Ambiguous "Speicher" but strong grid context
     # Applies to: "speicher" (generic) OR medium terms like "speicheranlage" (without strong BESS terms)
     # Only apply if no negative terms (already checked above) and not already relevant
-    if (("speicher" in combined or has_medium_bess) and not result["is_relevant"] and not has_negative):
-        grid_terms_count = sum(1 for term in BESS_TERMS_CONTAINER_GRID if term in combined)
-        has_procedure_term = any(
-            term in combined 
-            for term in PLANNING_STEP_TERMS + PERMIT_TERMS_STRONG
-        )
+    if (("speicher" in hits or has_medium_bess) and not result["is_relevant"] and not has_negative):
+        grid_terms_count = sum(1 for term in BESS_TERMS_CONTAINER_GRID if term in hits)
+        has_procedure_term = _any_hit(hits, PROCEDURE_STEP_TERMS)
         
         if grid_terms_count >= 2 and has_procedure_term:
             result["is_relevant"] = True
@@ -139,23 +201,19 @@ def classify_relevance(text: str, title: str = "", date: Optional[datetime] = No
         return result
     
     # Tag procedure type
-    result["procedure_type"] = tag_procedure_type(combined)
-    result["legal_basis"] = tag_legal_basis(combined)
-    result["project_components"] = tag_project_components(combined)
+    result["procedure_type"] = tag_procedure_type(combined, hits)
+    result["legal_basis"] = tag_legal_basis(combined, hits)
+    result["project_components"] = tag_project_components(combined, hits)
     
     # Calculate confidence score
     result["confidence_score"] = calculate_confidence(
-        combined, normalized_title, has_bess_explicit, date
+        combined, normalized_title, has_bess_explicit, date, hits
     )
     
     # Set flags
-    # Check if BESS is explicit (strong terms only, not medium terms like "speicheranlage")
-    strong_bess_terms = ["batteriespeicher", "batterie-speicher", "energiespeicher", "stromspeicher", "grossspeicher", "großspeicher", "bess"]
-    has_bess_explicit_final = any(term in combined for term in strong_bess_terms)
-    
     # Set ambiguity flag if not already set (Rule R3 might have set it)
-    # If no explicit BESS terms, it's ambiguous
-    if not has_bess_explicit_final:
+    # If no explicit BESS terms (strong terms only), it's ambiguous
+    if not has_bess_explicit:
         result["ambiguity_flag"] = True
     
     if 0.35 <= result["confidence_score"] <= 0.65:
@@ -163,85 +221,99 @@ def classify_relevance(text: str, title: str = "", date: Optional[datetime] = No
     
     # Extract evidence snippets
     result["evidence_snippets"] = extract_evidence_snippets(
-        original_text, original_title, combined
+        original_text, original_title, combined, hits=hits
     )
     
     return result
 
 
-def tag_procedure_type(text: str) -> str:
+def collect_signals(text: str) -> Dict[str, int]:
+    """
+    Single pass over text: {term: first start index} for every trigger term
+    the tag, scoring and snippet functions look at.
+    """
+    hits: Dict[str, int] = {}
+    for idx, term in _SIGNAL_MATCHER.iter_matches(text):
+        if term not in hits or idx < hits[term]:
+            hits[term] = idx
+    return hits
+
+
+def _any_hit(hits: Dict[str, int], terms) -> bool:
+    return any(term in hits for term in terms)
+
+
+def tag_procedure_type(text: str, hits: Optional[Dict[str, int]] = None) -> str:
     """Tag procedural step type."""
+    if hits is None:
+        hits = collect_signals(text)
     # Check permit types FIRST (before B-Plan, as they can overlap)
-    if "bauvorbescheid" in text or "vorbescheid" in text:
+    if "bauvorbescheid" in hits or "vorbescheid" in hits:
         return "PERMIT_BAUVORBESCHEID"
-    elif "baugenehmigung" in text:
+    elif "baugenehmigung" in hits:
         return "PERMIT_BAUGENEHMIGUNG"
-    elif "§ 36 baugb" in text or ("gemeindliches einvernehmen" in text and "§ 36" in text):
+    elif "§ 36 baugb" in hits or ("gemeindliches einvernehmen" in hits and "§ 36" in hits):
         return "PERMIT_36_EINVERNEHMEN"
-    elif "bauantrag" in text or ("antrag auf" in text and any(p in text for p in PERMIT_TERMS_STRONG)):
+    elif "bauantrag" in hits or ("antrag auf" in hits and _any_hit(hits, PERMIT_TERMS_STRONG)):
         return "PERMIT_OTHER"
     # Expanded privileged project language
-    elif "bauvoranfrage" in text or "bauvorantrag" in text:
+    elif "bauvoranfrage" in hits or "bauvorantrag" in hits:
         return "PERMIT_OTHER"
-    elif "kenntnisnahme" in text and ("bauantrag" in text or "vorhaben" in text):
+    elif "kenntnisnahme" in hits and ("bauantrag" in hits or "vorhaben" in hits):
         return "PERMIT_OTHER"
-    elif "antrag auf errichtung" in text:
+    elif "antrag auf errichtung" in hits:
         return "PERMIT_OTHER"
     
     # B-Plan types (check after permits)
-    if "aufstellungsbeschluss" in text or "beschluss zur aufstellung" in text or "§ 2 abs. 1 baugb" in text:
+    if "aufstellungsbeschluss" in hits or "beschluss zur aufstellung" in hits or "§ 2 abs. 1 baugb" in hits:
         return "BPLAN_AUFSTELLUNG"
-    elif "§ 3 abs. 1 baugb" in text or "frühzeitige beteiligung" in text or "fruehzeitige beteiligung" in text:
+    elif "§ 3 abs. 1 baugb" in hits or "frühzeitige beteiligung" in hits or "fruehzeitige beteiligung" in hits:
         return "BPLAN_FRUEHZEITIG_3_1"
-    elif "§ 3 abs. 2 baugb" in text or "öffentliche auslegung" in text or "oeffentliche auslegung" in text:
+    elif "§ 3 abs. 2 baugb" in hits or "öffentliche auslegung" in hits or "oeffentliche auslegung" in hits:
         return "BPLAN_AUSLEGUNG_3_2"
-    elif "satzungsbeschluss" in text or "§ 10 baugb" in text or "inkrafttreten" in text:
+    elif "satzungsbeschluss" in hits or "§ 10 baugb" in hits or "inkrafttreten" in hits:
         return "BPLAN_SATZUNG"
-    elif any(term in text for term in PLANNING_TERMS_STRONG):
+    elif _any_hit(hits, PLANNING_TERMS_STRONG):
         return "BPLAN_OTHER"
     
     return "UNKNOWN"
 
 
-def tag_legal_basis(text: str) -> str:
+def tag_legal_basis(text: str, hits: Optional[Dict[str, int]] = None) -> str:
     """Tag legal basis (§35/§34/§36). Handles broken whitespace in RIS PDFs."""
-    # Normalize text to handle broken whitespace (RIS PDFs often split words)
-    text_normalized = text.replace("\n", " ").replace("\t", " ").replace("  ", " ")
+    if hits is None:
+        # Normalize text to handle broken whitespace (RIS PDFs often split words)
+        text_normalized = text.replace("\n", " ").replace("\t", " ").replace("  ", " ")
+        hits = collect_signals(text_normalized)
     
     # Check for §35 patterns (with and without spaces)
-    if ("§ 35 baugb" in text_normalized or "§35 baugb" in text_normalized or 
-        "§ 35bau gb" in text_normalized or "§35bau gb" in text_normalized or
-        "außenbereich" in text_normalized or "aussenbereich" in text_normalized):
+    if _any_hit(hits, _LEGAL_35_TERMS):
         return "§35"
     # Check for §34 patterns
-    elif ("§ 34 baugb" in text_normalized or "§34 baugb" in text_normalized or
-          "§ 34bau gb" in text_normalized or "§34bau gb" in text_normalized or
-          "innenbereich" in text_normalized):
+    elif _any_hit(hits, _LEGAL_34_TERMS):
         return "§34"
     # Check for §36 patterns
-    elif ("§ 36 baugb" in text_normalized or "§36 baugb" in text_normalized or
-          "§ 36bau gb" in text_normalized or "§36bau gb" in text_normalized):
+    elif _any_hit(hits, _LEGAL_36_TERMS):
         return "§36"
     return "unknown"
 
 
-def tag_project_components(text: str) -> str:
+def tag_project_components(text: str, hits: Optional[Dict[str, int]] = None) -> str:
     """Tag project components (PV+BESS, WIND+BESS, etc.)."""
-    # Handle broken whitespace
-    text_normalized = text.replace("\n", " ").replace("\t", " ")
+    if hits is None:
+        # Handle broken whitespace
+        hits = collect_signals(text.replace("\n", " ").replace("\t", " "))
     
-    has_pv = any(term in text_normalized for term in ["photovoltaik", "pv", "solarpark"])
-    has_wind = any(term in text_normalized for term in ["windenergie", "windpark"])
-    has_bess = any(term in text_normalized for term in BESS_TERMS_EXPLICIT) or "speicher" in text_normalized
+    has_pv = _any_hit(hits, _PV_TERMS)
+    has_wind = _any_hit(hits, _WIND_TERMS)
+    has_bess = "speicher" in hits or _any_hit(hits, BESS_TERMS_EXPLICIT)
     
     # Check for containeranlage with grid context
-    has_container = "containeranlage" in text_normalized
-    has_grid = any(term in text_normalized for term in ["netz", "umspannwerk", "trafostation", "mittelspannung", "hochspannung"])
-    if has_container and has_grid:
+    if "containeranlage" in hits and _any_hit(hits, _COMPONENT_GRID_TERMS):
         has_bess = True  # Treat as BESS
     
     # Check for "anlage zur energiespeicherung"
-    if "anlage zur energiespeicherung" in text_normalized:
+    if "anlage zur energiespeicherung" in hits:
         has_bess = True
     
     if has_pv and has_bess:
@@ -253,88 +325,86 @@ def tag_project_components(text: str) -> str:
     return "OTHER/UNCLEAR"
 
 
-def calculate_confidence(text: str, title: str, has_bess_explicit: bool, date: Optional[datetime]) -> float:
+def calculate_confidence(
+    text: str,
+    title: str,
+    has_bess_explicit: bool,
+    date: Optional[datetime],
+    hits: Optional[Dict[str, int]] = None,
+) -> float:
     """
     5) Confidence scoring (0–1)
     """
+    if hits is None:
+        hits = collect_signals(text)
+    mask = 0
+    for term in hits:
+        mask |= _CONFIDENCE_SIGNALS.get(term, 0)
+    return _score_signals(mask, has_bess_explicit, date is not None)
+
+
+def _score_signals(mask: int, has_bess_explicit: bool, has_date: bool) -> float:
+    """Confidence from a _SIG_* bitmask; integer tests only, no text access."""
+    # False-positive penalty for negative terms without explicit BESS
+    if mask & _SIG_NEGATIVE_STORAGE and not has_bess_explicit:
+        return 0.0
+    
     score = 0.0
     
     # BESS explicitness
-    if any(term in text for term in ["batteriespeicher", "energiespeicher", "stromspeicher"]):
+    if mask & _SIG_BESS_TOP:
         score += 0.55
-    elif any(term in text for term in ["speicheranlage", "grossspeicher", "großspeicher", "speicherpark"]):
+    elif mask & _SIG_BESS_MEDIUM:
         score += 0.35
-    elif "speicher" in text and any(term in text for term in ENERGY_CONTEXT_TERMS):
+    elif mask & _SIG_SPEICHER and mask & _SIG_ENERGY:
         score += 0.15
     
     # Procedure strength
-    if any(term in text for term in PLANNING_STEP_TERMS):
+    if mask & _SIG_PLANNING_STEP:
         score += 0.25
-    if "bauvorbescheid" in text or "baugenehmigung" in text:
+    if mask & _SIG_PERMIT_DECISION:
         score += 0.25
-    if "§ 36 baugb" in text or "gemeindliches einvernehmen" in text:
+    if mask & _SIG_EINVERNEHMEN:
         score += 0.20
     
     # Grid/infrastructure support
-    grid_terms = ["umspannwerk", "netzanschluss", "trafostation", "mittelspannung", "hochspannung", "netzverknuepfungspunkt", "netzverknüpfungspunkt"]
-    if any(term in text for term in grid_terms):
+    if mask & _SIG_GRID_SUPPORT:
         score += 0.10
     
-    # False-positive penalties (apply BEFORE adding positive points if negative terms present)
-    has_negative = any(term in text for term in NEGATIVE_STORAGE_TERMS)
-    if has_negative and not has_bess_explicit:
-        # Strong penalty - set score very low
-        score = 0.0
-        return 0.0  # Early return for strong negatives
-    
-    if "speicher" in text and not any(term in text for term in BESS_TERMS_CONTAINER_GRID):
+    if mask & _SIG_SPEICHER and not mask & _SIG_CONTAINER_GRID:
         score -= 0.25
-    if date is None:
+    if not has_date:
         score -= 0.15
     
     # Clamp to [0, 1]
     return max(0.0, min(1.0, score))
 
 
-def extract_evidence_snippets(text: str, title: str, normalized: str, max_snippets: int = 5) -> List[str]:
+def extract_evidence_snippets(
+    text: str,
+    title: str,
+    normalized: str,
+    max_snippets: int = 5,
+    hits: Optional[Dict[str, int]] = None,
+) -> List[str]:
     """
     Extract evidence snippets around matched triggers.
     """
+    if hits is None:
+        hits = collect_signals(normalized)
     snippets = []
     max_len = 250
     
-    # Find BESS terms
-    for term in BESS_TERMS_EXPLICIT:
-        if term in normalized:
-            idx = normalized.find(term)
-            start = max(0, idx - 100)
-            end = min(len(text), idx + len(term) + 100)
-            snippet = text[start:end].strip()
-            if snippet and len(snippet) <= max_len:
-                snippets.append(snippet)
-                break
-    
-    # Find procedure terms
-    for term in PLANNING_STEP_TERMS + PERMIT_TERMS_STRONG:
-        if term in normalized:
-            idx = normalized.find(term)
-            start = max(0, idx - 100)
-            end = min(len(text), idx + len(term) + 100)
-            snippet = text[start:end].strip()
-            if snippet and len(snippet) <= max_len:
-                snippets.append(snippet)
-                break
-    
-    # Find legal basis
-    for term in LEGAL_BASIS_TERMS:
-        if term in normalized:
-            idx = normalized.find(term)
-            start = max(0, idx - 100)
-            end = min(len(text), idx + len(term) + 100)
-            snippet = text[start:end].strip()
-            if snippet and len(snippet) <= max_len:
-                snippets.append(snippet)
-                break
+    # BESS terms, procedure terms, legal basis: first matching term of each
+    for terms in (BESS_TERMS_EXPLICIT, PROCEDURE_STEP_TERMS, LEGAL_BASIS_TERMS):
+        for term in terms:
+            if term in hits:
+                idx = hits[term]
+                start = max(0, idx - 100)
+                end = min(len(text), idx + len(term) + 100)
+                snippet = text[start:end].strip()
+                if snippet and len(snippet) <= max_len:
+                    snippets.append(snippet)
+                    break
     
     return snippets[:max_snippets]
-
@@ -3,6 +3,7 @@ Text normalization for German keyword matching.
 """
 import re
 import unicodedata
+from dataclasses import dataclass
 
 
 def normalize_umlauts(text: str) -> tuple[str, str]:
@@ -48,6 +49,29 @@ def normalize_text(text: str) -> tuple[str, str]:
     return normalized, original
 
 
+@dataclass
+class NormalizedDoc:
+    """Text and title of one document, normalized once for all classifier passes."""
+    normalized_text: str
+    original_text: str
+    normalized_title: str
+    original_title: str
+    combined: str
+
+
+def normalize_doc(text: str, title: str = "") -> NormalizedDoc:
+    """Normalize text and title and build the combined matching string."""
+    normalized_text, original_text = normalize_text(text)
+    normalized_title, original_title = normalize_text(title)
+    return NormalizedDoc(
+        normalized_text=normalized_text,
+        original_text=original_text,
+        normalized_title=normalized_title,
+        original_title=original_title,
+        combined=normalized_text + " " + normalized_title,
+    )
+
+
 def extract_text_variants(text: str) -> list[str]:
     """
     Extract all text variants for matching (original + normalized).
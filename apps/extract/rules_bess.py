@@ -4,7 +4,7 @@ Erkennt sowohl BESS als auch PV/Solarparks (beide sind relevant für MS/HS).
 Uses improved classifier for Brandenburg planning/permitting procedures.
 """
 from .classifier_bess import is_candidate, classify_relevance
-from .normalize import normalize_text
+from .normalize import normalize_doc
 POSITIVE = {
     # Direct BESS keywords (HIGH PRIORITY)
     "batteriespeicher": 10,
@@ -62,17 +62,17 @@ NEGATIVE = {
 def score(text: str, title: str = "", use_improved: bool = True) -> int:
     # Use improved classifier if enabled
     if use_improved:
-        normalized, _ = normalize_text(text)
-        normalized_title, _ = normalize_text(title)
-        combined = normalized + " " + normalized_title
+        # Normalize once for both the gate and the classifier
+        doc = normalize_doc(text, title)
+        combined = doc.combined
         
         # Check if candidate
-        if not is_candidate(combined, normalized_title):
+        if not is_candidate(doc=doc):
             return 0
         
         # Classify
         from datetime import datetime
-        result = classify_relevance(combined, normalized_title, date=datetime.now())
+        result = classify_relevance(doc=doc, date=datetime.now())
         
         if result["is_relevant"]:
             # Convert confidence (0-1) to score (0-100)
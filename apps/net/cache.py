@@ -5,13 +5,20 @@ Cache backend: local disk keyed by sha256(url).
 import json
 import hashlib
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Dict, Tuple
 from datetime import datetime, timezone
 import os
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Cache writes happen off the request path; pending writes finish at exit
+CACHE_WRITE_WORKERS = int(os.getenv("CRAWL_CACHE_WRITE_WORKERS", "4"))
+_writer = ThreadPoolExecutor(max_workers=CACHE_WRITE_WORKERS, thread_name_prefix="cache-write")
+
 
 def _url_hash(url: str) -> str:
     """Compute SHA256 hash of URL for cache key."""
@@ -28,7 +35,6 @@ def _get_cache_path(base_path: Path, url: str, suffix: str = ".bin") -> Tuple[Pa
     url_hash = _url_hash(url)
     # Use first 2 chars for directory structure
     cache_dir = base_path / url_hash[:2]
-    cache_dir.mkdir(parents=True, exist_ok=True)
     
     content_path = cache_dir / f"{url_hash}{suffix}"
     metadata_path = cache_dir / f"{url_hash}.meta.json"
@@ -36,6 +42,28 @@ def _get_cache_path(base_path: Path, url: str, suffix: str = ".bin") -> Tuple[Pa
     return content_path, metadata_path
 
 
+@lru_cache(maxsize=1024)
+def _ensure_dir(path: Path) -> None:
+    """mkdir -p once per directory per process."""
+    path.mkdir(parents=True, exist_ok=True)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write via a temp file + rename so readers never see a partial file."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _read_metadata(metadata_path: Path) -> Optional[Dict]:
+    try:
+        with open(metadata_path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
 def get_cached(
     url: str,
     base_path: Path,
@@ -54,13 +82,11 @@ def get_cached(
     """
     content_path, metadata_path = _get_cache_path(base_path, url)
     
-    if not content_path.exists() or not metadata_path.exists():
-        return None
-    
     try:
-        # Load metadata
-        with open(metadata_path, 'r') as f:
-            metadata = json.load(f)
+        # Load metadata (written after the content, so its presence means a complete entry)
+        metadata = _read_metadata(metadata_path)
+        if metadata is None:
+            return None
         
         # Check age if specified
         if max_age_seconds:
@@ -70,8 +96,11 @@ def get_cached(
                 return None
         
         # Load content
-        with open(content_path, 'rb') as f:
-            content = f.read()
+        try:
+            with open(content_path, 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
         
         return content, metadata
     except Exception as e:
@@ -84,22 +113,31 @@ def set_cached(
     content: bytes,
     headers: Dict,
     base_path: Path
-) -> None:
+) -> Future:
     """
     Store content and metadata in cache.
     
+    The write runs on a background thread so the caller can go on with
+    the response; the returned future completes once both files are on
+    disk. Until then the entry simply reads as a cache miss.
+    
     Args:
         url: URL
         content: Response content
         headers: Response headers
         base_path: Base cache directory
     """
+    return _writer.submit(_write_cache, url, content, dict(headers), base_path)
+
+
+def _write_cache(url: str, content: bytes, headers: Dict, base_path: Path) -> None:
     content_path, metadata_path = _get_cache_path(base_path, url)
     
     try:
+        _ensure_dir(content_path.parent)
+        
         # Store content
-        with open(content_path, 'wb') as f:
-            f.write(content)
+        _write_atomic(content_path, content)
         
         # Store metadata
         metadata = {
@@ -111,8 +149,7 @@ def set_cached(
             'content_type': headers.get('Content-Type'),
         }
         
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        _write_atomic(metadata_path, json.dumps(metadata, indent=2).encode('utf-8'))
     except Exception as e:
         logger.warning("Error writing cache for %s: %s", url, e)
 
@@ -128,11 +165,16 @@ def get_cache_headers(url: str, base_path: Path) -> Dict[str, str]:
     Returns:
         Dict with conditional headers
     """
-    cached = get_cached(url, base_path)
-    if not cached:
+    # Only the metadata is needed, not the cached body
+    _, metadata_path = _get_cache_path(base_path, url)
+    try:
+        metadata = _read_metadata(metadata_path)
+    except Exception as e:
+        logger.debug("Error reading cache metadata for %s: %s", url, e)
+        return {}
+    if not metadata:
         return {}
     
-    _, metadata = cached
     headers = {}
     
     if metadata.get('etag'):
@@ -9,6 +9,7 @@ from urllib.parse import urlparse
 import requests
 from requests.exceptions import SSLError, RequestException
 
+from apps.net.session import get_session
 from apps.net.ssl_policy import (
     should_disable_ssl_verify,
     record_ssl_error,
@@ -36,7 +37,7 @@ def safe_get(
     
     Args:
         url: URL to fetch
-        session: Optional requests.Session to use
+        session: Optional requests.Session to use (default: shared pooled session)
         timeout: Request timeout
         allow_redirects: Whether to follow redirects
         headers: Optional headers dict
@@ -46,11 +47,9 @@ def safe_get(
     Returns:
         Response object if successful, None if failed
     """
-    sess = session if session is not None else requests.Session()
+    sess = session if session is not None else get_session()
     
-    # Set headers if provided
-    if headers:
-        sess.headers.update(headers)
+    # Headers are passed per request so a shared session is never mutated
     
     # First attempt: always with SSL verification (unless explicitly disabled)
     try:
@@ -59,6 +58,7 @@ def safe_get(
             timeout=timeout,
             allow_redirects=allow_redirects,
             verify=verify,
+            headers=headers,
             **kwargs
         )
         return resp
@@ -86,6 +86,7 @@ def safe_get(
                     timeout=timeout,
                     allow_redirects=allow_redirects,
                     verify=False,
+                    headers=headers,
                     **kwargs
                 )
                 record_ssl_fallback(host, url)
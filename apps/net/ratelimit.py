@@ -2,9 +2,11 @@
 Per-domain rate limiting and global concurrency control.
 """
 import asyncio
+import os
 import time
 import logging
-from typing import Dict, Optional
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
 from urllib.parse import urlparse
 from threading import Semaphore, Lock
 import random
@@ -107,7 +109,146 @@ def release(url: str) -> None:
     _global_semaphore.release()
 
 
+# Upper bound for any header-driven or back-off wait
+MAX_HOST_DELAY = 60.0
 
 
+def _parse_wait_seconds(value: Optional[str], now_epoch: float) -> Optional[float]:
+    """
+    Parse a Retry-After / X-RateLimit-Reset value into seconds to wait.
+    Accepts delta seconds, epoch timestamps, or HTTP dates.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        number = float(value)
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - now_epoch)
+        except (TypeError, ValueError):
+            return None
+    # Large values are absolute epoch timestamps, small ones are deltas
+    if number > 1_000_000_000:
+        return max(0.0, number - now_epoch)
+    return max(0.0, number)
+
+
+def header_wait_seconds(status_code: int, headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Derive how long a host asks us to back off from response headers.
+    
+    Returns:
+        Seconds to wait, or None if the response carries no throttling hint
+    """
+    now_epoch = time.time()
+    if status_code in (429, 503):
+        wait = _parse_wait_seconds(headers.get("Retry-After"), now_epoch)
+        if wait is not None:
+            return wait
+    remaining = headers.get("X-RateLimit-Remaining")
+    if remaining is not None:
+        try:
+            exhausted = float(remaining) <= 0
+        except ValueError:
+            exhausted = False
+        if exhausted:
+            return _parse_wait_seconds(headers.get("X-RateLimit-Reset"), now_epoch)
+    return None
+
+
+def is_retryable_status(status_code: int) -> bool:
+    """4xx other than 408/425/429 will not change on retry; everything else may."""
+    return not (400 <= status_code < 500) or status_code in (408, 425, 429)
+
+
+def retry_delay(
+    attempt: int,
+    status_code: Optional[int] = None,
+    headers: Optional[Mapping[str, str]] = None,
+    max_delay: float = MAX_HOST_DELAY,
+) -> float:
+    """
+    Seconds to sleep before retry number attempt + 1.
+    Honours Retry-After / X-RateLimit-* when the response has them,
+    otherwise exponential back-off with up to 1s of jitter so workers
+    that failed together do not retry in lockstep.
+    """
+    wait = header_wait_seconds(status_code, headers) if status_code is not None and headers else None
+    if wait is None:
+        wait = 2 ** attempt + random.uniform(0, 1)
+    return min(wait, max_delay)
 
 
+class HostRateLimiter:
+    """
+    Per-host minimum spacing between requests (thread-safe, blocking).
+    
+    Each host has its own lock, so waiting on one domain never blocks
+    requests to another. Deadlines use time.monotonic().
+    """
+    
+    def __init__(self, default_delay: float = 1.0, max_delay: float = MAX_HOST_DELAY):
+        self.default_delay = default_delay
+        self.max_delay = max_delay
+        self._host_locks: Dict[str, Lock] = {}
+        self._next_ok: Dict[str, float] = {}
+        self._strikes: Dict[str, int] = {}
+        self._state_lock = Lock()
+    
+    def _host_lock(self, host: str) -> Lock:
+        lock = self._host_locks.get(host)
+        if lock is None:
+            with self._state_lock:
+                lock = self._host_locks.setdefault(host, Lock())
+        return lock
+    
+    def acquire(self, host: str, delay: Optional[float] = None) -> None:
+        """Block until a request to host is allowed, then reserve the next slot."""
+        if delay is None:
+            delay = self.default_delay
+        with self._host_lock(host):
+            while True:
+                # Re-read after sleeping: observe() may have pushed the deadline back
+                with self._state_lock:
+                    now = time.monotonic()
+                    wait = self._next_ok.get(host, 0.0) - now
+                    if wait <= 0:
+                        self._next_ok[host] = now + delay
+                        return
+                logger.debug("Rate-limiting: waiting %.1fs for %s", wait, host)
+                time.sleep(wait)
+    
+    def observe(self, host: str, status_code: int, headers: Mapping[str, str]) -> None:
+        """
+        Tighten the host's schedule from a response.
+        Honours Retry-After / X-RateLimit-* headers; 429/503 without a hint
+        back off exponentially, any other response resets the back-off.
+        """
+        wait = header_wait_seconds(status_code, headers)
+        with self._state_lock:
+            if status_code in (429, 503):
+                strikes = self._strikes.get(host, 0) + 1
+                self._strikes[host] = strikes
+                if wait is None:
+                    wait = self.default_delay * (2 ** strikes)
+            else:
+                self._strikes.pop(host, None)
+            if wait is None:
+                return
+            wait = min(wait, self.max_delay)
+            self._next_ok[host] = max(self._next_ok.get(host, 0.0), time.monotonic() + wait)
+        logger.debug("Host %s asked for %.1fs back-off (HTTP %d)", host, wait, status_code)
+
+
+# One limiter shared by every crawler request path, so concurrent workers
+# and modules all follow the same per-host schedule
+CRAWL_HOST_DELAY = float(os.getenv("CRAWL_HOST_DELAY", "1.0"))
+host_limiter = HostRateLimiter(CRAWL_HOST_DELAY)
+
+
+def wait_for_host(url: str) -> str:
+    """Block until host_limiter allows a request to url's host; returns the host for observe()."""
+    host = urlparse(url).netloc
+    host_limiter.acquire(host)
+    return host
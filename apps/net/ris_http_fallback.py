@@ -11,6 +11,9 @@ from requests.exceptions import SSLError, RequestException
 
 from apps.net.ssl_policy import is_http_fallback_allowed, record_http_fallback
 from apps.net.http_client import safe_get
+from apps.net.ratelimit import host_limiter, wait_for_host
+from apps.net.session import get_session
+from apps.parser.html_text import decode_body
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +53,7 @@ def ris_safe_get(
 ) -> Optional[requests.Response]:
     """
     Safe HTTP GET for RIS URLs with HTTP fallback when HTTPS fails due to SSL errors.
+    Every request waits for the shared per-host limiter (apps.net.ratelimit.host_limiter).
     
     Behavior:
     1. Try HTTPS with normal SSL verification
@@ -72,9 +76,10 @@ def ris_safe_get(
     """
     # Check if original URL was HTTPS
     parsed = urlparse(url)
+    host = wait_for_host(url)
     if parsed.scheme.lower() != "https":
         # Not HTTPS, just use safe_get normally
-        return safe_get(
+        resp = safe_get(
             url,
             session=session,
             timeout=timeout,
@@ -83,12 +88,14 @@ def ris_safe_get(
             verify=True,
             **kwargs
         )
+        if resp is not None:
+            host_limiter.observe(host, resp.status_code, resp.headers)
+        return resp
     
     # First attempt: HTTPS with normal SSL handling
-    sess = session if session is not None else requests.Session()
-    if headers:
-        sess.headers.update(headers)
+    sess = session if session is not None else get_session()
     
+    # Headers are passed per request so a shared session is never mutated
     ssl_error_occurred = False
     
     try:
@@ -97,8 +104,10 @@ def ris_safe_get(
             timeout=timeout,
             allow_redirects=allow_redirects,
             verify=True,  # Normal SSL verification
+            headers=headers,
             **kwargs
         )
+        host_limiter.observe(host, resp.status_code, resp.headers)
         if resp.status_code == 200:
             return resp
         else:
@@ -140,19 +149,22 @@ def ris_safe_get(
     
     try:
         # Try HTTP (no SSL verification needed)
+        host_limiter.acquire(host)
         http_resp = sess.get(
             http_url,
             timeout=timeout,
             allow_redirects=allow_redirects,
             verify=False,  # HTTP doesn't need SSL verification
+            headers=headers,
             **kwargs
         )
+        host_limiter.observe(host, http_resp.status_code, http_resp.headers)
         
         # Only accept if:
         # 1. Status is 200
         # 2. Content looks like a RIS page
         if http_resp.status_code == 200:
-            if is_ris_page(http_resp.text):
+            if is_ris_page(decode_body(http_resp)):
                 record_http_fallback(url, http_url)
                 return http_resp
             else:
@@ -176,3 +188,36 @@ def ris_safe_get(
         logger.error("Unexpected error in HTTP fallback for %s: %s", http_url, e)
         return None
 
+
+def ris_safe_head(
+    url: str,
+    session: Optional[requests.Session] = None,
+    timeout: int = 10,
+    allow_redirects: bool = True,
+    headers: Optional[dict] = None,
+) -> Optional[requests.Response]:
+    """
+    HEAD request for cheap reachability checks on RIS candidate URLs.
+    
+    No HTTP fallback: a HEAD has no body to confirm a RIS page, so on SSL
+    or connection errors this returns None and callers should fall back to
+    ris_safe_get.
+    
+    Returns:
+        Response object (any status) if the request completed, None if failed
+    """
+    sess = session if session is not None else get_session()
+    host = wait_for_host(url)
+    try:
+        resp = sess.head(
+            url,
+            timeout=timeout,
+            allow_redirects=allow_redirects,
+            headers=headers,
+            verify=True,
+        )
+        host_limiter.observe(host, resp.status_code, resp.headers)
+        return resp
+    except RequestException as e:
+        logger.debug("HEAD failed for RIS URL %s: %s", url, e)
+        return None
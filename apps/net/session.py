@@ -0,0 +1,63 @@
+"""
+Shared HTTP session with a pooled, keep-alive connection adapter.
+Reusing one session across crawler entry points avoids a fresh TCP+TLS
+handshake per call.
+"""
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = "BESS-Forensic-Crawler/1.0 (Research/Transparency; +https://github.com/bess-crawler)"
+
+POOL_CONNECTIONS = 32  # Number of per-host pools kept
+POOL_MAXSIZE = 64  # Connections kept alive per host pool
+
+_session: Optional[requests.Session] = None
+_download_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def build_session(
+    pool_connections: int = POOL_CONNECTIONS,
+    pool_maxsize: int = POOL_MAXSIZE,
+    retries: int = 3,
+    backoff_factor: float = 0.5,
+) -> requests.Session:
+    """Create a session with the crawler User-Agent and a pooled adapter for http/https."""
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(total=retries, backoff_factor=backoff_factor),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide shared session (built lazily)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def get_download_session() -> requests.Session:
+    """
+    Shared session without adapter-level retries, for the downloaders that
+    run their own retry loop (back-off, Retry-After, rate limiter); stacking
+    both would retry each failure up to (retries + 1) x max_retries times.
+    """
+    global _download_session
+    if _download_session is None:
+        with _session_lock:
+            if _download_session is None:
+                _download_session = build_session(retries=0)
+    return _download_session
@@ -0,0 +1,130 @@
+"""
+Cache of already-verified URL probe results (URL -> HTTP status).
+In-process LRU in front of an optional sqlite table, so repeated discovery
+sweeps skip GETs for paths that were checked recently. Only definitive
+answers (200/404/410) are kept for long; rate limits, auth errors and
+outages expire after a few minutes so they cannot hide a page.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+VERIFIED_CACHE_MAXSIZE = 10000
+VERIFIED_CACHE_MAX_AGE_S = 7 * 24 * 3600  # Re-check a URL after a week
+VERIFIED_CACHE_ERROR_MAX_AGE_S = 10 * 60  # Re-check other statuses after 10 minutes
+DEFINITIVE_STATUSES = frozenset({200, 404, 410})
+VERIFIED_CACHE_FILENAME = "verified_urls.sqlite"
+
+_cache: Optional["VerifiedURLCache"] = None
+_cache_lock = threading.Lock()
+
+
+class VerifiedURLCache:
+    """
+    Thread-safe URL -> status cache.
+
+    Args:
+        db_path: sqlite file for persistence across runs (None = memory only)
+        maxsize: Entries kept in the in-process LRU
+        max_age_seconds: Definitive entries (DEFINITIVE_STATUSES) older than this are treated as missing
+        error_max_age_seconds: Same for every other status (429, 403, 5xx, ...)
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        maxsize: int = VERIFIED_CACHE_MAXSIZE,
+        max_age_seconds: int = VERIFIED_CACHE_MAX_AGE_S,
+        error_max_age_seconds: int = VERIFIED_CACHE_ERROR_MAX_AGE_S,
+    ):
+        self.maxsize = maxsize
+        self.max_age_seconds = max_age_seconds
+        self.error_max_age_seconds = error_max_age_seconds
+        self._lru: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            try:
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS verified_urls ("
+                    "url TEXT PRIMARY KEY, status INTEGER NOT NULL, checked_at REAL NOT NULL)"
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning("Verified URL cache at %s unavailable, using memory only: %s", db_path, e)
+                self._db = None
+
+    def get(self, url: str) -> Optional[int]:
+        """Cached status for url, or None if unknown or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._lru.get(url)
+            if entry is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT status, checked_at FROM verified_urls WHERE url = ?", (url,)
+                ).fetchone()
+                if row is not None:
+                    entry = row
+                    self._remember(url, entry)
+            if entry is None:
+                return None
+            status, checked_at = entry
+            if now - checked_at > self._max_age(status):
+                self._lru.pop(url, None)
+                return None
+            self._lru.move_to_end(url)
+            return status
+
+    def put(self, url: str, status: int) -> None:
+        """Record a probe result."""
+        entry = (status, time.time())
+        with self._lock:
+            self._remember(url, entry)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO verified_urls (url, status, checked_at) VALUES (?, ?, ?)",
+                        (url, *entry),
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.debug("Could not persist verified URL %s: %s", url, e)
+
+    def _max_age(self, status: int) -> int:
+        if status in DEFINITIVE_STATUSES:
+            return self.max_age_seconds
+        return self.error_max_age_seconds
+
+    def _remember(self, url: str, entry: tuple) -> None:
+        self._lru[url] = entry
+        self._lru.move_to_end(url)
+        while len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
+
+
+def get_verified_cache() -> VerifiedURLCache:
+    """
+    Process-wide cache, persisted under CRAWL_CACHE_BASE when that directory
+    is writable (memory only otherwise).
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                db_path = None
+                cache_base = Path(os.getenv("CRAWL_CACHE_BASE", "/data/cache"))
+                try:
+                    cache_base.mkdir(parents=True, exist_ok=True)
+                    db_path = str(cache_base / VERIFIED_CACHE_FILENAME)
+                except OSError:
+                    logger.debug("Cache dir %s not writable, verified URL cache is memory only", cache_base)
+                _cache = VerifiedURLCache(db_path)
+    return _cache
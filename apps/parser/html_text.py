@@ -1,17 +1,162 @@
 """
 HTML text extraction placeholder.
 """
-from bs4 import BeautifulSoup
-from typing import Optional
+from bs4 import BeautifulSoup, SoupStrainer
+from functools import lru_cache
+from typing import Callable, Iterator, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
 
+try:
+    import lxml.html
+    from lxml import etree
+    HTML_PARSER = "lxml"
+except ImportError:  # lxml optional, fall back to the pure-Python parser
+    lxml = None
+    HTML_PARSER = "html.parser"
 
-def extract_text(html: str) -> Optional[str]:
-    soup = BeautifulSoup(html, "html.parser")
-    return soup.get_text(separator="\n")
+try:
+    from selectolax.parser import HTMLParser as SelectolaxParser
+except ImportError:  # selectolax optional, anchors then come from a strained soup
+    SelectolaxParser = None
+
+# <a href> pointing at .pdf/.doc/.docx (query string or fragment allowed), evaluated in libxml2
+_DOC_LINK_XPATH = etree.XPath(
+    r"//a[@href][re:test(@href, '\.(pdf|docx?)([?#]|$)', 'i')]",
+    namespaces={"re": "http://exslt.org/regular-expressions"},
+) if lxml is not None else None
+
+# Only <a href> tags are built into the soup; everything else is skipped while parsing
+LINK_STRAINER = SoupStrainer("a", href=True)
+
+DOC_EXTS = frozenset({".pdf", ".doc", ".docx"})
+PDF_EXTS = frozenset({".pdf"})
+_MAX_EXT_LEN = 5
+
+
+def has_doc_suffix(href: str, exts: frozenset = DOC_EXTS) -> bool:
+    """
+    href ends in one of exts, case-insensitive (same as
+    href.lower().endswith(...)). Only the short suffix is lowercased,
+    not the whole URL.
+    """
+    i = href.rfind(".")
+    return i != -1 and len(href) - i <= _MAX_EXT_LEN and href[i:].lower() in exts
+
+
+def _declared_encoding(resp) -> Optional[str]:
+    """Charset from the Content-Type header, if the server declared one."""
+    content_type = (resp.headers or {}).get("Content-Type", "")
+    if "charset=" in content_type.lower():
+        return resp.encoding
+    return None
+
+
+def decode_body(resp) -> str:
+    """
+    Response body as text without requests' charset guessing.
+    Uses the header charset when declared, UTF-8 otherwise; undecodable
+    bytes are replaced instead of triggering chardet.
+    """
+    encoding = _declared_encoding(resp) or "utf-8"
+    try:
+        return (resp.content or b"").decode(encoding, errors="replace")
+    except LookupError:
+        return (resp.content or b"").decode("utf-8", errors="replace")
 
 
+def make_soup(resp, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """
+    Parse a requests response with the fastest available parser.
+    Feeds raw bytes so the parser detects the encoding itself; a declared
+    UTF-8 charset is passed through to skip charset sniffing.
+    Pass parse_only (e.g. LINK_STRAINER) to build only the tags needed.
+    """
+    encoding = (resp.encoding or "").lower()
+    from_encoding = "utf-8" if encoding in ("utf-8", "utf8") else None
+    return BeautifulSoup(resp.content, HTML_PARSER, from_encoding=from_encoding, parse_only=parse_only)
 
 
+def iter_anchors(resp) -> Iterator[Tuple[str, str]]:
+    """
+    (href, stripped link text) for every <a href> of a response.
+    Uses selectolax (C parser, no per-node Python objects) when installed,
+    otherwise a soup built with LINK_STRAINER.
+    """
+    if SelectolaxParser is not None:
+        for node in SelectolaxParser(resp.content or b"").css("a[href]"):
+            yield node.attributes.get("href") or "", node.text(strip=True)
+        return
+    for anchor in make_soup(resp, parse_only=LINK_STRAINER).find_all("a", href=True):
+        yield anchor["href"], anchor.get_text(strip=True)
 
 
+@lru_cache(maxsize=16)
+def _lxml_parser(encoding: Optional[str]):
+    return lxml.html.HTMLParser(encoding=encoding)
 
+
+def parse_html(resp):
+    """
+    Parse a requests response straight into an lxml.html tree (no soup wrapping).
+    Uses the header charset when declared, otherwise lets libxml2 read
+    <meta charset>. Requires lxml.
+    """
+    if lxml is None:
+        raise ImportError("lxml not installed")
+    content = resp.content or b""
+    try:
+        return lxml.html.fromstring(content, parser=_lxml_parser(_declared_encoding(resp)))
+    except (etree.ParserError, ValueError):
+        # Empty or non-HTML body
+        return lxml.html.fromstring("<html></html>")
+
+
+def iterparse_response(resp, events=("end",), chunk_size: int = 32768):
+    """
+    Incrementally parse a streamed response (stream=True) with lxml's
+    HTMLPullParser, yielding (event, element) as the body arrives.
+    Callers may clear() processed elements to keep memory bounded.
+    """
+    if lxml is None:
+        raise ImportError("lxml not installed")
+    parser = etree.HTMLPullParser(events=events, encoding=_declared_encoding(resp))
+    for chunk in resp.iter_content(chunk_size):
+        parser.feed(chunk)
+        yield from parser.read_events()
+    try:
+        parser.close()
+    except etree.XMLSyntaxError:
+        # Empty body
+        return
+    yield from parser.read_events()
+
+
+def document_links(root) -> list:
+    """All <a> elements of a parsed page that link to PDF/Word documents."""
+    return _DOC_LINK_XPATH(root)
+
+
+def href_resolver(base_url: str) -> Callable[[str], str]:
+    """
+    Build a urljoin(base_url, href) replacement for one page's anchors.
+    The base is split once; plain absolute and root-relative hrefs are
+    resolved by string ops, anything else falls back to urljoin.
+    """
+    base = urlsplit(base_url)
+    origin = f"{base.scheme}://{base.netloc}"
+    
+    def resolve(href: str) -> str:
+        if "/." in href or "\\" in href or any(c in href for c in "\t\r\n"):
+            return urljoin(base_url, href)
+        if href.startswith(("http://", "https://")):
+            return href
+        if href.startswith("/") and not href.startswith("//"):
+            return origin + href
+        return urljoin(base_url, href)
+    
+    return resolve
+
+
+def extract_text(html: str) -> Optional[str]:
+    soup = BeautifulSoup(html, HTML_PARSER)
+    return soup.get_text(separator="\n")
@@ -3,13 +3,17 @@ Normalization helpers for titles and text.
 """
 import re
 import unicodedata
+from functools import lru_cache
 
+_NON_TITLE_CHARS_RE = re.compile(r"[^a-z0-9äöüß ]+")
 
+
+@lru_cache(maxsize=131072)
 def normalize_title(title: str) -> str:
     text = unicodedata.normalize("NFKD", title).lower()
-    text = re.sub(r"[^a-z0-9äöüß ]+", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+    text = _NON_TITLE_CHARS_RE.sub(" ", text)
+    # Only spaces are left, so split/join collapses runs and strips
+    return " ".join(text.split())
 
 
 
@@ -0,0 +1,71 @@
+"""
+Multi-keyword matching in a single pass over the text.
+Uses an Aho-Corasick automaton (pyahocorasick) when installed, otherwise a
+compiled regex alternation (RE2 DFA via pyre2 if available, else stdlib re).
+"""
+import re
+from typing import Iterable, Iterator, Set, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick optional
+    ahocorasick = None
+
+try:
+    import re2
+except ImportError:  # pyre2 optional
+    re2 = None
+
+
+class KeywordMatcher:
+    """
+    Precompiled set of literal keywords.
+    Build once at module import and reuse; matching is case-sensitive, so
+    callers pass lowercased text and lowercase keywords.
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms: Tuple[str, ...] = tuple(dict.fromkeys(t for t in terms if t))
+        self._automaton = None
+        self._regex = None
+        if not self.terms:
+            return
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for term in self.terms:
+                automaton.add_word(term, term)
+            automaton.make_automaton()
+            self._automaton = automaton
+        else:
+            # Longest first so the alternation prefers the most specific term
+            ordered = sorted(self.terms, key=len, reverse=True)
+            pattern = "|".join(re.escape(t) for t in ordered)
+            self._regex = (re2 or re).compile(pattern)
+
+    def contains_any(self, text: str) -> bool:
+        """True if any keyword occurs in text (stops at the first hit)."""
+        if not text:
+            return False
+        if self._automaton is not None:
+            return next(self._automaton.iter(text), None) is not None
+        if self._regex is not None:
+            return self._regex.search(text) is not None
+        return False
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """Yield (start_index, term) for every occurrence, overlaps included."""
+        if not text:
+            return
+        if self._automaton is not None:
+            for end, term in self._automaton.iter(text):
+                yield end - len(term) + 1, term
+            return
+        for term in self.terms:
+            idx = text.find(term)
+            while idx != -1:
+                yield idx, term
+                idx = text.find(term, idx + 1)
+
+    def matched_terms(self, text: str) -> Set[str]:
+        """Set of distinct keywords present in text."""
+        return {term for _, term in self.iter_matches(text)}
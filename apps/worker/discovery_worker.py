@@ -17,6 +17,7 @@ from apps.crawlers.discovery.municipal_website import (
     discover_municipal_sections,
     crawl_municipal_section,
 )
+from apps.net.session import build_session
 from apps.extract.prefilter import prefilter_score, should_extract
 from apps.db.dao_candidates import insert_candidate, update_candidate_status
 from apps.db.dao_stats import insert_crawl_stats
@@ -90,8 +91,7 @@ def process_discovery_job(payload: dict, run_id: str) -> None:
                 base_url = entrypoint if entrypoint and entrypoint.strip() else None
                 
                 # Create session with official_website_url for discovery
-                import requests
-                discovery_session = requests.Session()
+                discovery_session = build_session()
                 if official_website_url:
                     discovery_session.official_website_url = official_website_url
                 
@@ -170,8 +170,7 @@ def process_discovery_job(payload: dict, run_id: str) -> None:
                 feed_url = entrypoint if entrypoint and entrypoint.strip() else ""
                 
                 # Create session with official_website_url for discovery
-                import requests
-                discovery_session = requests.Session()
+                discovery_session = build_session()
                 if official_website_url:
                     discovery_session.official_website_url = official_website_url
                 
@@ -12,7 +12,7 @@ from urllib.parse import urlparse
 
 from apps.db.dao_candidates import get_candidates_for_extraction, update_candidate_status
 from apps.db.dao_stats import insert_crawl_stats
-from apps.db.dao_batch import upsert_procedures_batch, insert_sources_batch
+from apps.db.dao_batch import bulk_ingest_session, upsert_procedures_batch, insert_sources_batch
 from apps.db.dao import with_connection, insert_document
 from apps.downloader.fetch_cached import download_cached, head_cached
 from apps.parser.pdf_text import extract_progressive
@@ -26,11 +26,20 @@ from apps.extract.entities_company import find_companies
 from apps.extract.location import extract_location
 from apps.downloader.storage import save_bytes_fs
 from apps.downloader.fetch import sha256_bytes
+from apps.net.probe import probe_urls
 from apps.worker.project_linking import link_procedure_to_project_entity
 from apps.orchestrator.config import settings
 
 logger = logging.getLogger(__name__)
 
+# PDFs per candidate and how many of them download at once; per-domain
+# politeness still comes from the rate-limit semaphores in download_cached
+MAX_PDFS_PER_CANDIDATE = 5
+PDF_FETCH_CONCURRENCY = 5
+
+# fetch_pdf result for PDFs skipped by the size check
+_SKIPPED = object()
+
 
 def process_extraction_job(payload: dict, run_id: str) -> None:
     """
@@ -138,34 +147,41 @@ def process_extraction_job(payload: dict, run_id: str) -> None:
         cache_base = Path(settings.crawl_cache_base)
         text_cache_base = Path(settings.crawl_text_cache_base)
         
-        pdf_download_time = 0
         pdf_extract_time = 0
         
-        for doc_url in (doc_urls or [])[:5]:  # Limit to 5 PDFs per candidate
+        def fetch_pdf(doc_url):
+            # HEAD request to check size
+            headers = head_cached(doc_url, mode=mode)
+            if headers:
+                content_length = headers.get("Content-Length")
+                if content_length:
+                    size_mb = int(content_length) / (1024 * 1024)
+                    if size_mb > settings.crawl_pdf_max_size_mb and mode == "fast" and candidate["prefilter_score"] < 0.8:
+                        logger.debug("Skipping large PDF %s (%.1f MB) in fast mode", doc_url, size_mb)
+                        return _SKIPPED
+            pdf_result = download_cached(doc_url, mode=mode, use_cache=True)
+            if not pdf_result:
+                return None
+            # Hash on the fetch thread, overlapping the other downloads
+            pdf_content, _ = pdf_result
+            return pdf_content, sha256_bytes(pdf_content)
+        
+        # Download PDFs concurrently (results in link order)
+        t0 = time.time()
+        pdf_results = list(probe_urls((doc_urls or [])[:MAX_PDFS_PER_CANDIDATE], fetch_pdf, max_workers=PDF_FETCH_CONCURRENCY))
+        pdf_download_time = (time.time() - t0) * 1000
+        
+        for doc_url, pdf_result, error in pdf_results:
             try:
-                # HEAD request to check size
-                t0 = time.time()
-                headers = head_cached(doc_url, mode=mode)
-                head_time = (time.time() - t0) * 1000
-                
-                if headers:
-                    content_length = headers.get("Content-Length")
-                    if content_length:
-                        size_mb = int(content_length) / (1024 * 1024)
-                        if size_mb > settings.crawl_pdf_max_size_mb and mode == "fast" and candidate["prefilter_score"] < 0.8:
-                            logger.debug("Skipping large PDF %s (%.1f MB) in fast mode", doc_url, size_mb)
-                            counts["pdfs_skipped"] += 1
-                            continue
-                
-                # Download PDF
-                t0 = time.time()
-                pdf_result = download_cached(doc_url, mode=mode, use_cache=True)
-                pdf_download_time += (time.time() - t0) * 1000
-                
+                if error is not None:
+                    raise error
+                if pdf_result is _SKIPPED:
+                    counts["pdfs_skipped"] += 1
+                    continue
                 if not pdf_result:
                     continue
                 
-                pdf_content, _ = pdf_result
+                pdf_content, sha = pdf_result
                 counts["pdfs_downloaded"] += 1
                 
                 # Progressive extraction
@@ -183,7 +199,6 @@ def process_extraction_job(payload: dict, run_id: str) -> None:
                     all_text += " " + pdf_text
                 
                 # Save PDF
-                sha = sha256_bytes(pdf_content)
                 rel_path = f"docs/{sha[:2]}/{sha}.bin"
                 save_bytes_fs(base_path=storage_base, relative_path=rel_path, data=pdf_content)
                 
@@ -289,33 +304,36 @@ def process_extraction_job(payload: dict, run_id: str) -> None:
         def save_procedure(cur):
             # For now, use single insert (batch would need accumulator)
             from apps.db.dao import upsert_procedure, insert_source
-            upsert_procedure(cur, proc_norm)
-            
-            source_id = str(uuid.uuid4())
-            insert_source(cur, {
-                "source_id": source_id,
-                "procedure_id": proc_norm["procedure_id"],
-                "source_system": source,
-                "source_url": url,
-                "http_status": 200,
-                "discovery_source": candidate.get("discovery_source"),
-                "discovery_path": candidate.get("discovery_path"),
-            })
-            
-            # Save documents
-            for doc in docs:
-                doc_id = str(uuid.uuid4())
-                insert_document(cur, {
-                    "document_id": doc_id,
+            # Writes need no results: pipeline them into one round-trip;
+            # results are re-crawlable, so the commit skips the WAL flush wait
+            with bulk_ingest_session(cur), cur.connection.pipeline():
+                upsert_procedure(cur, proc_norm)
+                
+                source_id = str(uuid.uuid4())
+                insert_source(cur, {
                     "source_id": source_id,
-                    "doc_url": doc["doc_url"],
-                    "doc_type": "pdf",
-                    "sha256": doc["sha256"],
-                    "file_path": doc["file_path"],
-                    "text_extracted": doc["text_extracted"],
-                    "ocr_used": False,
-                    "page_map": None,
+                    "procedure_id": proc_norm["procedure_id"],
+                    "source_system": source,
+                    "source_url": url,
+                    "http_status": 200,
+                    "discovery_source": candidate.get("discovery_source"),
+                    "discovery_path": candidate.get("discovery_path"),
                 })
+                
+                # Save documents
+                for doc in docs:
+                    doc_id = str(uuid.uuid4())
+                    insert_document(cur, {
+                        "document_id": doc_id,
+                        "source_id": source_id,
+                        "doc_url": doc["doc_url"],
+                        "doc_type": "pdf",
+                        "sha256": doc["sha256"],
+                        "file_path": doc["file_path"],
+                        "text_extracted": doc["text_extracted"],
+                        "ocr_used": False,
+                        "page_map": None,
+                    })
             
             # Link to project
             try:
@@ -57,6 +57,12 @@ def migrate():
                     ON crawl_candidates(prefilter_score);
                 """)
                 
+                # Keyset pagination in get_candidates_for_extraction
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_candidates_extraction 
+                    ON crawl_candidates(run_id, status, prefilter_score DESC, candidate_id DESC);
+                """)
+                
                 cur.execute("""
                     CREATE INDEX IF NOT EXISTS idx_candidates_municipality 
                     ON crawl_candidates(municipality_key, discovery_source);
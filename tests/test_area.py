@@ -0,0 +1,11 @@
+from apps.extract.area import extract_area, find_largest_area
+
+
+def test_extract_area_units():
+    areas = extract_area("Fläche 2,5 ha, Baufeld 5000 qm, Gebiet 3 km², 4 Hektar")
+    assert areas == [(2.5, "ha"), (0.5, "qm"), (300, "km²"), (4.0, "hektar")]
+
+
+def test_find_largest_area():
+    assert find_largest_area("1,5 ha und 20000 m²") == 2.0
+    assert find_largest_area("keine Flächenangabe") is None
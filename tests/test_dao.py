@@ -0,0 +1,27 @@
+from unittest import mock
+
+import psycopg
+
+from apps.db.dao import insert_extractions
+
+
+def _cursor():
+    # Spec'd on psycopg.Cursor: attributes a real cursor lacks raise AttributeError
+    return mock.create_autospec(psycopg.Cursor, instance=True)
+
+
+def test_insert_extractions_batches_on_cursor():
+    cur = _cursor()
+    rows = [
+        {"extraction_id": "e1", "document_id": "d1", "field": "capacity_mw", "value": "10", "method": "regex", "evidence": None},
+        {"extraction_id": "e2", "document_id": "d1", "field": "area_hectares", "value": "2", "method": "regex", "evidence": None},
+    ]
+    insert_extractions(cur, rows)
+    cur.executemany.assert_called_once()
+    assert cur.executemany.call_args.args[1] == rows
+
+
+def test_insert_extractions_skips_empty():
+    cur = _cursor()
+    insert_extractions(cur, [])
+    cur.executemany.assert_not_called()
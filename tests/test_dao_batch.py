@@ -0,0 +1,41 @@
+from unittest import mock
+
+import psycopg
+
+from apps.db.dao_batch import PROCEDURE_COLUMNS, upsert_procedures_batch
+
+
+def _cursor():
+    # Spec'd on psycopg.Cursor: attributes a real cursor lacks raise AttributeError
+    cur = mock.create_autospec(psycopg.Cursor, instance=True)
+    copy = mock.MagicMock()
+    cur.copy.return_value.__enter__.return_value = copy
+    return cur, copy
+
+
+def test_upsert_procedures_batch_copies_into_stage():
+    cur, copy = _cursor()
+    rows = [
+        {"procedure_id": "p1", "title_raw": "BESS Nord", "geometry": {"type": "Point", "coordinates": [1, 2]}},
+        {"procedure_id": "p2", "title_raw": "BESS Süd", "project_components": ["bess", "pv"]},
+    ]
+    upsert_procedures_batch(cur, rows)
+
+    cur.copy.assert_called_once()
+    written = [call.args[0] for call in copy.write_row.call_args_list]
+    assert len(written) == 2
+    first = dict(zip(PROCEDURE_COLUMNS, written[0]))
+    second = dict(zip(PROCEDURE_COLUMNS, written[1]))
+    assert first["procedure_id"] == "p1"
+    assert first["ambiguity_flag"] is False
+    assert first["geometry"].replace(" ", "") == '{"type":"Point","coordinates":[1,2]}'
+    assert second["project_components"].replace(" ", "") == '["bess","pv"]'
+    # Merge into procedures is one statement after the COPY
+    assert "ON CONFLICT (procedure_id)" in cur.execute.call_args.args[0].as_string(None)
+
+
+def test_upsert_procedures_batch_skips_empty():
+    cur, _ = _cursor()
+    upsert_procedures_batch(cur, [])
+    cur.execute.assert_not_called()
+    cur.copy.assert_not_called()
@@ -0,0 +1,25 @@
+from decimal import Decimal
+from unittest import mock
+
+from apps.db.dao_candidates import get_candidates_for_extraction
+
+
+def _executed(after):
+    cur = mock.MagicMock()
+    dict_cur = cur.connection.cursor.return_value.__enter__.return_value
+    dict_cur.fetchall.return_value = []
+    get_candidates_for_extraction(cur, "run-1", limit=10, after=after)
+    return dict_cur.execute.call_args.args
+
+
+def test_first_page_has_no_keyset_predicate():
+    query, params = _executed(None)
+    assert "(prefilter_score, candidate_id) <" not in query
+    assert "after_score" not in params
+
+
+def test_next_page_keeps_numeric_boundary():
+    query, params = _executed((Decimal("0.7500"), "5f0c6a4e-0000-0000-0000-000000000001"))
+    assert "(prefilter_score, candidate_id) < (%(after_score)s::numeric" in query
+    assert params["after_score"] == Decimal("0.7500")
+    assert "IS NULL" not in query
@@ -0,0 +1,36 @@
+from unittest import mock
+
+from apps.crawlers.discovery import cache as discovery_cache
+from apps.crawlers.discovery.cache import cached_discovery
+
+
+def _counting_discover(result):
+    calls = []
+
+    def discover(municipality_name, base_url=None, official_website_url=None):
+        calls.append(municipality_name)
+        return result, {"reason_code": "FOUND" if result else "SSL_BLOCKED"}
+
+    return discover, calls
+
+
+def test_found_result_is_memoized():
+    discover, calls = _counting_discover("https://ris.example.de")
+    cached = cached_discovery(discover)
+    assert cached("Musterstadt")[0] == "https://ris.example.de"
+    url, diagnostics = cached("Musterstadt")
+    assert url == "https://ris.example.de" and diagnostics["reason_code"] == "FOUND"
+    assert len(calls) == 1
+
+
+def test_miss_expires_after_negative_ttl():
+    discover, calls = _counting_discover(None)
+    cached = cached_discovery(discover)
+    with mock.patch.object(discovery_cache.time, "monotonic", return_value=1000.0):
+        cached("Musterstadt")
+        cached("Musterstadt")
+    assert len(calls) == 1
+    later = 1000.0 + discovery_cache.DISCOVERY_NEGATIVE_TTL_S + 1
+    with mock.patch.object(discovery_cache.time, "monotonic", return_value=later):
+        assert cached("Musterstadt") == (None, {"reason_code": "SSL_BLOCKED"})
+    assert len(calls) == 2
@@ -0,0 +1,87 @@
+import io
+import json
+from types import SimpleNamespace
+from unittest import mock
+
+from apps.crawlers.xplanung_wfs import harvest
+from apps.crawlers.xplanung_wfs.harvest import _iter_xml_features
+
+GML = b"""<?xml version="1.0"?>
+<wfs:FeatureCollection xmlns:wfs="http://www.opengis.net/wfs/2.0" xmlns:xplan="http://www.xplanung.de/xplangml/6/0">
+  <wfs:member>
+    <xplan:BP_Plan>
+      <!-- c -->
+      <xplan:name>B-Plan Speicher</xplan:name>
+      <?note keep?>
+      <xplan:gemeinde>Musterstadt</xplan:gemeinde>
+    </xplan:BP_Plan>
+  </wfs:member>
+  <wfs:member>
+    <xplan:BP_Plan><xplan:name>B-Plan Zwei</xplan:name></xplan:BP_Plan>
+  </wfs:member>
+</wfs:FeatureCollection>
+"""
+
+
+def _response(body):
+    raw = io.BufferedReader(io.BytesIO(body))
+    return SimpleNamespace(raw=SimpleNamespace(read=raw.read, decode_content=False))
+
+
+def test_xml_features_skip_comments_and_pis():
+    features = list(_iter_xml_features(_response(GML)))
+    assert [f["name"] for f in features] == ["B-Plan Speicher", "B-Plan Zwei"]
+    assert features[0]["gemeinde"] == "Musterstadt"
+
+
+class _GetFeatureResponse:
+    def __init__(self, content_type, body):
+        self.status_code = 200
+        self.headers = {"Content-Type": content_type}
+        self.content = body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def json(self):
+        return json.loads(self.content)
+
+
+GEOJSON = json.dumps({"features": [{"name": "B-Plan Speicher", "gemeinde": "Musterstadt"}]}).encode()
+
+
+def _harvest(responses, flatgeobuf_features):
+    session = mock.Mock()
+    session.get.side_effect = responses
+    with mock.patch.object(harvest, "fiona", object()), \
+            mock.patch.object(harvest, "ijson", None), \
+            mock.patch.object(harvest, "get_output_formats", return_value=frozenset({harvest.FLATGEOBUF_FORMAT})), \
+            mock.patch.object(harvest, "get_session", return_value=session), \
+            mock.patch.object(harvest, "_iter_flatgeobuf_features", side_effect=flatgeobuf_features):
+        features = harvest.harvest_layer("https://wfs.example.de/wfs", "xplan:BP_Plan", max_features=1)
+    formats = [call.kwargs["params"]["outputFormat"] for call in session.get.call_args_list]
+    return features, formats
+
+
+def test_flatgeobuf_request_answered_with_geojson():
+    features, formats = _harvest([_GetFeatureResponse("application/json", GEOJSON)], AssertionError)
+    assert [f["name"] for f in features] == ["B-Plan Speicher"]
+    assert formats == [harvest.FLATGEOBUF_FORMAT]
+
+
+def test_undecodable_flatgeobuf_retried_as_geojson():
+    def broken(resp):
+        raise RuntimeError("not a FlatGeobuf file")
+        yield
+
+    responses = [
+        _GetFeatureResponse("application/octet-stream", harvest.FLATGEOBUF_MAGIC + b"\x03fgb\x00"),
+        _GetFeatureResponse("application/json", GEOJSON),
+    ]
+    features, formats = _harvest(responses, broken)
+    assert [f["name"] for f in features] == ["B-Plan Speicher"]
+    assert features[0]["raw"] is not None
+    assert formats == [harvest.FLATGEOBUF_FORMAT, harvest.GEOJSON_FORMAT]
@@ -0,0 +1,43 @@
+from urllib.parse import urljoin
+
+import pytest
+
+from apps.parser.html_text import has_doc_suffix, href_resolver, iter_anchors
+
+BASE = "https://www.example.de/rathaus/bauen/index.html?lang=de"
+
+
+@pytest.mark.parametrize("href", [
+    "/bekanntmachungen",
+    "/bekanntmachungen?jahr=2024#top",
+    "https://amtsblatt.example.de/ausgabe-12.pdf",
+    "//cdn.example.de/plan.pdf",
+    "plan.pdf",
+    "../satzungen/",
+    "/rathaus/./bauen",
+    "?seite=2",
+    "#inhalt",
+    "",
+    "mailto:bauamt@example.de",
+    "/pfad\nmit-umbruch",
+])
+def test_href_resolver_matches_urljoin(href):
+    assert href_resolver(BASE)(href) == urljoin(BASE, href)
+
+
+@pytest.mark.parametrize("href", [
+    "a.pdf", "A.PDF", "/x/plan.Docx", "plan.doc", "plan.pdf?x=1", "plan.docxz",
+    "plan.pdf.html", "no-extension", "", ".pdf", "dir.pdf/file",
+])
+def test_has_doc_suffix_matches_endswith(href):
+    expected = href.lower().endswith((".pdf", ".doc", ".docx"))
+    assert has_doc_suffix(href) is expected
+
+
+def test_iter_anchors_yields_href_and_text():
+    class Resp:
+        content = b'<p><a href="/a"> Sitzung <b>1</b> </a><a>no href</a><a href="b.pdf">Plan</a></p>'
+        encoding = "utf-8"
+        headers = {}
+
+    assert list(iter_anchors(Resp())) == [("/a", "Sitzung1"), ("b.pdf", "Plan")]
@@ -0,0 +1,37 @@
+import pytest
+
+from apps.utils import keywords
+from apps.utils.keywords import KeywordMatcher
+
+
+@pytest.fixture(params=["automaton", "regex"])
+def matcher_factory(request, monkeypatch):
+    if request.param == "regex":
+        monkeypatch.setattr(keywords, "ahocorasick", None)
+    elif keywords.ahocorasick is None:
+        pytest.skip("pyahocorasick not installed")
+    return KeywordMatcher
+
+
+def test_contains_any(matcher_factory):
+    matcher = matcher_factory(["bebauungsplan", "§ 36", "speicher"])
+    assert matcher.contains_any("aufstellung eines bebauungsplanes")
+    assert matcher.contains_any("einvernehmen nach § 36 baugb")
+    assert not matcher.contains_any("sitzung des hauptausschusses")
+    assert not matcher.contains_any("")
+
+
+def test_matched_terms_includes_overlaps(matcher_factory):
+    matcher = matcher_factory(["batteriespeicher", "speicher", "netz"])
+    assert matcher.matched_terms("batteriespeicher am netz") == {"batteriespeicher", "speicher", "netz"}
+
+
+def test_iter_matches_positions(matcher_factory):
+    matcher = matcher_factory(["speicher"])
+    assert sorted(matcher.iter_matches("speicher und speicher")) == [(0, "speicher"), (13, "speicher")]
+
+
+def test_empty_matcher():
+    matcher = KeywordMatcher([])
+    assert not matcher.contains_any("anything")
+    assert matcher.matched_terms("anything") == set()
@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from apps.crawlers.discovery import municipal_website
+from apps.net.verified_urls import VerifiedURLCache
+
+
+class _Session:
+    def __init__(self, head_status, get_status):
+        self.head_status, self.get_status = head_status, get_status
+        self.calls = []
+
+    def head(self, url, **kwargs):
+        self.calls.append("HEAD")
+        return SimpleNamespace(status_code=self.head_status, headers={})
+
+    def get(self, url, **kwargs):
+        self.calls.append("GET")
+        return SimpleNamespace(status_code=self.get_status, headers={}, close=lambda: None)
+
+
+def _status(head_status, get_status):
+    session = _Session(head_status, get_status)
+    with mock.patch.object(municipal_website, "get_verified_cache", return_value=VerifiedURLCache()), \
+            mock.patch.object(municipal_website, "host_limiter"), \
+            mock.patch.object(municipal_website, "wait_for_host", return_value="example.de"):
+        status = municipal_website._section_status("https://example.de/bauen", session)
+    return status, session.calls
+
+
+def test_head_404_rechecked_with_get():
+    assert _status(404, 200) == (200, ["HEAD", "GET"])
+    assert _status(403, 200) == (200, ["HEAD", "GET"])
+
+
+def test_head_200_needs_no_get():
+    assert _status(200, 500) == (200, ["HEAD"])
@@ -0,0 +1,24 @@
+import threading
+import time
+
+from apps.net.probe import PROBE_PER_HOST, probe_urls
+
+
+def test_probe_caps_concurrency_per_host_and_keeps_order():
+    active = {"n": 0, "max": 0}
+    lock = threading.Lock()
+
+    def fetch(url):
+        with lock:
+            active["n"] += 1
+            active["max"] = max(active["max"], active["n"])
+        time.sleep(0.01)
+        with lock:
+            active["n"] -= 1
+        return url.rsplit("/", 1)[-1]
+
+    urls = [f"https://ris.example.de/p{i}" for i in range(8)]
+    results = list(probe_urls(urls, fetch))
+    assert [r for _, r, _ in results] == [f"p{i}" for i in range(8)]
+    # Upper bound only: holds regardless of scheduling
+    assert active["max"] <= PROBE_PER_HOST
@@ -0,0 +1,85 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+
+from apps.net.ratelimit import HostRateLimiter, header_wait_seconds, is_retryable_status, retry_delay
+
+
+def test_header_wait_retry_after():
+    assert header_wait_seconds(429, {"Retry-After": "7"}) == 7.0
+    assert header_wait_seconds(200, {"Retry-After": "7"}) is None
+
+
+def test_header_wait_ratelimit_reset():
+    assert header_wait_seconds(200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "5"}) == 5.0
+    assert header_wait_seconds(200, {"X-RateLimit-Remaining": "3", "X-RateLimit-Reset": "5"}) is None
+    reset_epoch = str(int(time.time()) + 30)
+    wait = header_wait_seconds(200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset_epoch})
+    assert 28 <= wait <= 30
+
+
+class _FakeClock:
+    """monotonic()/sleep() pair where sleeping advances the clock instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+        self._lock = threading.Lock()
+
+    def monotonic(self):
+        with self._lock:
+            return self.now
+
+    def sleep(self, seconds):
+        with self._lock:
+            self.sleeps.append(seconds)
+            self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    fake = _FakeClock()
+    with mock.patch("apps.net.ratelimit.time.monotonic", fake.monotonic), \
+            mock.patch("apps.net.ratelimit.time.sleep", fake.sleep):
+        yield fake
+
+
+def test_limiter_spaces_same_host_only(clock):
+    limiter = HostRateLimiter(default_delay=1.0)
+    limiter.acquire("a.example")
+    limiter.acquire("b.example")
+    assert clock.sleeps == []
+    limiter.acquire("a.example")
+    assert clock.sleeps == [1.0]
+
+
+def test_limiter_observe_backs_off(clock):
+    limiter = HostRateLimiter(default_delay=0.0)
+    limiter.observe("a.example", 429, {"Retry-After": "5"})
+    limiter.acquire("a.example")
+    assert clock.sleeps == [5.0]
+
+
+def test_limiter_serialises_threads_on_one_host(clock):
+    limiter = HostRateLimiter(default_delay=1.0)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda _: limiter.acquire("a.example"), range(4)))
+    # First request goes straight through, each of the other three waits one slot
+    assert clock.sleeps == [1.0, 1.0, 1.0]
+    assert clock.now == 3.0
+
+
+def test_retry_delay_honours_retry_after_and_jitters():
+    assert retry_delay(0, 429, {"Retry-After": "7"}) == 7.0
+    assert retry_delay(0, 503, {"Retry-After": "600"}) == 60.0
+    assert 2.0 <= retry_delay(1, 500, {}) <= 3.0
+    assert 4.0 <= retry_delay(2) <= 5.0
+
+
+def test_retryable_statuses():
+    assert is_retryable_status(429) and is_retryable_status(503) and is_retryable_status(408)
+    assert not is_retryable_status(403) and not is_retryable_status(400)
@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from apps.crawlers.discovery import ris_discovery
+
+RIS_URL = "https://ris.example.de"
+
+
+class _Body:
+    status_code = 200
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def iter_content(self, chunk_size=None):
+        yield b"<html><h1>Sitzungskalender</h1></html>"
+
+
+def _discover(head_status):
+    gets = []
+
+    def safe_get(url, **kwargs):
+        gets.append(url)
+        return _Body() if url == RIS_URL else None
+
+    with mock.patch("apps.crawlers.discovery.municipality_index.discover_ris_urls", return_value=[RIS_URL]), \
+            mock.patch.object(ris_discovery, "get_session"), \
+            mock.patch.object(ris_discovery, "ris_safe_head", return_value=SimpleNamespace(status_code=head_status)), \
+            mock.patch.object(ris_discovery, "ris_safe_get", side_effect=safe_get):
+        url, _ = ris_discovery.discover_ris("Musterstadt", base_url="https://www.musterstadt.de")
+    return url, gets
+
+
+def test_head_refused_still_probed_with_get():
+    for status in (403, 404, 405):
+        url, gets = _discover(status)
+        assert url == RIS_URL and RIS_URL in gets
+
+
+def test_head_error_rejects_without_get():
+    url, gets = _discover(500)
+    assert url is None and gets == []
@@ -0,0 +1,26 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from apps.net import ris_http_fallback
+from apps.net.ris_http_fallback import ris_safe_get
+
+
+class _Session:
+    def __init__(self, status_code, headers=None):
+        self.calls = []
+        self._resp = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+    def get(self, url, **kwargs):
+        self.calls.append(url)
+        return self._resp
+
+
+def test_ris_safe_get_waits_for_host_and_reports_backoff():
+    limiter = mock.Mock()
+    session = _Session(429, {"Retry-After": "5"})
+    with mock.patch.object(ris_http_fallback, "host_limiter", limiter), \
+            mock.patch("apps.net.ratelimit.host_limiter", limiter):
+        assert ris_safe_get("https://ris.example.de/si0040.asp", session=session) is None
+    limiter.acquire.assert_called_once_with("ris.example.de")
+    limiter.observe.assert_called_once_with("ris.example.de", 429, {"Retry-After": "5"})
+    assert session.calls == ["https://ris.example.de/si0040.asp"]
@@ -0,0 +1,39 @@
+from apps.net.verified_urls import VerifiedURLCache
+
+
+def test_roundtrip_and_persistence(tmp_path):
+    db_path = str(tmp_path / "verified.sqlite")
+    cache = VerifiedURLCache(db_path)
+    assert cache.get("https://example.de/bauen") is None
+    cache.put("https://example.de/bauen", 200)
+    cache.put("https://example.de/fehlt", 404)
+    assert cache.get("https://example.de/bauen") == 200
+
+    reopened = VerifiedURLCache(db_path)
+    assert reopened.get("https://example.de/fehlt") == 404
+
+
+def test_lru_eviction_and_expiry():
+    cache = VerifiedURLCache(maxsize=2)
+    cache.put("a", 200)
+    cache.put("b", 200)
+    cache.get("a")
+    cache.put("c", 200)
+    assert cache.get("b") is None
+    assert cache.get("a") == 200
+
+    expired = VerifiedURLCache(max_age_seconds=-1)
+    expired.put("a", 200)
+    assert expired.get("a") is None
+
+
+def test_error_statuses_expire_quickly():
+    cache = VerifiedURLCache(max_age_seconds=3600, error_max_age_seconds=-1)
+    cache.put("https://example.de/bauen", 429)
+    cache.put("https://example.de/planung", 503)
+    cache.put("https://example.de/fehlt", 404)
+    cache.put("https://example.de/weg", 410)
+    assert cache.get("https://example.de/bauen") is None
+    assert cache.get("https://example.de/planung") is None
+    assert cache.get("https://example.de/fehlt") == 404
+    assert cache.get("https://example.de/weg") == 410